@@ -0,0 +1,218 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Callable, List, Set
+
+
+def hash_token(token: str) -> str:
+    """Return a stable cache key for a bearer token without keeping the raw token around"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenCache:
+    """
+    In-process LRU cache of verified identities keyed by token hash.
+
+    Entries expire at the token's own ``exp`` claim or after ``max_ttl``
+    seconds, whichever comes first. Entries are also indexed by the
+    identity's ``uid`` so ``invalidate_user`` can drop every token of a
+    user whose profile changed.
+    """
+
+    def __init__(self, max_size: int = 10000, max_ttl: float = 300.0):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._keys_by_uid: Dict[str, Set[str]] = {}
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the cached identity for a token, or None on miss or expiry"""
+        key = hash_token(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.time():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, token: str, value: Dict[str, Any], exp: Optional[float] = None,
+            ttl: Optional[float] = None) -> None:
+        """Cache an identity until the token's exp or the TTL (at most max_ttl), whichever is sooner"""
+        if self.max_size <= 0:
+            return
+
+        expires_at = time.time() + (self.max_ttl if ttl is None else min(ttl, self.max_ttl))
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+
+        key = hash_token(token)
+        self._remove(key)
+        self._entries[key] = (expires_at, value)
+        uid = value.get("uid")
+        if uid is not None:
+            self._keys_by_uid.setdefault(uid, set()).add(key)
+
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, token: str) -> None:
+        """Drop a single token from the cache"""
+        self._remove(hash_token(token))
+
+    def invalidate_user(self, uid: str) -> None:
+        """Drop every cached token that resolved to ``uid``"""
+        for key in self._keys_by_uid.pop(uid, ()):
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all cached identities"""
+        self._entries.clear()
+        self._keys_by_uid.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        uid = entry[1].get("uid")
+        keys = self._keys_by_uid.get(uid)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_uid[uid]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RejectedTokenCache:
+    """
+    Short-lived LRU set of token hashes that recently failed verification.
+
+    Only definitive rejections are recorded (bad signature, expired,
+    revoked), never transient failures such as Firebase timeouts, so a
+    client retrying a bad token is turned away without repeating the
+    verification.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 30.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+
+    def contains(self, token: str) -> bool:
+        """Whether the token was rejected within the last ``ttl`` seconds"""
+        key = hash_token(token)
+        expires_at = self._entries.get(key)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            del self._entries[key]
+            return False
+        self.hits += 1
+        return True
+
+    def add(self, token: str) -> None:
+        """Remember a rejected token"""
+        if self.max_size <= 0:
+            return
+        key = hash_token(token)
+        self._entries[key] = time.time() + self.ttl
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class UserProfileCache:
+    """
+    LRU cache of Firebase user records indexed by uid.
+
+    Writes that go through FirebaseAuthService call ``invalidate`` so the
+    next read fetches fresh data; callbacks registered with
+    ``add_invalidation_listener`` are notified with the affected uid.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._listeners: List[Callable[[str], None]] = []
+
+    def get(self, uid: str) -> Optional[Any]:
+        """Return the cached user record for a uid, or None on miss or expiry"""
+        entry = self._entries.get(uid)
+        if entry is None or entry[0] <= time.time():
+            if entry is not None:
+                del self._entries[uid]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(uid)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, user_record: Any) -> None:
+        """Cache a user record under its uid"""
+        if self.max_size <= 0:
+            return
+
+        uid = user_record.uid
+        self._entries[uid] = (time.time() + self.ttl, user_record)
+        self._entries.move_to_end(uid)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, uid: str) -> None:
+        """Drop a user and notify invalidation listeners"""
+        self._entries.pop(uid, None)
+        for listener in self._listeners:
+            listener(uid)
+
+    def add_invalidation_listener(self, listener: Callable[[str], None]) -> None:
+        """Register a callback invoked with the uid of every invalidated user"""
+        self._listeners.append(listener)
+
+    def clear(self) -> None:
+        """Drop all cached users"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -2,17 +2,44 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional, Dict, Any
 from .firebase_auth import firebase_auth
+from .precheck import precheck_token, MalformedTokenError
+from .rbac import permission_engine
+from ..metrics import timed
 
 # Security scheme for Bearer token
 security = HTTPBearer()
 
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
+async def verify_bearer_token(token: str, full_profile: bool = False) -> Optional[Dict[str, Any]]:
     """
-    Dependency to get current authenticated user from Firebase token
+    Verify either kind of bearer token and return the same user dict shape.
+
+    Access tokens issued by this service are recognised by their header and
+    verified in-process; everything else is treated as a Firebase ID token.
+    Structurally invalid or already expired tokens are rejected up front.
     """
-    token = credentials.credentials
+    try:
+        # HS256 access tokens carry no kid, so it is only required once we
+        # know the token will be looked up in a kid-indexed key set
+        header = precheck_token(token, require_kid=False)
+    except MalformedTokenError:
+        return None
     
+    if firebase_auth.is_access_token(header):
+        if firebase_auth.key_ring.asymmetric and "kid" not in header:
+            return None
+        return await firebase_auth.verify_access_token(token, full_profile=full_profile)
+    
+    if "kid" not in header:
+        return None
+    return await firebase_auth.verify_token(token, full_profile=full_profile)
+
+
+@timed("get_current_user")
+async def _authenticate(token: str, full_profile: bool = False) -> Dict[str, Any]:
+    """
+    Verify a bearer token and return the user, raising 401 on failure
+    """
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -20,7 +47,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user_data = await firebase_auth.verify_token(token)
+    user_data = await verify_bearer_token(token, full_profile=full_profile)
     
     if not user_data:
         raise HTTPException(
@@ -32,7 +59,23 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     return user_data
 
 
-async def get_current_active_user(current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
+    """
+    Dependency to get current authenticated user from a Firebase ID token
+    or an access token issued by this service
+    """
+    return await _authenticate(credentials.credentials)
+
+
+async def get_current_user_profile(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
+    """
+    Dependency to get current user with the full Firebase profile
+    (is_active, created_at). Costs one Firebase lookup per token.
+    """
+    return await _authenticate(credentials.credentials, full_profile=True)
+
+
+async def get_current_active_user(current_user: Dict[str, Any] = Depends(get_current_user_profile)) -> Dict[str, Any]:
     """
     Dependency to get current active user
     """
@@ -44,14 +87,36 @@ async def get_current_active_user(current_user: Dict[str, Any] = Depends(get_cur
     return current_user
 
 
-async def require_role(required_role: str):
+def require_permission(*permissions: str):
     """
-    Dependency factory to require specific role
+    Dependency factory to require one or more permissions.
+
+    The required mask is compiled once, when the route is defined; each
+    request then does a single bitwise AND against the mask cached on the
+    resolved user.
     """
-    async def role_checker(current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
-        user_role = current_user.get("role", "user")
+    required_mask = permission_engine.mask_for(*permissions)
+    
+    async def permission_checker(current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
+        if current_user.get("permission_mask", 0) & required_mask != required_mask:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Access denied. Required permissions: {', '.join(permissions)}"
+            )
         
-        if user_role != required_role and user_role != "admin":
+        return current_user
+    
+    return permission_checker
+
+
+def require_role(required_role: str):
+    """
+    Dependency factory to require a role or any role that inherits it
+    """
+    required_mask = permission_engine.mask_for(f"role:{required_role}")
+    
+    async def role_checker(current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
+        if current_user.get("permission_mask", 0) & required_mask != required_mask:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied. Required role: {required_role}"
@@ -64,4 +129,4 @@ async def require_role(required_role: str):
 
 # Predefined role dependencies
 require_admin = require_role("admin")
-require_user = require_role("user") 
\ No newline at end of file
+require_user = require_role("user")
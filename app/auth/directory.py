@@ -0,0 +1,298 @@
+import asyncio
+import json
+import logging
+import pathlib
+import sqlite3
+import threading
+import time
+from typing import Optional, Dict, Any, Callable, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = "uid, email, display_name, disabled, custom_claims, created_at, tokens_valid_after"
+
+
+class UserMetadata:
+    """The subset of firebase_admin's UserMetadata read by the service"""
+
+    __slots__ = ("creation_timestamp",)
+
+    def __init__(self, creation_timestamp: Optional[int]):
+        self.creation_timestamp = creation_timestamp
+
+
+class DirectoryUser:
+    """
+    A user read from the local directory.
+
+    Exposes the same attributes as the UserRecord fields the service reads,
+    so it can be used wherever a UserRecord is expected.
+    """
+
+    __slots__ = ("uid", "email", "display_name", "disabled", "custom_claims",
+                 "user_metadata", "tokens_valid_after_timestamp")
+
+    def __init__(self, uid: str, email: Optional[str], display_name: Optional[str], disabled: bool,
+                 custom_claims: Optional[Dict[str, Any]], created_at: Optional[int],
+                 tokens_valid_after: Optional[int]):
+        self.uid = uid
+        self.email = email
+        self.display_name = display_name
+        self.disabled = disabled
+        self.custom_claims = custom_claims
+        self.user_metadata = UserMetadata(created_at)
+        self.tokens_valid_after_timestamp = tokens_valid_after
+
+
+class UserDirectory:
+    """
+    Local SQLite replica of the Firebase user list, indexed by uid and email.
+
+    The directory is bootstrapped by paging through ``list_users`` and fully
+    re-synced every ``sync_interval`` seconds; users missing from a sync are
+    deleted. Writes made through FirebaseAuthService are applied immediately
+    with ``upsert`` and ``update_claims``. Reads are only served while the
+    last completed sync is younger than ``max_staleness``, so changes made
+    outside the service (console edits, disabled accounts) are picked up
+    within that bound and a stalled sync falls back to Firebase instead of
+    serving arbitrarily old data.
+
+    The database can be shared by all workers; a worker skips its sync when
+    another one completed a sync within the interval. Lookups use per-thread
+    read-only connections and never take the write lock, so with WAL they
+    do not wait behind a sync batch.
+    """
+
+    def __init__(self, path: str, list_users: Callable[[], Iterable[Any]],
+                 sync_interval: float = 300.0, max_staleness: float = 900.0):
+        self.path = path
+        self.list_users = list_users
+        self.sync_interval = sync_interval
+        self.max_staleness = max_staleness
+        self.hits = 0
+        self.misses = 0
+        self.synced_at = 0.0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._readers = threading.local()
+        self._reader_conns: List[sqlite3.Connection] = []
+        self._sync_task: Optional[asyncio.Task] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                "uid TEXT PRIMARY KEY, "
+                "email TEXT, "
+                "display_name TEXT, "
+                "disabled INTEGER NOT NULL DEFAULT 0, "
+                "custom_claims TEXT, "
+                "created_at INTEGER, "
+                "tokens_valid_after INTEGER, "
+                "seen_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS users_email ON users (email)")
+            conn.execute("CREATE TABLE IF NOT EXISTS sync_state (id INTEGER PRIMARY KEY, synced_at REAL NOT NULL)")
+            self._conn = conn
+        return self._conn
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            if self._conn is None:
+                with self._lock:
+                    # The writer connection creates the schema the reader expects
+                    self._connection()
+            uri = pathlib.Path(self.path).resolve().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False, isolation_level=None)
+            self._reader_conns.append(conn)
+            self._readers.conn = conn
+        return conn
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the last completed sync is within the freshness bound"""
+        return time.time() - self.synced_at <= self.max_staleness
+
+    def get(self, uid: str) -> Optional[DirectoryUser]:
+        """Return a user by uid, or None if unknown or the directory is stale"""
+        return self._lookup("uid", uid)
+
+    def get_by_email(self, email: str) -> Optional[DirectoryUser]:
+        """Return a user by email, or None if unknown or the directory is stale"""
+        return self._lookup("email", email.lower())
+
+    def _lookup(self, column: str, value: str) -> Optional[DirectoryUser]:
+        if not self.fresh:
+            self.misses += 1
+            return None
+
+        row = self._reader().execute(
+            f"SELECT {_COLUMNS} FROM users WHERE {column} = ?", (value,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        uid, email, display_name, disabled, custom_claims, created_at, tokens_valid_after = row
+        return DirectoryUser(
+            uid, email, display_name, bool(disabled),
+            json.loads(custom_claims) if custom_claims else None,
+            created_at, tokens_valid_after
+        )
+
+    def upsert(self, user_record: Any) -> None:
+        """Write a user record through to the directory"""
+        with self._lock:
+            self._write(self._connection(), [self._row(user_record, time.time())])
+
+    def update_claims(self, uid: str, claims: Dict[str, Any]) -> None:
+        """Replace a known user's custom claims"""
+        with self._lock:
+            self._connection().execute(
+                "UPDATE users SET custom_claims = ?, seen_at = ? WHERE uid = ?",
+                (json.dumps(claims), time.time(), uid)
+            )
+
+    def sync(self, force: bool = False) -> bool:
+        """
+        Replace the directory with the current Firebase user list (blocking).
+
+        Returns False without calling Firebase when another process synced
+        within ``sync_interval``.
+        """
+        started_at = time.time()
+        last_synced_at = self._load_synced_at()
+        if not force and started_at - last_synced_at < self.sync_interval:
+            self.synced_at = last_synced_at
+            return False
+
+        count = 0
+        batch: List[Tuple] = []
+        for user_record in self.list_users():
+            batch.append(self._row(user_record, started_at))
+            if len(batch) >= 1000:
+                count += self._write_batch(batch)
+                batch = []
+        count += self._write_batch(batch)
+
+        with self._lock:
+            conn = self._connection()
+            # Rows written through after the sync started are newer than the listing
+            removed = conn.execute("DELETE FROM users WHERE seen_at < ?", (started_at,)).rowcount
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state (id, synced_at) VALUES (1, ?)", (started_at,)
+            )
+        self.synced_at = started_at
+        logger.info("User directory synced: %d users, %d removed", count, removed)
+        return True
+
+    def _write_batch(self, rows: List[Tuple]) -> int:
+        if rows:
+            with self._lock:
+                conn = self._connection()
+                conn.execute("BEGIN")
+                try:
+                    self._merge(conn, rows)
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+        return len(rows)
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, rows: List[Tuple]) -> None:
+        # REPLACE also evicts a stale row holding the same email under another uid
+        conn.executemany(
+            f"INSERT OR REPLACE INTO users ({_COLUMNS}, seen_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+
+    @staticmethod
+    def _merge(conn: sqlite3.Connection, rows: List[Tuple]) -> None:
+        # Listing rows never overwrite a row written through after the sync
+        # started; only an older row holding the same email is evicted
+        conn.executemany(
+            "DELETE FROM users WHERE email = ? AND uid != ? AND seen_at <= ?",
+            [(row[1], row[0], row[-1]) for row in rows if row[1] is not None]
+        )
+        conn.executemany(
+            f"INSERT OR IGNORE INTO users ({_COLUMNS}, seen_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (uid) DO UPDATE SET "
+            "email = excluded.email, display_name = excluded.display_name, disabled = excluded.disabled, "
+            "custom_claims = excluded.custom_claims, created_at = excluded.created_at, "
+            "tokens_valid_after = excluded.tokens_valid_after, seen_at = excluded.seen_at "
+            "WHERE users.seen_at <= excluded.seen_at AND NOT EXISTS ("
+            "SELECT 1 FROM users AS other WHERE other.email = excluded.email AND other.uid != excluded.uid)",
+            rows
+        )
+
+    @staticmethod
+    def _row(user_record: Any, seen_at: float) -> Tuple:
+        metadata = getattr(user_record, "user_metadata", None)
+        custom_claims = user_record.custom_claims
+        return (
+            user_record.uid,
+            user_record.email.lower() if user_record.email else None,
+            getattr(user_record, "display_name", None),
+            int(bool(user_record.disabled)),
+            json.dumps(custom_claims) if custom_claims else None,
+            getattr(metadata, "creation_timestamp", None),
+            getattr(user_record, "tokens_valid_after_timestamp", None),
+            seen_at,
+        )
+
+    def _load_synced_at(self) -> float:
+        with self._lock:
+            row = self._connection().execute("SELECT synced_at FROM sync_state WHERE id = 1").fetchone()
+        return row[0] if row else 0.0
+
+    async def start(self) -> None:
+        """Bootstrap the directory and keep re-syncing in the background"""
+        try:
+            await asyncio.to_thread(self.sync)
+        except Exception as e:
+            # Reads fall back to Firebase until a sync succeeds
+            logger.warning("User directory bootstrap failed: %s", e)
+        if self._sync_task is None:
+            self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self) -> None:
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+
+    async def _sync_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await asyncio.to_thread(self.sync)
+            except Exception as e:
+                logger.warning("User directory sync failed: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and sync age"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "sync_age_seconds": time.time() - self.synced_at if self.synced_at else None,
+            "fresh": self.fresh,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._reader_conns:
+                conn.close()
+            self._reader_conns = []
+            self._readers = threading.local()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class ExecutorSaturatedError(Exception):
+    """Raised when too many Firebase calls are already queued"""
+
+
+class FirebaseCallTimeoutError(Exception):
+    """Raised when a Firebase call does not finish within its timeout"""
+
+
+class BlockingCallExecutor:
+    """
+    Bounded thread pool for the synchronous firebase_admin APIs.
+
+    Calls are rejected with ExecutorSaturatedError once ``max_pending``
+    calls are in flight or queued, so a slow Firebase backend sheds load
+    instead of growing an unbounded backlog. A call that times out keeps
+    its slot until its thread actually finishes.
+    """
+
+    def __init__(self, max_workers: int = 16, max_pending: int = 256, timeout: float = 10.0):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.pending = 0
+        self._pending_lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix="firebase"
+            )
+        return self._pool
+
+    async def run(self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """Run a blocking call on the pool without stalling the event loop"""
+        with self._pending_lock:
+            if self.pending >= self.max_pending:
+                raise ExecutorSaturatedError(
+                    f"Too many pending Firebase calls ({self.pending}/{self.max_pending})"
+                )
+            self.pending += 1
+
+        name = getattr(func, "__name__", "call")
+        try:
+            future = self._get_pool().submit(func, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+        # Released when the call finishes (or is cancelled before starting),
+        # not when the caller stops waiting on a timeout
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout or self.timeout)
+        except asyncio.TimeoutError:
+            raise FirebaseCallTimeoutError(f"{name} timed out")
+
+    def _release(self, _future: Any = None) -> None:
+        with self._pending_lock:
+            self.pending -= 1
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls waiting for a free worker thread"""
+        return max(0, self.pending - self.max_workers)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
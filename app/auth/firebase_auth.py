@@ -1,55 +1,257 @@
+import asyncio
 import os
 import firebase_admin
+import jwt
 from firebase_admin import auth, credentials
-from firebase_admin.auth import UserRecord
-from typing import Optional, Dict, Any
+from firebase_admin.auth import UserRecord, InvalidIdTokenError as FirebaseInvalidIdTokenError
+from typing import Optional, Dict, Any, List, AsyncIterator, Set
+import hashlib
 import json
+import logging
+import secrets
+import threading
+import time
 from datetime import datetime, timedelta
-import jwt
+from .cache import TokenCache, UserProfileCache, RejectedTokenCache, hash_token
+from .executor import BlockingCallExecutor, ExecutorSaturatedError
+from .verifier import IdTokenVerifier, SigningKeyCache, GOOGLE_CERTS_URL, InvalidIdTokenError, UnknownKidError
+from .singleflight import SingleFlight
+from .keys import KeyRing
+from .revocation import RevocationIndex, SQLiteRevocationStore
+from .directory import UserDirectory
+from .identity_toolkit import IdentityToolkitClient
+from .rbac import permission_engine
+from ..metrics import firebase_call_duration, firebase_call_errors, timed
+from ..startup import phase
 
+logger = logging.getLogger(__name__)
 
-class FirebaseAuthService:
-    def __init__(self):
-        self._initialize_firebase()
-        self.jwt_secret = os.getenv("JWT_SECRET", "your-secret-key")
-        self.jwt_algorithm = "HS256"
-        self.access_token_expiry = timedelta(hours=1)
-        self.refresh_token_expiry = timedelta(days=7)
 
-    def _initialize_firebase(self):
-        """Initialize Firebase Admin SDK"""
-        try:
+class TokenRejectedError(Exception):
+    """Raised when a validly signed token must still be refused (revoked, wrong type, disabled user)"""
+
+
+_credentials_lock = threading.Lock()
+_parsed_credentials: Optional[credentials.Base] = None
+
+
+def load_credentials() -> credentials.Base:
+    """
+    Parse the Firebase credentials from the environment, once per process.
+
+    Calling this before forking workers (see app.server) lets every worker
+    inherit the parsed credentials instead of parsing them again.
+    """
+    global _parsed_credentials
+    with _credentials_lock:
+        if _parsed_credentials is None:
             # Try to get Firebase credentials from environment
             firebase_credentials = os.getenv("FIREBASE_CREDENTIALS")
             if firebase_credentials:
-                cred_dict = json.loads(firebase_credentials)
-                cred = credentials.Certificate(cred_dict)
+                _parsed_credentials = credentials.Certificate(json.loads(firebase_credentials))
             else:
                 # Fallback to service account file
                 service_account_path = os.getenv("FIREBASE_SERVICE_ACCOUNT_PATH")
                 if service_account_path and os.path.exists(service_account_path):
-                    cred = credentials.Certificate(service_account_path)
+                    _parsed_credentials = credentials.Certificate(service_account_path)
                 else:
                     # Use default credentials (for development)
-                    cred = credentials.ApplicationDefault()
-            
-            firebase_admin.initialize_app(cred)
+                    _parsed_credentials = credentials.ApplicationDefault()
+        return _parsed_credentials
+
+
+class FirebaseAuthService:
+    def __init__(self):
+        # The Admin SDK is initialized on first use (or in start() when
+        # FIREBASE_EAGER_INIT is set) so importing the app stays cheap
+        self._firebase_app: Optional[firebase_admin.App] = None
+        self._init_lock = threading.Lock()
+        self.eager_init = os.getenv("FIREBASE_EAGER_INIT", "false").lower() == "true"
+        self.jwt_secret = os.getenv("JWT_SECRET", "your-secret-key")
+        self.jwt_issuer = os.getenv("JWT_ISSUER", "authentication-api")
+        self.access_token_expiry = timedelta(hours=1)
+        self.refresh_token_expiry = timedelta(days=7)
+        self.key_ring = KeyRing(
+            algorithm=os.getenv("JWT_ALGORITHM", "ES256"),
+            keys_dir=os.getenv("JWT_KEYS_DIR") or None,
+            rotation_interval=timedelta(hours=float(os.getenv("JWT_KEY_ROTATION_HOURS", "24"))),
+            retention=self.refresh_token_expiry + self.access_token_expiry,
+            secret=self.jwt_secret
+        )
+        self.jwt_algorithm = self.key_ring.algorithm
+        self.revocations = RevocationIndex(
+            store=self._create_revocation_store(),
+            sync_interval=float(os.getenv("REVOCATION_SYNC_SECONDS", "5"))
+        )
+        self.import_batch_size = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+        self.import_hash_rounds = int(os.getenv("IMPORT_PBKDF2_ROUNDS", "10000"))
+        self.token_cache = TokenCache(
+            max_size=int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000")),
+            max_ttl=float(os.getenv("TOKEN_CACHE_MAX_TTL_SECONDS", "300"))
+        )
+        self.rejected_tokens = RejectedTokenCache(
+            max_size=int(os.getenv("REJECTED_TOKEN_CACHE_MAX_SIZE", "10000")),
+            ttl=float(os.getenv("REJECTED_TOKEN_CACHE_TTL_SECONDS", "30"))
+        )
+        self.profile_cache = UserProfileCache(
+            max_size=int(os.getenv("USER_CACHE_MAX_SIZE", "10000")),
+            ttl=float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+        )
+        # Tokens resolved to a user are dropped with the user's cached profile
+        self.profile_cache.add_invalidation_listener(self.token_cache.invalidate_user)
+        self.user_directory = self._create_user_directory()
+        self.executor = BlockingCallExecutor(
+            max_workers=int(os.getenv("FIREBASE_EXECUTOR_WORKERS", "16")),
+            max_pending=int(os.getenv("FIREBASE_EXECUTOR_MAX_PENDING", "256")),
+            timeout=float(os.getenv("FIREBASE_CALL_TIMEOUT_SECONDS", "10"))
+        )
+        # Coalesces concurrent identical token verifications and user lookups
+        self.single_flight = SingleFlight()
+        # "claims" builds the user from the ID token alone, "profile" always fetches the UserRecord
+        self.verify_mode = os.getenv("TOKEN_VERIFY_MODE", "claims").lower()
+        self.check_revoked = os.getenv("CHECK_TOKEN_REVOKED", "false").lower() == "true"
+        self.local_verification = os.getenv("LOCAL_TOKEN_VERIFICATION", "true").lower() == "true"
+        self.id_token_verifier = self._create_id_token_verifier()
+        # Without FIREBASE_PROJECT_ID the verifier is built on the first ID
+        # token verification, once the SDK has read the project id
+        self._verifier_resolved = self.id_token_verifier is not None or not self.local_verification
+        # Password verification; sign-in is refused when this is not configured
+        self.identity_toolkit = IdentityToolkitClient.from_env()
+        # Deferred Firebase writes (signup claims), drained on stop()
+        self._background_writes: Set[asyncio.Task] = set()
+        self.claims_write_retries = int(os.getenv("SIGNUP_CLAIMS_WRITE_RETRIES", "3"))
+        self.claims_write_backoff = 0.5
+
+    def _initialize_firebase(self) -> firebase_admin.App:
+        """Initialize Firebase Admin SDK on first use (blocking, idempotent)"""
+        if self._firebase_app is not None:
+            return self._firebase_app
+        with self._init_lock:
+            if self._firebase_app is None:
+                with phase("firebase_init"):
+                    try:
+                        try:
+                            self._firebase_app = firebase_admin.get_app()
+                        except ValueError:
+                            self._firebase_app = firebase_admin.initialize_app(load_credentials())
+                    except Exception as e:
+                        logger.error("Firebase initialization error: %s", e)
+                        raise
+        return self._firebase_app
+
+    async def _run_firebase(self, func, *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking Admin SDK call on the executor, initializing the SDK first.
+
+        Only calls made here are recorded as Firebase calls; other work on the
+        executor (hashing, SQLite writes) stays out of the Firebase metrics.
+        """
+        if self._firebase_app is None:
+            await self.executor.run(self._initialize_firebase)
+        name = getattr(func, "__name__", "call")
+        start = time.perf_counter()
+        try:
+            return await self.executor.run(func, *args, **kwargs)
+        except ExecutorSaturatedError:
+            # Shed before reaching Firebase
+            start = None
+            raise
         except Exception as e:
-            print(f"Firebase initialization error: {e}")
+            firebase_call_errors.labels(name, type(e).__name__).inc()
             raise
+        finally:
+            if start is not None:
+                firebase_call_duration.labels(name).observe(time.perf_counter() - start)
+
+    def _create_id_token_verifier(self, app: Optional[firebase_admin.App] = None) -> Optional[IdTokenVerifier]:
+        """Create the local ID token verifier, or None to use the Admin SDK"""
+        if not self.local_verification:
+            return None
 
+        project_id = os.getenv("FIREBASE_PROJECT_ID")
+        if project_id is None and app is not None:
+            project_id = app.project_id
+        if not project_id:
+            return None
+
+        key_cache = SigningKeyCache(source=os.getenv("FIREBASE_SIGNING_CERTS_URL", GOOGLE_CERTS_URL))
+        return IdTokenVerifier(project_id, key_cache)
+
+    def _create_revocation_store(self) -> Optional[SQLiteRevocationStore]:
+        """Create the persistent revocation backend, or None to keep revocations in memory"""
+        backend = os.getenv("REVOCATION_BACKEND", "sqlite").lower()
+        if backend == "memory":
+            return None
+        if backend != "sqlite":
+            raise ValueError(f"Unsupported revocation backend: {backend}")
+        return SQLiteRevocationStore(os.getenv("REVOCATION_DB_PATH", "revocations.db"))
+
+    def _create_user_directory(self) -> Optional[UserDirectory]:
+        """Create the local user directory, or None to always read users from Firebase"""
+        if os.getenv("USER_DIRECTORY_ENABLED", "false").lower() != "true":
+            return None
+        return UserDirectory(
+            path=os.getenv("USER_DIRECTORY_PATH", "users.db"),
+            list_users=self._list_all_users,
+            sync_interval=float(os.getenv("USER_DIRECTORY_SYNC_SECONDS", "300")),
+            max_staleness=float(os.getenv("USER_DIRECTORY_MAX_STALENESS_SECONDS", "900"))
+        )
+
+    def _list_all_users(self):
+        """Page through every Firebase user (blocking)"""
+        self._initialize_firebase()
+        return auth.list_users().iterate_all()
+
+    async def start(self):
+        """Warm the signing key cache and start background refreshes"""
+        if self.eager_init:
+            app = await self.executor.run(self._initialize_firebase)
+            if not self._verifier_resolved:
+                self.id_token_verifier = self._create_id_token_verifier(app)
+                self._verifier_resolved = True
+        with phase("key_ring"):
+            await self.key_ring.start()
+        with phase("revocations"):
+            await self.revocations.start()
+        if self.user_directory is not None:
+            with phase("user_directory"):
+                await self.user_directory.start()
+        if self.id_token_verifier is not None:
+            with phase("signing_certs"):
+                await self.id_token_verifier.key_cache.start()
+
+    async def stop(self):
+        """Stop background tasks and worker threads"""
+        if self._background_writes:
+            # Let deferred claims writes land before the executor goes away
+            await asyncio.wait(set(self._background_writes), timeout=10)
+        await self.key_ring.stop()
+        await self.revocations.stop()
+        if self.user_directory is not None:
+            await self.user_directory.stop()
+        if self.id_token_verifier is not None:
+            await self.id_token_verifier.key_cache.stop()
+        if self.identity_toolkit is not None:
+            await self.identity_toolkit.aclose()
+        self.executor.shutdown(wait=False)
+
+    @timed("create_user")
     async def create_user(self, email: str, password: str, first_name: str, last_name: str) -> Dict[str, Any]:
         """Create a new user in Firebase"""
         try:
-            user_record = auth.create_user(
+            user_record = await self._run_firebase(
+                auth.create_user,
                 email=email,
                 password=password,
                 display_name=f"{first_name} {last_name}",
                 email_verified=False
             )
             
+            if self.user_directory is not None:
+                await self.executor.run(self.user_directory.upsert, user_record)
+            
             # Set custom claims
-            auth.set_custom_user_claims(user_record.uid, {
+            await self.set_custom_claims(user_record.uid, {
                 "first_name": first_name,
                 "last_name": last_name,
                 "role": "user"
@@ -66,89 +268,480 @@ class FirebaseAuthService:
         except Exception as e:
             raise Exception(f"Failed to create user: {str(e)}")
 
+    @timed("signup_user")
+    async def signup_user(self, email: str, password: str, first_name: str, last_name: str) -> Dict[str, Any]:
+        """
+        Create a user and start a session in a single Firebase round trip.
+
+        Tokens are minted from the new UserRecord and the claims we are about
+        to write, so the user is not fetched again and the password is not
+        re-checked. The custom claims write is deferred to a background task;
+        access tokens carry the claims already, and the profile is kept out
+        of the caches until the write lands.
+        """
+        try:
+            user_record = await self._run_firebase(
+                auth.create_user,
+                email=email,
+                password=password,
+                display_name=f"{first_name} {last_name}",
+                email_verified=False
+            )
+        except Exception as e:
+            raise Exception(f"Failed to create user: {str(e)}")
+        
+        claims = {
+            "first_name": first_name,
+            "last_name": last_name,
+            "role": "user"
+        }
+        task = asyncio.create_task(self._write_signup_claims(user_record, claims))
+        self._background_writes.add(task)
+        task.add_done_callback(self._background_writes.discard)
+        
+        return self._issue_session(user_record, claims)
+
+    async def _write_signup_claims(self, user_record: UserRecord, claims: Dict[str, Any]) -> None:
+        """Write a new user's claims, retrying with backoff; runs after the signup response"""
+        if self.user_directory is not None:
+            await self.executor.run(self.user_directory.upsert, user_record)
+        
+        for attempt in range(self.claims_write_retries + 1):
+            try:
+                await self.set_custom_claims(user_record.uid, claims)
+                return
+            except Exception as e:
+                if attempt == self.claims_write_retries:
+                    logger.error("Failed to set custom claims for %s: %s", user_record.uid, e)
+                    return
+                await asyncio.sleep(self.claims_write_backoff * 2 ** attempt)
+
+    async def import_users(self, users: List[Dict[str, str]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Bulk-create users with Firebase's batch import API.
+
+        Users are imported in chunks of ``import_batch_size`` (Firebase
+        allows at most 1000 per call) with their custom claims set at import
+        time. Passwords are hashed locally with PBKDF2-SHA256 and imported
+        with the matching hash configuration. One result is yielded per input
+        user, in order; a failed record or chunk never aborts the batch.
+        """
+        hash_alg = auth.UserImportHash.pbkdf2_sha256(rounds=self.import_hash_rounds)
+
+        for start in range(0, len(users), self.import_batch_size):
+            chunk = users[start:start + self.import_batch_size]
+            uids = [self._generate_uid() for _ in chunk]
+            
+            try:
+                records = await self.executor.run(self._build_import_records, chunk, uids, timeout=120)
+                result = await self._run_firebase(auth.import_users, records, hash_alg=hash_alg, timeout=120)
+                errors = {error.index: error.reason for error in result.errors}
+                if self.user_directory is not None:
+                    imported = [record for index, record in enumerate(records) if index not in errors]
+                    await self.executor.run(self._write_imported_users, imported)
+            except Exception as e:
+                errors = {index: str(e) for index in range(len(chunk))}
+
+            for index, (user, uid) in enumerate(zip(chunk, uids)):
+                item = {"index": start + index, "email": user["email"]}
+                if index in errors:
+                    item.update({"status": "failed", "error": errors[index]})
+                else:
+                    item.update({"status": "created", "id": uid})
+                yield item
+
+    def _build_import_records(self, users: List[Dict[str, str]], uids: List[str]) -> List[auth.ImportUserRecord]:
+        """Hash passwords and build import records (CPU bound, runs on the executor)"""
+        records = []
+        for user, uid in zip(users, uids):
+            salt = secrets.token_bytes(16)
+            password_hash = hashlib.pbkdf2_hmac(
+                "sha256", user["password"].encode("utf-8"), salt, self.import_hash_rounds
+            )
+            records.append(auth.ImportUserRecord(
+                uid=uid,
+                email=user["email"],
+                email_verified=False,
+                display_name=f"{user['first_name']} {user['last_name']}",
+                password_hash=password_hash,
+                password_salt=salt,
+                custom_claims={
+                    "first_name": user["first_name"],
+                    "last_name": user["last_name"],
+                    "role": "user"
+                }
+            ))
+        return records
+
+    def _write_imported_users(self, records: List[auth.ImportUserRecord]) -> None:
+        """Write imported users through to the local directory (blocking)"""
+        for record in records:
+            self.user_directory.upsert(record)
+
+    @staticmethod
+    def _generate_uid() -> str:
+        """Generate a Firebase-style 28 character uid"""
+        return secrets.token_urlsafe(21)
+
+    async def set_custom_claims(self, uid: str, claims: Dict[str, Any]) -> None:
+        """Write custom claims and invalidate the cached profile"""
+        try:
+            await self._run_firebase(auth.set_custom_user_claims, uid, claims)
+            if self.user_directory is not None:
+                await self.executor.run(self.user_directory.update_claims, uid, claims)
+        finally:
+            self.profile_cache.invalidate(uid)
+
+    @timed("sign_in_user")
     async def sign_in_user(self, email: str, password: str) -> Dict[str, Any]:
-        """Sign in user with email and password"""
+        """
+        Sign in user with email and password.
+
+        The password is checked by the Firebase Auth REST API. The profile
+        comes from the profile cache or user directory when possible;
+        otherwise the session is minted from the returned ID token, verified
+        locally, so a cold cache costs no Admin SDK lookup.
+        """
         try:
-            # In a real implementation, you would use Firebase Auth REST API
-            # For now, we'll simulate the authentication
-            user_record = auth.get_user_by_email(email)
+            if self.identity_toolkit is None:
+                raise Exception("Password sign-in is not configured (set FIREBASE_WEB_API_KEY)")
+            
+            result = await self.identity_toolkit.sign_in_with_password(email, password)
+            user_record = self._cached_user(result["localId"])
+            if user_record is None:
+                verifier = await self._local_id_token_verifier()
+                if verifier is not None:
+                    try:
+                        # signInWithPassword refuses disabled accounts, and custom
+                        # claims are embedded in the ID token
+                        return self._issue_session_from_claims(verifier.verify(result["idToken"]))
+                    except UnknownKidError:
+                        # Google rotated its keys after the key set was loaded;
+                        # the password was already accepted, so look the user up
+                        pass
+                user_record = await self._get_user(result["localId"])
             
             if user_record.disabled:
                 raise Exception("User account is disabled")
             
-            # Generate JWT tokens
-            access_token = self._generate_access_token(user_record.uid, user_record.email)
-            refresh_token = self._generate_refresh_token(user_record.uid)
-            
-            # Get custom claims
-            custom_claims = auth.get_custom_user_claims(user_record.uid)
-            
-            return {
-                "access_token": access_token,
-                "refresh_token": refresh_token,
-                "user": {
-                    "id": user_record.uid,
-                    "email": user_record.email,
-                    "first_name": custom_claims.get("first_name", ""),
-                    "last_name": custom_claims.get("last_name", ""),
-                    "is_active": not user_record.disabled,
-                    "created_at": str(user_record.user_metadata.creation_timestamp)
-                }
-            }
+            return self._issue_session(user_record)
         except Exception as e:
             raise Exception(f"Authentication failed: {str(e)}")
 
-    async def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
-        """Verify Firebase ID token"""
-        try:
-            decoded_token = auth.verify_id_token(token)
-            user_record = auth.get_user(decoded_token["uid"])
-            custom_claims = auth.get_custom_user_claims(user_record.uid)
-            
-            return {
-                "uid": user_record.uid,
-                "email": user_record.email,
+    def _issue_session(self, user_record: UserRecord, custom_claims: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Start a session for a user and return its tokens and profile"""
+        if custom_claims is None:
+            # Custom claims are returned with the user record
+            custom_claims = user_record.custom_claims or {}
+        return self._start_session(
+            user_record.uid, user_record.email, custom_claims,
+            is_active=not user_record.disabled,
+            created_at=str(user_record.user_metadata.creation_timestamp)
+        )
+
+    def _issue_session_from_claims(self, claims: Dict[str, Any]) -> Dict[str, Any]:
+        """Start a session from verified ID token claims; the creation time is not in the token"""
+        return self._start_session(claims["uid"], claims.get("email"), claims, is_active=True, created_at=None)
+
+    def _start_session(self, uid: str, email: str, custom_claims: Dict[str, Any],
+                       is_active: bool, created_at: Optional[str]) -> Dict[str, Any]:
+        # Generate JWT tokens for a new session
+        session_id = secrets.token_urlsafe(16)
+        access_token = self._generate_access_token(uid, email, custom_claims, session_id)
+        refresh_token = self._generate_refresh_token(uid, session_id)
+        
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "user": {
+                "id": uid,
+                "email": email,
                 "first_name": custom_claims.get("first_name", ""),
                 "last_name": custom_claims.get("last_name", ""),
-                "role": custom_claims.get("role", "user")
+                "is_active": is_active,
+                "created_at": created_at
             }
+        }
+
+    @timed("verify_id_token")
+    async def verify_token(self, token: str, full_profile: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Verify Firebase ID token.
+
+        In "claims" mode the user is built from the token's own claims
+        (custom claims are embedded in ID tokens), so no Firebase call is
+        made. A full profile lookup runs in "profile" mode or when
+        ``full_profile`` is requested.
+        """
+        full_profile = full_profile or self.verify_mode == "profile"
+        cache_key = f"profile:{token}" if full_profile else token
+        cached_user = self.token_cache.get(cache_key)
+        if cached_user is not None:
+            return cached_user
+        if self.rejected_tokens.contains(token):
+            return None
+
+        try:
+            return await self.single_flight.do(
+                ("token", hash_token(cache_key)),
+                lambda: self._verify_uncached(token, cache_key, full_profile)
+            )
         except Exception as e:
-            print(f"Token verification failed: {e}")
+            if self._is_rejection(e):
+                self.rejected_tokens.add(token)
+            logger.warning("Token verification failed: %s", e)
             return None
 
-    def _generate_access_token(self, user_id: str, email: str) -> str:
-        """Generate JWT access token"""
+    @staticmethod
+    def _is_rejection(error: Exception) -> bool:
+        """Whether a verification failure is final, as opposed to transient or retryable"""
+        if isinstance(error, (UnknownKidError, jwt.InvalidKeyError)):
+            # The signing key may simply not be loaded yet
+            return False
+        return isinstance(error, (
+            TokenRejectedError, InvalidIdTokenError, FirebaseInvalidIdTokenError, jwt.PyJWTError
+        ))
+
+    async def _verify_uncached(self, token: str, cache_key: str, full_profile: bool) -> Dict[str, Any]:
+        """Verify a token that missed the cache and cache the resulting user"""
+        decoded_token = await self._decode_id_token(token)
+
+        user_record = None
+        if full_profile or self.check_revoked:
+            user_record = await self._get_user(decoded_token["uid"])
+        if self.check_revoked:
+            self._check_revoked(decoded_token, user_record)
+
+        if full_profile:
+            user_data = self._user_from_record(user_record)
+        else:
+            user_data = self._user_from_claims(decoded_token)
+
+        # Results that depend on the user record are only re-checked on a
+        # miss, so they must not outlive the profile they were built from
+        ttl = self.profile_cache.ttl if user_record is not None else None
+        self.token_cache.set(cache_key, user_data, exp=decoded_token.get("exp"), ttl=ttl)
+        return user_data
+
+    async def _get_user(self, uid: str) -> UserRecord:
+        """Fetch a UserRecord by uid from the profile cache, the local directory or Firebase"""
+        user_record = self._cached_user(uid)
+        if user_record is None:
+            user_record = await self.single_flight.do(
+                ("uid", uid),
+                lambda: self._fetch_user(auth.get_user, uid)
+            )
+        return user_record
+
+    def _cached_user(self, uid: str) -> Optional[UserRecord]:
+        """A UserRecord from the profile cache or the local directory, without a Firebase call"""
+        user_record = self.profile_cache.get(uid)
+        if user_record is None and self.user_directory is not None:
+            user_record = self.user_directory.get(uid)
+        return user_record
+
+    async def _fetch_user(self, lookup, key: str) -> UserRecord:
+        """Fetch a UserRecord from Firebase and store it in the profile cache"""
+        user_record = await self._run_firebase(lookup, key)
+        self.profile_cache.set(user_record)
+        return user_record
+
+    def _user_from_claims(self, claims: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the current-user dict from decoded token claims"""
+        return {
+            "uid": claims["uid"],
+            "email": claims.get("email"),
+            "first_name": claims.get("first_name", ""),
+            "last_name": claims.get("last_name", ""),
+            "role": claims.get("role", "user"),
+            "permission_mask": permission_engine.mask_for_role(claims.get("role", "user"))
+        }
+
+    def _user_from_record(self, user_record: UserRecord) -> Dict[str, Any]:
+        """Build the current-user dict, including profile fields, from a UserRecord"""
+        custom_claims = user_record.custom_claims or {}
+        return {
+            "uid": user_record.uid,
+            "email": user_record.email,
+            "first_name": custom_claims.get("first_name", ""),
+            "last_name": custom_claims.get("last_name", ""),
+            "role": custom_claims.get("role", "user"),
+            "permission_mask": permission_engine.mask_for_role(custom_claims.get("role", "user")),
+            "is_active": not user_record.disabled,
+            "created_at": str(user_record.user_metadata.creation_timestamp)
+        }
+
+    async def _decode_id_token(self, token: str) -> Dict[str, Any]:
+        """Decode an ID token locally, falling back to the Admin SDK until keys are warm"""
+        verifier = await self._local_id_token_verifier()
+        if verifier is not None:
+            return verifier.verify(token)
+        return await self._run_firebase(auth.verify_id_token, token)
+
+    async def _local_id_token_verifier(self) -> Optional[IdTokenVerifier]:
+        """The local verifier once its signing keys are loaded, resolving it on first use"""
+        if not self._verifier_resolved:
+            await self.single_flight.do(("id_token_verifier",), self._resolve_id_token_verifier)
+        if self.id_token_verifier is not None and self.id_token_verifier.ready:
+            return self.id_token_verifier
+        return None
+
+    async def _resolve_id_token_verifier(self) -> None:
+        """Initialize the SDK to learn the project id, then build and warm the local verifier"""
+        app = await self.executor.run(self._initialize_firebase)
+        if not self._verifier_resolved:
+            self.id_token_verifier = self._create_id_token_verifier(app)
+            self._verifier_resolved = True
+            if self.id_token_verifier is not None:
+                await self.id_token_verifier.key_cache.start()
+
+    def _check_revoked(self, decoded_token: Dict[str, Any], user_record: UserRecord):
+        """Reject tokens for disabled users or issued before a revocation"""
+        if user_record.disabled:
+            raise TokenRejectedError("User account is disabled")
+
+        valid_after = user_record.tokens_valid_after_timestamp
+        if valid_after and decoded_token["iat"] * 1000 < valid_after:
+            raise TokenRejectedError("Token has been revoked")
+
+    def _generate_access_token(self, user_id: str, email: str, custom_claims: Dict[str, Any], session_id: str) -> str:
+        """Generate JWT access token with role and name claims embedded"""
         payload = {
+            "iss": self.jwt_issuer,
+            "sid": session_id,
             "user_id": user_id,
             "email": email,
+            "first_name": custom_claims.get("first_name", ""),
+            "last_name": custom_claims.get("last_name", ""),
+            "role": custom_claims.get("role", "user"),
             "exp": datetime.utcnow() + self.access_token_expiry,
             "iat": datetime.utcnow(),
             "type": "access"
         }
-        return jwt.encode(payload, self.jwt_secret, algorithm=self.jwt_algorithm)
+        return self.key_ring.sign(payload)
+
+    def is_access_token(self, header: Dict[str, Any]) -> bool:
+        """Whether an unverified JWT header belongs to a token issued by this service"""
+        return header.get("alg") == self.jwt_algorithm
+
+    @timed("verify_access_token")
+    async def verify_access_token(self, token: str, full_profile: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Verify an access token issued by this service.
+
+        Role and name claims are embedded at issue time, so this is a purely
+        local signature check unless ``full_profile`` is requested.
+        """
+        if self.rejected_tokens.contains(token):
+            return None
+        try:
+            payload = self.key_ring.decode(
+                token,
+                issuer=self.jwt_issuer,
+                options={"require": ["exp", "iat", "iss"]}
+            )
+            
+            if payload.get("type") != "access":
+                raise TokenRejectedError("Invalid token type")
+            
+            if self.revocations.is_revoked(payload.get("sid", "")):
+                raise TokenRejectedError("Session has been revoked")
+            
+            if full_profile:
+                return self._user_from_record(await self._get_user(payload["user_id"]))
+            
+            return {
+                "uid": payload["user_id"],
+                "email": payload.get("email"),
+                "first_name": payload.get("first_name", ""),
+                "last_name": payload.get("last_name", ""),
+                "role": payload.get("role", "user"),
+                "permission_mask": permission_engine.mask_for_role(payload.get("role", "user"))
+            }
+        except Exception as e:
+            if self._is_rejection(e):
+                self.rejected_tokens.add(token)
+            logger.warning("Access token verification failed: %s", e)
+            return None
 
-    def _generate_refresh_token(self, user_id: str) -> str:
-        """Generate JWT refresh token"""
+    def _generate_refresh_token(self, user_id: str, session_id: str) -> str:
+        """Generate single-use JWT refresh token"""
         payload = {
+            "jti": secrets.token_urlsafe(16),
+            "sid": session_id,
             "user_id": user_id,
             "exp": datetime.utcnow() + self.refresh_token_expiry,
             "iat": datetime.utcnow(),
             "type": "refresh"
         }
-        return jwt.encode(payload, self.jwt_secret, algorithm=self.jwt_algorithm)
+        return self.key_ring.sign(payload)
+
+    @timed("refresh_access_token")
+    async def refresh_access_token(self, refresh_token: str) -> Optional[Dict[str, str]]:
+        """
+        Exchange a refresh token for a new access token and a new refresh token.
 
-    async def refresh_access_token(self, refresh_token: str) -> Optional[str]:
-        """Refresh access token using refresh token"""
+        Refresh tokens are single use: the presented token's jti is revoked
+        on every exchange. Presenting an already-used token is treated as
+        theft and revokes the whole session. Reuse across workers is caught
+        by the shared store, which accepts each jti only once.
+        """
         try:
-            payload = jwt.decode(refresh_token, self.jwt_secret, algorithms=[self.jwt_algorithm])
+            payload = self._decode_refresh_token(refresh_token)
+            jti, session_id = payload["jti"], payload["sid"]
             
-            if payload.get("type") != "refresh":
-                raise Exception("Invalid token type")
+            if self.revocations.is_revoked(session_id):
+                raise Exception("Session has been revoked")
+            if self.revocations.is_revoked(jti):
+                await self._revoke(session_id, time.time() + self.refresh_token_expiry.total_seconds())
+                raise Exception("Refresh token reuse detected")
+            
+            # Revoke in memory before the next await so concurrent reuse is caught
+            self.revocations.revoke_local(jti, payload["exp"])
+            if not await self.executor.run(self.revocations.persist, jti, payload["exp"]):
+                # Another worker exchanged this token before our next sync
+                await self._revoke(session_id, time.time() + self.refresh_token_expiry.total_seconds())
+                raise Exception("Refresh token reuse detected")
             
             user_id = payload.get("user_id")
-            user_record = auth.get_user(user_id)
+            user_record = await self._get_user(user_id)
             
-            return self._generate_access_token(user_id, user_record.email)
+            return {
+                "access_token": self._generate_access_token(
+                    user_id, user_record.email, user_record.custom_claims or {}, session_id
+                ),
+                "refresh_token": self._generate_refresh_token(user_id, session_id)
+            }
         except Exception as e:
-            print(f"Token refresh failed: {e}")
+            logger.warning("Token refresh failed: %s", e)
             return None
+
+    async def revoke_session(self, refresh_token: str) -> bool:
+        """Revoke the session a refresh token belongs to, e.g. on logout"""
+        try:
+            payload = self._decode_refresh_token(refresh_token)
+        except Exception as e:
+            logger.warning("Session revocation failed: %s", e)
+            return False
+        
+        # Later refresh tokens of this session can outlive this one, so keep
+        # the session revoked for a full refresh lifetime
+        await self._revoke(payload["sid"], time.time() + self.refresh_token_expiry.total_seconds())
+        await self._revoke(payload["jti"], payload["exp"])
+        return True
+
+    def _decode_refresh_token(self, refresh_token: str) -> Dict[str, Any]:
+        """Verify a refresh token's signature, expiry and type"""
+        payload = self.key_ring.decode(refresh_token, options={"require": ["exp", "jti", "sid"]})
+        if payload.get("type") != "refresh":
+            raise Exception("Invalid token type")
+        return payload
+
+    async def _revoke(self, key: str, expires_at: float) -> None:
+        """Revoke a jti or session id in memory and in the persistent store"""
+        self.revocations.revoke_local(key, expires_at)
+        await self.executor.run(self.revocations.persist, key, expires_at)
+
+
+# Shared service instance used by routes and dependencies
+firebase_auth = FirebaseAuthService()
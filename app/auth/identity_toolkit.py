@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import os
+import random
+from typing import Optional, Dict, Any
+
+import httpx
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - h2 is optional
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+IDENTITY_TOOLKIT_URL = "https://identitytoolkit.googleapis.com/v1"
+
+# signInWithPassword error codes that mean the credentials are wrong
+CREDENTIAL_ERRORS = (
+    "EMAIL_NOT_FOUND", "INVALID_PASSWORD", "INVALID_LOGIN_CREDENTIALS", "INVALID_EMAIL", "USER_DISABLED"
+)
+
+
+class IdentityToolkitError(Exception):
+    """Raised when the Identity Toolkit API fails or cannot be reached"""
+
+
+class InvalidCredentialsError(IdentityToolkitError):
+    """Raised when the email/password pair is rejected"""
+
+
+class IdentityToolkitClient:
+    """
+    Async client for the Firebase Auth (Identity Toolkit) REST API.
+
+    One ``httpx.AsyncClient`` is shared for the life of the process, so
+    sign-ins reuse pooled keep-alive connections (HTTP/2 when ``h2`` is
+    installed) instead of paying a TLS handshake each time. Connection
+    errors, 429 and 5xx responses are retried with jittered exponential
+    backoff; credential errors are not.
+    """
+
+    def __init__(self, api_key: str, base_url: str = IDENTITY_TOOLKIT_URL, timeout: float = 5.0,
+                 max_connections: int = 100, max_keepalive_connections: int = 20, retries: int = 2,
+                 backoff: float = 0.1, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = httpx.Timeout(timeout, connect=min(timeout, 2.0))
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=60.0
+        )
+        self.retries = retries
+        self.backoff = backoff
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created on first use so it binds to the running event loop
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=HTTP2_AVAILABLE and self.transport is None,
+                limits=self.limits,
+                timeout=self.timeout,
+                transport=self.transport
+            )
+        return self._client
+
+    async def sign_in_with_password(self, email: str, password: str) -> Dict[str, Any]:
+        """Verify an email/password pair and return the signInWithPassword response"""
+        return await self._post("accounts:signInWithPassword", {
+            "email": email,
+            "password": password,
+            "returnSecureToken": True
+        })
+
+    async def _post(self, method: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        client = self._get_client()
+        for attempt in range(self.retries + 1):
+            try:
+                response = await client.post(f"/{method}", params={"key": self.api_key}, json=body)
+            except httpx.TransportError as e:
+                error = IdentityToolkitError(f"{method} failed: {e}")
+            else:
+                if response.status_code == 200:
+                    return response.json()
+                error = self._error(method, response)
+                if response.status_code != 429 and response.status_code < 500:
+                    raise error
+
+            if attempt < self.retries:
+                logger.debug("Retrying %s after: %s", method, error)
+                # Full jitter keeps retries from many workers from synchronizing
+                await asyncio.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+        raise error
+
+    @staticmethod
+    def _error(method: str, response: httpx.Response) -> IdentityToolkitError:
+        try:
+            message = response.json()["error"]["message"]
+        except (ValueError, KeyError, TypeError):
+            message = f"HTTP {response.status_code}"
+        # Messages look like "INVALID_PASSWORD" or "TOO_MANY_ATTEMPTS_TRY_LATER : ..."
+        code = message.split(" ", 1)[0]
+        if code in CREDENTIAL_ERRORS:
+            return InvalidCredentialsError(code)
+        return IdentityToolkitError(f"{method} failed: {message}")
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @classmethod
+    def from_env(cls) -> Optional["IdentityToolkitClient"]:
+        """Build the client from FIREBASE_WEB_API_KEY, or None when password sign-in is not configured"""
+        emulator_host = os.getenv("FIREBASE_AUTH_EMULATOR_HOST")
+        if emulator_host:
+            default_url = f"http://{emulator_host}/identitytoolkit.googleapis.com/v1"
+        else:
+            default_url = IDENTITY_TOOLKIT_URL
+
+        api_key = os.getenv("FIREBASE_WEB_API_KEY") or ("emulator" if emulator_host else None)
+        if not api_key:
+            return None
+
+        return cls(
+            api_key,
+            base_url=os.getenv("IDENTITY_TOOLKIT_URL", default_url),
+            timeout=float(os.getenv("IDENTITY_TOOLKIT_TIMEOUT_SECONDS", "5")),
+            max_connections=int(os.getenv("IDENTITY_TOOLKIT_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("IDENTITY_TOOLKIT_MAX_KEEPALIVE", "20")),
+            retries=int(os.getenv("IDENTITY_TOOLKIT_RETRIES", "2"))
+        )
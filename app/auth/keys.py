@@ -0,0 +1,242 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import timedelta
+from typing import Optional, Dict, Any, List
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm
+
+logger = logging.getLogger(__name__)
+
+ASYMMETRIC_ALGORITHMS = ("ES256", "EdDSA")
+
+
+class SigningKey:
+    """A signing key and its parsed public half, tagged with a kid"""
+
+    __slots__ = ("kid", "created_at", "private_key", "public_key")
+
+    def __init__(self, kid: str, created_at: float, private_key: Any, public_key: Any):
+        self.kid = kid
+        self.created_at = created_at
+        self.private_key = private_key
+        self.public_key = public_key
+
+
+class KeyRing:
+    """
+    Kid-tagged signing keys with scheduled rotation.
+
+    Time is split into slots of ``rotation_interval``; the key for the
+    current slot signs new tokens and the key for the next slot is created
+    and published ahead of time, so verifiers that cache the JWKS already
+    know it when rotation happens. Old keys stay verifiable for
+    ``retention`` so that tokens signed with them remain valid until expiry.
+
+    When ``keys_dir`` is set, keys are persisted there as ``<kid>.pem`` and
+    every worker process converges on the same slot keys. Without it keys
+    live only in memory, which is suitable only for a single process whose
+    tokens may be invalidated by a restart. Keys are loaded or generated in
+    ``start()`` (or on first use), never at construction.
+
+    ``HS256`` keeps the legacy shared-secret mode: one symmetric key, no
+    rotation and an empty JWKS.
+    """
+
+    def __init__(self, algorithm: str = "ES256", keys_dir: Optional[str] = None,
+                 rotation_interval: timedelta = timedelta(hours=24),
+                 retention: timedelta = timedelta(days=7), secret: Optional[str] = None):
+        if algorithm not in ASYMMETRIC_ALGORITHMS + ("HS256",):
+            raise ValueError(f"Unsupported JWT algorithm: {algorithm}")
+        if algorithm == "HS256" and not secret:
+            raise ValueError("HS256 requires a JWT secret")
+
+        self.algorithm = algorithm
+        self.keys_dir = keys_dir
+        self.rotation_interval = rotation_interval.total_seconds()
+        self.retention = retention.total_seconds()
+        self._keys: Dict[str, SigningKey] = {}
+        self._active: Optional[SigningKey] = None
+        self._last_reload = 0.0
+        self._rotation_task: Optional[asyncio.Task] = None
+
+        if self.algorithm == "HS256":
+            self._active = SigningKey(None, time.time(), secret, secret)
+
+    @property
+    def asymmetric(self) -> bool:
+        return self.algorithm in ASYMMETRIC_ALGORITHMS
+
+    @property
+    def active(self) -> SigningKey:
+        """The key currently used to sign new tokens"""
+        if self._active is None:
+            self.ensure_keys()
+        return self._active
+
+    def get(self, kid: Optional[str]) -> Optional[SigningKey]:
+        """Return the key for a kid, if it is still verifiable"""
+        if self._active is None:
+            self.ensure_keys()
+        if not self.asymmetric:
+            return self._active
+        return self._keys.get(kid)
+
+    def sign(self, payload: Dict[str, Any]) -> str:
+        """Sign a payload with the active key"""
+        key = self.active
+        headers = {"kid": key.kid} if key.kid else None
+        return jwt.encode(payload, key.private_key, algorithm=self.algorithm, headers=headers)
+
+    def decode(self, token: str, **kwargs: Any) -> Dict[str, Any]:
+        """Verify a token against the key named by its kid header"""
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.get(kid)
+        if key is None and self.keys_dir and time.time() - self._last_reload > 5:
+            # Another worker may have rotated before our scheduled reload
+            self.ensure_keys()
+            key = self.get(kid)
+        if key is None:
+            raise jwt.InvalidKeyError(f"Unknown signing key: {kid}")
+        return jwt.decode(token, key.public_key, algorithms=[self.algorithm], **kwargs)
+
+    def jwks(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Return the public keys as a JSON Web Key Set"""
+        if not self.asymmetric:
+            return {"keys": []}
+        if self._active is None:
+            self.ensure_keys()
+
+        to_jwk = ECAlgorithm.to_jwk if self.algorithm == "ES256" else OKPAlgorithm.to_jwk
+        keys = []
+        for key in sorted(self._keys.values(), key=lambda k: k.created_at, reverse=True):
+            jwk = to_jwk(key.public_key, as_dict=True)
+            jwk.update({"kid": key.kid, "alg": self.algorithm, "use": "sig"})
+            keys.append(jwk)
+        return {"keys": keys}
+
+    @property
+    def jwks_max_age(self) -> int:
+        """How long clients may cache the JWKS; the next key is always pre-published"""
+        return int(min(self.rotation_interval / 2, 3600))
+
+    def ensure_keys(self) -> None:
+        """Load persisted keys, create current/next slot keys and drop expired ones"""
+        if not self.asymmetric:
+            return
+
+        now = time.time()
+        self._last_reload = now
+        if self.keys_dir:
+            self._load_dir()
+
+        slot = int(now // self.rotation_interval)
+        current = self._ensure_slot_key(slot)
+        self._ensure_slot_key(slot + 1)
+        self._active = current
+
+        cutoff = now - self.rotation_interval - self.retention
+        for kid, key in list(self._keys.items()):
+            if key.created_at < cutoff:
+                del self._keys[kid]
+                self._delete_file(kid)
+
+    async def start(self) -> None:
+        """Catch up with the current slot, then rotate keys in the background at every slot boundary"""
+        if not self.asymmetric:
+            return
+        if not self.keys_dir:
+            logger.warning("JWT_KEYS_DIR is not set; signing keys are kept in memory and "
+                           "issued tokens will not survive a restart")
+        # A worker forked from a long-lived parent inherits the parent's keys,
+        # which may be several slots old and already deleted by its siblings
+        await asyncio.to_thread(self.ensure_keys)
+        if self._rotation_task is None:
+            self._rotation_task = asyncio.create_task(self._rotation_loop())
+
+    async def stop(self) -> None:
+        if self._rotation_task is not None:
+            self._rotation_task.cancel()
+            try:
+                await self._rotation_task
+            except asyncio.CancelledError:
+                pass
+            self._rotation_task = None
+
+    async def _rotation_loop(self) -> None:
+        while True:
+            next_slot_at = (int(time.time() // self.rotation_interval) + 1) * self.rotation_interval
+            await asyncio.sleep(min(max(next_slot_at - time.time(), 0), 60))
+            try:
+                await asyncio.to_thread(self.ensure_keys)
+            except Exception as e:
+                logger.warning("Signing key rotation failed: %s", e)
+
+    def _kid_for_slot(self, slot: int) -> str:
+        return f"{self.algorithm.lower()}-{int(slot * self.rotation_interval)}"
+
+    def _ensure_slot_key(self, slot: int) -> SigningKey:
+        kid = self._kid_for_slot(slot)
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        private_key = self._generate_private_key()
+        if self.keys_dir and not self._write_file(kid, private_key):
+            # Another worker created this slot's key first; use theirs
+            self._load_dir()
+            return self._keys[kid]
+
+        key = SigningKey(kid, slot * self.rotation_interval, private_key, private_key.public_key())
+        self._keys[kid] = key
+        return key
+
+    def _generate_private_key(self) -> Any:
+        if self.algorithm == "ES256":
+            return ec.generate_private_key(ec.SECP256R1())
+        return ed25519.Ed25519PrivateKey.generate()
+
+    def _load_dir(self) -> None:
+        os.makedirs(self.keys_dir, mode=0o700, exist_ok=True)
+        prefix = f"{self.algorithm.lower()}-"
+        for name in os.listdir(self.keys_dir):
+            kid, ext = os.path.splitext(name)
+            if ext != ".pem" or not kid.startswith(prefix) or kid in self._keys:
+                continue
+            with open(os.path.join(self.keys_dir, name), "rb") as file:
+                private_key = serialization.load_pem_private_key(file.read(), password=None)
+            created_at = float(kid[len(prefix):])
+            self._keys[kid] = SigningKey(kid, created_at, private_key, private_key.public_key())
+
+    def _write_file(self, kid: str, private_key: Any) -> bool:
+        """Persist a new key; returns False if the file already exists"""
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        )
+        path = os.path.join(self.keys_dir, f"{kid}.pem")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as file:
+            file.write(pem)
+        try:
+            # link() publishes the complete file atomically and fails if it exists
+            os.link(tmp_path, path)
+            return True
+        except FileExistsError:
+            return False
+        finally:
+            os.remove(tmp_path)
+
+    def _delete_file(self, kid: str) -> None:
+        if not self.keys_dir:
+            return
+        try:
+            os.remove(os.path.join(self.keys_dir, f"{kid}.pem"))
+        except FileNotFoundError:
+            pass
@@ -1,5 +1,8 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional
+from pydantic import BaseModel, EmailStr, Field
+from typing import Optional, List
+import os
+
+VERIFY_BATCH_MAX_TOKENS = int(os.getenv("VERIFY_BATCH_MAX_TOKENS", "100"))
 
 
 class UserSignupRequest(BaseModel):
@@ -9,6 +12,10 @@ class UserSignupRequest(BaseModel):
     last_name: str
 
 
+class BatchSignupRequest(BaseModel):
+    users: List[UserSignupRequest]
+
+
 class UserLoginRequest(BaseModel):
     email: EmailStr
     password: str
@@ -20,7 +27,12 @@ class UserResponse(BaseModel):
     first_name: str
     last_name: str
     is_active: bool
-    created_at: str
+    # Breaking change in API 1.1.0: null when a login is served from the ID
+    # token alone, since the ID token does not carry the creation time
+    created_at: Optional[str] = Field(
+        default=None,
+        description="Account creation time; null on /auth/login when the profile is not cached (since 1.1.0)"
+    )
 
 
 class AuthResponse(BaseModel):
@@ -32,8 +44,13 @@ class AuthResponse(BaseModel):
 
 class TokenResponse(BaseModel):
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
 
 
 class RefreshTokenRequest(BaseModel):
-    refresh_token: str 
\ No newline at end of file
+    refresh_token: str 
+
+
+class BatchVerifyRequest(BaseModel):
+    tokens: List[str] = Field(max_length=VERIFY_BATCH_MAX_TOKENS)
@@ -0,0 +1,58 @@
+import base64
+import binascii
+import json
+import re
+import time
+from typing import Any, Dict, Optional
+
+# Well above any Firebase ID token or access token this service issues
+MAX_TOKEN_LENGTH = 8192
+
+_JWT_SHAPE = re.compile(r"[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+")
+
+
+class MalformedTokenError(Exception):
+    """Raised when a bearer token cannot possibly be a valid JWT"""
+
+
+def _decode_segment(segment: str) -> Dict[str, Any]:
+    try:
+        raw = base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+        value = json.loads(raw)
+    except (binascii.Error, ValueError) as e:
+        raise MalformedTokenError(f"Undecodable segment: {e}")
+    if not isinstance(value, dict):
+        raise MalformedTokenError("Segment is not a JSON object")
+    return value
+
+
+def precheck_token(token: str, now: Optional[float] = None, leeway: float = 0,
+                   require_kid: bool = True) -> Dict[str, Any]:
+    """
+    Structurally check a JWT before any signature verification or network call.
+
+    Rejects tokens that are too long, do not have three non-empty base64url
+    segments, lack ``alg`` (or ``kid``, unless ``require_kid`` is false) in
+    the header, or whose ``exp`` has already passed. Returns the unverified
+    header for dispatching; nothing here is trusted until the signature has
+    been verified.
+    """
+    if len(token) > MAX_TOKEN_LENGTH or not _JWT_SHAPE.fullmatch(token):
+        raise MalformedTokenError("Token is not three base64url segments")
+
+    segments = token.split(".")
+
+    header = _decode_segment(segments[0])
+    if not isinstance(header.get("alg"), str):
+        raise MalformedTokenError("Token header has no alg")
+    if (require_kid or "kid" in header) and not isinstance(header.get("kid"), str):
+        raise MalformedTokenError("Token header has no kid")
+
+    payload = _decode_segment(segments[1])
+    exp = payload.get("exp")
+    if not isinstance(exp, (int, float)) or isinstance(exp, bool):
+        raise MalformedTokenError("Token has no numeric exp")
+    if exp + leeway <= (time.time() if now is None else now):
+        raise MalformedTokenError("Token has expired")
+
+    return header
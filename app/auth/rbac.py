@@ -0,0 +1,90 @@
+import json
+import os
+from typing import Dict, Any, Iterable, List
+
+# Built-in roles used when RBAC_CONFIG_PATH is not set. Every role also
+# gets an implicit "role:<name>" permission, which inheriting roles receive
+# too, so require_role("user") admits admins.
+DEFAULT_RBAC_CONFIG: Dict[str, Any] = {
+    "roles": {
+        "user": {
+            "permissions": ["profile:read", "resources:create"]
+        },
+        "admin": {
+            "inherits": ["user"],
+            "permissions": ["resources:delete", "users:import", "tokens:verify"]
+        },
+        # For API gateways calling /auth/verify/batch with a service account
+        "gateway": {
+            "permissions": ["tokens:verify"]
+        }
+    }
+}
+
+
+class PermissionEngine:
+    """
+    Role hierarchy compiled into integer permission bitmasks.
+
+    Each permission is assigned one bit when the engine is built; each
+    role's mask is the OR of its own and all inherited permissions. A
+    permission check on the request path is then a single bitwise AND.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        roles = config.get("roles", {})
+        permissions = set()
+        for name, role in roles.items():
+            permissions.add(f"role:{name}")
+            permissions.update(role.get("permissions", []))
+
+        self.bits: Dict[str, int] = {
+            permission: 1 << index for index, permission in enumerate(sorted(permissions))
+        }
+        self.role_masks: Dict[str, int] = {}
+        for name in roles:
+            self.role_masks[name] = self._compile_role(name, roles, [])
+
+    def _compile_role(self, name: str, roles: Dict[str, Any], path: List[str]) -> int:
+        if name in path:
+            raise ValueError(f"Role inheritance cycle: {' -> '.join(path + [name])}")
+        if name not in roles:
+            raise ValueError(f"Unknown role: {name}")
+        if name in self.role_masks:
+            return self.role_masks[name]
+
+        role = roles[name]
+        mask = self.mask_for(f"role:{name}", *role.get("permissions", []))
+        for parent in role.get("inherits", []):
+            mask |= self._compile_role(parent, roles, path + [name])
+        return mask
+
+    def mask_for(self, *permissions: str) -> int:
+        """Compile permission names into a mask; unknown names are a configuration error"""
+        mask = 0
+        for permission in permissions:
+            if permission not in self.bits:
+                raise ValueError(f"Unknown permission: {permission}")
+            mask |= self.bits[permission]
+        return mask
+
+    def mask_for_role(self, role: str) -> int:
+        """Return the permission mask of a role; unknown roles get no permissions"""
+        return self.role_masks.get(role, 0)
+
+    def permissions_for(self, mask: int) -> Iterable[str]:
+        """Expand a mask back into permission names (for debugging and responses)"""
+        return [permission for permission, bit in self.bits.items() if mask & bit]
+
+    @classmethod
+    def from_env(cls) -> "PermissionEngine":
+        """Build the engine from RBAC_CONFIG_PATH, or the built-in roles"""
+        config_path = os.getenv("RBAC_CONFIG_PATH")
+        if not config_path:
+            return cls(DEFAULT_RBAC_CONFIG)
+        with open(config_path, "r") as file:
+            return cls(json.load(file))
+
+
+# Compiled once at import; shared by the auth service and route dependencies
+permission_engine = PermissionEngine.from_env()
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from typing import Optional, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationStore:
+    """
+    Persistent backend for revoked token and session ids.
+
+    Implementations must be safe to call from worker threads. ``load_since``
+    returns entries added after an opaque cursor so every process can pick
+    up revocations made by its siblings.
+    """
+
+    def add(self, key: str, expires_at: float) -> bool:
+        """Store a revocation; False if the key was already revoked, by any process"""
+        raise NotImplementedError
+
+    def load_since(self, cursor: int) -> Tuple[List[Tuple[str, float]], int]:
+        raise NotImplementedError
+
+    def purge_expired(self, now: float) -> None:
+        raise NotImplementedError
+
+
+class SQLiteRevocationStore(RevocationStore):
+    """Revocation store backed by a local SQLite database shared by all workers"""
+
+    def __init__(self, path: str = "revocations.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS revocations ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "key TEXT NOT NULL UNIQUE, "
+                "expires_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS revocations_expires_at ON revocations (expires_at)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def add(self, key: str, expires_at: float) -> bool:
+        with self._lock:
+            cursor = self._connection().execute(
+                "INSERT OR IGNORE INTO revocations (key, expires_at) VALUES (?, ?)",
+                (key, expires_at)
+            )
+        return cursor.rowcount == 1
+
+    def load_since(self, cursor: int) -> Tuple[List[Tuple[str, float]], int]:
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT id, key, expires_at FROM revocations WHERE id > ? ORDER BY id",
+                (cursor,)
+            ).fetchall()
+        if not rows:
+            return [], cursor
+        return [(key, expires_at) for _, key, expires_at in rows], rows[-1][0]
+
+    def purge_expired(self, now: float) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM revocations WHERE expires_at <= ?", (now,))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class RevocationIndex:
+    """
+    In-memory index of revoked refresh-token ids (``jti``) and session ids.
+
+    Lookups are a single dict probe, so checking revocation on every
+    refresh and verify costs well under a microsecond. Entries are kept
+    only until the token they revoke would have expired anyway, which
+    bounds the index by the number of revocations per refresh lifetime.
+    Revocations are persisted to an optional RevocationStore and other
+    processes pick them up with ``sync``.
+    """
+
+    def __init__(self, store: Optional[RevocationStore] = None, sync_interval: float = 5.0):
+        self.store = store
+        self.sync_interval = sync_interval
+        self._revoked: Dict[str, float] = {}
+        self._cursor = 0
+        self._sync_task: Optional[asyncio.Task] = None
+
+    def is_revoked(self, key: str) -> bool:
+        """Whether a jti or session id has been revoked"""
+        return key in self._revoked
+
+    def revoke_local(self, key: str, expires_at: float) -> None:
+        """Record a revocation in this process immediately"""
+        self._revoked[key] = expires_at
+
+    def persist(self, key: str, expires_at: float) -> bool:
+        """
+        Write a revocation to the backing store (blocking).
+
+        Returns False if the store already had it, i.e. another process
+        revoked the same key first.
+        """
+        if self.store is None:
+            return True
+        return self.store.add(key, expires_at)
+
+    def sync(self) -> None:
+        """Load revocations written by other processes and drop expired ones (blocking)"""
+        now = time.time()
+        if self.store is not None:
+            rows, self._cursor = self.store.load_since(self._cursor)
+            for key, expires_at in rows:
+                if expires_at > now:
+                    self._revoked[key] = expires_at
+            self.store.purge_expired(now)
+
+        # list() snapshots the dict in one step; the event loop may be adding entries
+        expired = [key for key, expires_at in list(self._revoked.items()) if expires_at <= now]
+        for key in expired:
+            self._revoked.pop(key, None)
+
+    async def start(self) -> None:
+        """Load existing revocations and keep syncing in the background"""
+        await asyncio.to_thread(self.sync)
+        if self._sync_task is None:
+            self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def stop(self) -> None:
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+
+    async def _sync_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await asyncio.to_thread(self.sync)
+            except Exception as e:
+                logger.warning("Revocation sync failed: %s", e)
+
+    def __len__(self) -> int:
+        return len(self._revoked)
@@ -1,45 +1,67 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Request, status, Depends
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer
 from .models import (
     UserSignupRequest, 
+    BatchSignupRequest,
     UserLoginRequest, 
     AuthResponse, 
     UserResponse, 
     TokenResponse,
-    RefreshTokenRequest
+    RefreshTokenRequest,
+    BatchVerifyRequest
 )
 from .firebase_auth import firebase_auth
-from .dependencies import get_current_user
-from typing import Dict, Any
+from .throttle import auth_throttle, ThrottledError
+from .dependencies import get_current_user, get_current_user_profile, require_permission, verify_bearer_token
+from ..responses import FastJSONResponse, ModelResponse, StaticJSONResponse, dumps
+from typing import Dict, Any, Optional
+import asyncio
+import os
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+BATCH_SIGNUP_MAX_USERS = int(os.getenv("BATCH_SIGNUP_MAX_USERS", "10000"))
+
+# Routes served from the site root rather than under /auth
+well_known_router = APIRouter(prefix="/.well-known", tags=["authentication"])
+
+
+async def check_throttle(request: Request, email: str) -> None:
+    """Reject the attempt with 429 before any Firebase call if its IP or email is throttled"""
+    try:
+        await auth_throttle.check(auth_throttle.client_ip(request), email)
+    except ThrottledError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts, try again later",
+            headers={"Retry-After": e.retry_after_header}
+        )
+
+
+LOGGED_OUT = StaticJSONResponse.template({"message": "Successfully logged out"})
+
 
 @router.post("/signup", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
-async def signup(user_data: UserSignupRequest):
+async def signup(user_data: UserSignupRequest, request: Request):
     """
     Create a new user account
     """
+    await check_throttle(request, user_data.email)
     try:
-        # Create user in Firebase
-        user = await firebase_auth.create_user(
+        # Create the user and mint its tokens in one Firebase round trip
+        auth_result = await firebase_auth.signup_user(
             email=user_data.email,
             password=user_data.password,
             first_name=user_data.first_name,
             last_name=user_data.last_name
         )
         
-        # Sign in the user to get tokens
-        auth_result = await firebase_auth.sign_in_user(
-            email=user_data.email,
-            password=user_data.password
-        )
-        
-        return AuthResponse(
+        return ModelResponse(AuthResponse(
             access_token=auth_result["access_token"],
             refresh_token=auth_result["refresh_token"],
             user=UserResponse(**auth_result["user"])
-        )
+        ), status_code=status.HTTP_201_CREATED)
         
     except Exception as e:
         raise HTTPException(
@@ -48,22 +70,55 @@ async def signup(user_data: UserSignupRequest):
         )
 
 
+@router.post("/signup/batch", status_code=status.HTTP_200_OK)
+async def signup_batch(
+    batch: BatchSignupRequest,
+    current_user: Dict[str, Any] = Depends(require_permission("users:import"))
+):
+    """
+    Create many user accounts at once (requires the users:import permission).
+
+    Streams one NDJSON line per user with its status, followed by a summary
+    line. Failed records are reported without aborting the batch.
+    """
+    if len(batch.users) > BATCH_SIGNUP_MAX_USERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {BATCH_SIGNUP_MAX_USERS} users per batch"
+        )
+
+    async def results():
+        succeeded = 0
+        async for item in firebase_auth.import_users([user.model_dump() for user in batch.users]):
+            succeeded += item["status"] == "created"
+            yield dumps(item) + b"\n"
+        yield dumps({
+            "status": "complete",
+            "total": len(batch.users),
+            "succeeded": succeeded,
+            "failed": len(batch.users) - succeeded
+        }) + b"\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
 @router.post("/login", response_model=AuthResponse)
-async def login(user_data: UserLoginRequest):
+async def login(user_data: UserLoginRequest, request: Request):
     """
     Authenticate user and return access tokens
     """
+    await check_throttle(request, user_data.email)
     try:
         auth_result = await firebase_auth.sign_in_user(
             email=user_data.email,
             password=user_data.password
         )
         
-        return AuthResponse(
+        return ModelResponse(AuthResponse(
             access_token=auth_result["access_token"],
             refresh_token=auth_result["refresh_token"],
             user=UserResponse(**auth_result["user"])
-        )
+        ))
         
     except Exception as e:
         raise HTTPException(
@@ -75,20 +130,24 @@ async def login(user_data: UserLoginRequest):
 @router.post("/refresh", response_model=TokenResponse)
 async def refresh_token(refresh_data: RefreshTokenRequest):
     """
-    Refresh access token using refresh token
+    Refresh access token using refresh token.
+    The refresh token is single use; store the new one from the response.
     """
     try:
-        new_access_token = await firebase_auth.refresh_access_token(
+        tokens = await firebase_auth.refresh_access_token(
             refresh_data.refresh_token
         )
         
-        if not new_access_token:
+        if not tokens:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid refresh token"
             )
         
-        return TokenResponse(access_token=new_access_token)
+        return ModelResponse(TokenResponse(
+            access_token=tokens["access_token"],
+            refresh_token=tokens["refresh_token"]
+        ))
         
     except Exception as e:
         raise HTTPException(
@@ -98,26 +157,29 @@ async def refresh_token(refresh_data: RefreshTokenRequest):
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: Dict[str, Any] = Depends(get_current_user)):
+async def get_current_user_info(current_user: Dict[str, Any] = Depends(get_current_user_profile)):
     """
     Get current user information
     """
-    return UserResponse(
+    return ModelResponse(UserResponse(
         id=current_user["uid"],
         email=current_user["email"],
         first_name=current_user["first_name"],
         last_name=current_user["last_name"],
-        is_active=True,
-        created_at=""  # You might want to fetch this from your database
-    )
+        is_active=current_user["is_active"],
+        created_at=current_user["created_at"]
+    ))
 
 
 @router.post("/logout")
-async def logout():
+async def logout(refresh_data: Optional[RefreshTokenRequest] = None):
     """
-    Logout user (client should discard tokens)
+    Logout user. When the refresh token is sent, its whole session is
+    revoked and its access tokens stop working immediately.
     """
-    return {"message": "Successfully logged out"}
+    if refresh_data is not None:
+        await firebase_auth.revoke_session(refresh_data.refresh_token)
+    return LOGGED_OUT()
 
 
 @router.get("/verify")
@@ -125,11 +187,53 @@ async def verify_token(current_user: Dict[str, Any] = Depends(get_current_user))
     """
     Verify if the current token is valid
     """
-    return {
+    return FastJSONResponse({
         "valid": True,
         "user": {
             "id": current_user["uid"],
             "email": current_user["email"],
             "role": current_user["role"]
         }
-    } 
\ No newline at end of file
+    })
+
+
+@router.post("/verify/batch")
+async def verify_tokens_batch(
+    batch: BatchVerifyRequest,
+    current_user: Dict[str, Any] = Depends(require_permission("tokens:verify"))
+):
+    """
+    Verify many tokens in one call, e.g. from an API gateway (requires the
+    tokens:verify permission).
+
+    Returns one result per input token, in order. Duplicate tokens are
+    verified once. Batches over VERIFY_BATCH_MAX_TOKENS fail validation.
+    """
+    unique_tokens = list(dict.fromkeys(batch.tokens))
+    users = await asyncio.gather(*(verify_bearer_token(token) for token in unique_tokens))
+    results = {}
+    for token, user in zip(unique_tokens, users):
+        if user:
+            results[token] = {
+                "valid": True,
+                "user": {
+                    "id": user["uid"],
+                    "email": user["email"],
+                    "role": user["role"]
+                }
+            }
+        else:
+            results[token] = {"valid": False}
+
+    return FastJSONResponse({"results": [results[token] for token in batch.tokens]})
+
+
+@well_known_router.get("/jwks.json")
+async def jwks():
+    """
+    Public keys for verifying access and refresh tokens issued by this API
+    """
+    return FastJSONResponse(
+        content=firebase_auth.key_ring.jwks(),
+        headers={"Cache-Control": f"public, max-age={firebase_auth.key_ring.jwks_max_age}"}
+    )
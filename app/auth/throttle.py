@@ -0,0 +1,209 @@
+import asyncio
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Dict, Callable
+from ..metrics import throttled_requests
+
+
+class ThrottledError(Exception):
+    """Raised when a client or account has exhausted its attempts"""
+
+    def __init__(self, scope: str, retry_after: float):
+        super().__init__(f"Too many attempts ({scope})")
+        self.scope = scope
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        """Retry-After value in whole seconds, rounded up"""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class ThrottleBackend:
+    """
+    Storage for token buckets.
+
+    Buckets are kept as a single float per key, the time at which the
+    bucket will be full again (the GCRA formulation of a token bucket),
+    so refilling is computed lazily from the clock on each attempt.
+    ``acquire`` takes one token and returns 0, or the number of seconds
+    until a token is available without taking one.
+    """
+
+    # Blocking backends are called from a worker thread
+    blocking = False
+
+    def acquire(self, key: str, interval: float, burst: int) -> float:
+        raise NotImplementedError
+
+
+def _gcra(full_at: Optional[float], interval: float, burst: int, now: float):
+    """Return (retry_after, new_full_at) for one attempt against a bucket"""
+    new_full_at = max(full_at or now, now) + interval
+    retry_after = new_full_at - now - interval * burst
+    if retry_after > 0:
+        return retry_after, full_at
+    return 0.0, new_full_at
+
+
+class MemoryThrottleBackend(ThrottleBackend):
+    """Per-process buckets; keys whose bucket has refilled are swept periodically"""
+
+    def __init__(self, sweep_interval: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+        self._full_at: Dict[str, float] = {}
+        self._next_sweep = clock() + sweep_interval
+
+    def acquire(self, key: str, interval: float, burst: int) -> float:
+        now = self.clock()
+        if now >= self._next_sweep:
+            self.sweep(now)
+        retry_after, full_at = _gcra(self._full_at.get(key), interval, burst, now)
+        if not retry_after:
+            self._full_at[key] = full_at
+        return retry_after
+
+    def sweep(self, now: float) -> None:
+        """Drop keys whose bucket is full again; they behave exactly like unseen keys"""
+        idle = [key for key, full_at in list(self._full_at.items()) if full_at <= now]
+        for key in idle:
+            self._full_at.pop(key, None)
+        self._next_sweep = now + self.sweep_interval
+
+    def __len__(self) -> int:
+        return len(self._full_at)
+
+
+class SQLiteThrottleBackend(ThrottleBackend):
+    """Buckets shared by all workers through a local SQLite database"""
+
+    blocking = True
+
+    def __init__(self, path: str = "throttle.db", sweep_interval: float = 60.0):
+        self.path = path
+        self.sweep_interval = sweep_interval
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._next_sweep = 0.0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, full_at REAL NOT NULL)")
+            self._conn = conn
+        return self._conn
+
+    def acquire(self, key: str, interval: float, burst: int) -> float:
+        # Buckets are compared across processes, so use wall-clock time
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT full_at FROM buckets WHERE key = ?", (key,)).fetchone()
+                retry_after, full_at = _gcra(row[0] if row else None, interval, burst, now)
+                if not retry_after:
+                    conn.execute("INSERT OR REPLACE INTO buckets (key, full_at) VALUES (?, ?)", (key, full_at))
+                if now >= self._next_sweep:
+                    conn.execute("DELETE FROM buckets WHERE full_at <= ?", (now,))
+                    self._next_sweep = now + self.sweep_interval
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return retry_after
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class AuthThrottle:
+    """
+    Token-bucket limits on credential endpoints, keyed by client IP and by email.
+
+    Checked before any Firebase call, so a credential-stuffing burst is
+    rejected locally instead of consuming Firebase quota. The IP limit
+    bounds one client trying many accounts; the email limit bounds many
+    clients trying one account.
+    """
+
+    def __init__(self, backend: ThrottleBackend, ip_per_minute: float = 30, ip_burst: int = 10,
+                 email_per_minute: float = 10, email_burst: int = 5, enabled: bool = True,
+                 trust_forwarded_for: bool = False, trusted_proxy_hops: int = 1):
+        self.backend = backend
+        self.enabled = enabled
+        self.trust_forwarded_for = trust_forwarded_for
+        self.trusted_proxy_hops = max(1, trusted_proxy_hops)
+        self.limits = {
+            "ip": (60.0 / ip_per_minute, ip_burst),
+            "email": (60.0 / email_per_minute, email_burst),
+        }
+
+    def client_ip(self, request) -> Optional[str]:
+        """
+        The client address; behind trusted proxies, the X-Forwarded-For entry
+        appended by the outermost one.
+
+        Each proxy appends the address it received the request from, so only
+        the right-most ``trusted_proxy_hops`` entries were written by our
+        proxies; anything to their left is whatever the client sent.
+        """
+        if self.trust_forwarded_for:
+            forwarded_for = request.headers.get("x-forwarded-for")
+            if forwarded_for:
+                hops = [hop.strip() for hop in forwarded_for.split(",")]
+                if len(hops) >= self.trusted_proxy_hops:
+                    return hops[-self.trusted_proxy_hops]
+        return request.client.host if request.client else None
+
+    async def check(self, client_ip: Optional[str], email: str) -> None:
+        """Take one attempt from both buckets, raising ThrottledError if either is empty"""
+        if not self.enabled:
+            return
+        keys = [("email", email.lower())]
+        if client_ip:
+            keys.insert(0, ("ip", client_ip))
+
+        for scope, value in keys:
+            interval, burst = self.limits[scope]
+            key = f"{scope}:{value}"
+            if self.backend.blocking:
+                retry_after = await asyncio.to_thread(self.backend.acquire, key, interval, burst)
+            else:
+                retry_after = self.backend.acquire(key, interval, burst)
+            if retry_after:
+                throttled_requests.labels(scope).inc()
+                raise ThrottledError(scope, retry_after)
+
+    @classmethod
+    def from_env(cls) -> "AuthThrottle":
+        backend_name = os.getenv("THROTTLE_BACKEND", "memory").lower()
+        if backend_name == "memory":
+            backend: ThrottleBackend = MemoryThrottleBackend()
+        elif backend_name == "sqlite":
+            backend = SQLiteThrottleBackend(os.getenv("THROTTLE_DB_PATH", "throttle.db"))
+        else:
+            raise ValueError(f"Unsupported throttle backend: {backend_name}")
+
+        return cls(
+            backend,
+            ip_per_minute=float(os.getenv("THROTTLE_IP_PER_MINUTE", "30")),
+            ip_burst=int(os.getenv("THROTTLE_IP_BURST", "10")),
+            email_per_minute=float(os.getenv("THROTTLE_EMAIL_PER_MINUTE", "10")),
+            email_burst=int(os.getenv("THROTTLE_EMAIL_BURST", "5")),
+            enabled=os.getenv("THROTTLE_ENABLED", "true").lower() == "true",
+            trust_forwarded_for=os.getenv("THROTTLE_TRUST_FORWARDED_FOR", "false").lower() == "true",
+            trusted_proxy_hops=int(os.getenv("THROTTLE_TRUSTED_PROXY_HOPS", "1"))
+        )
+
+
+# Shared by the login and signup routes; tests can swap ``backend``
+auth_throttle = AuthThrottle.from_env()
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import logging
+import re
+import time
+from typing import Optional, Dict, Any, Tuple
+
+import jwt
+import requests
+from cryptography import x509
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_CERTS_URL = (
+    "https://www.googleapis.com/robot/v1/metadata/x509/"
+    "securetoken@system.gserviceaccount.com"
+)
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class InvalidIdTokenError(Exception):
+    """Raised when an ID token fails signature or claim checks"""
+
+
+class UnknownKidError(InvalidIdTokenError):
+    """Raised when an ID token names a key that is not (yet) in the key cache"""
+
+
+class SigningKeyCache:
+    """
+    In-memory set of Firebase ID-token signing keys indexed by ``kid``.
+
+    Certificates are parsed once when they are fetched, so lookups on the
+    request path are plain dict reads. ``source`` is either an HTTPS URL
+    (Google's x509 endpoint) or a local JSON file mapping kid to PEM
+    certificate, which keeps the verifier testable offline.
+    """
+
+    def __init__(self, source: str = GOOGLE_CERTS_URL, default_max_age: float = 3600.0,
+                 refresh_margin: float = 300.0, retry_interval: float = 30.0):
+        self.source = source
+        self.default_max_age = default_max_age
+        self.refresh_margin = refresh_margin
+        self.retry_interval = retry_interval
+        self.expires_at = 0.0
+        self.loaded_at = 0.0
+        self._keys: Dict[str, Any] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether at least one signing key has been loaded"""
+        return bool(self._keys)
+
+    def get(self, kid: str) -> Optional[Any]:
+        """Return the parsed public key for a kid, if known"""
+        return self._keys.get(kid)
+
+    def load(self, certificates: Dict[str, str], max_age: Optional[float] = None) -> None:
+        """Parse PEM certificates and atomically replace the key set"""
+        keys = {
+            kid: x509.load_pem_x509_certificate(pem.encode("utf-8")).public_key()
+            for kid, pem in certificates.items()
+        }
+        self._keys = keys
+        self.loaded_at = time.time()
+        self.expires_at = self.loaded_at + (max_age if max_age is not None else self.default_max_age)
+
+    def fetch(self) -> Tuple[Dict[str, str], float]:
+        """Fetch certificates and their max-age from the configured source"""
+        if not self.source.startswith(("http://", "https://")):
+            with open(self.source, "r") as file:
+                return json.load(file), self.default_max_age
+
+        response = requests.get(self.source, timeout=10)
+        response.raise_for_status()
+        match = _MAX_AGE_RE.search(response.headers.get("Cache-Control", ""))
+        max_age = float(match.group(1)) if match else self.default_max_age
+        return response.json(), max_age
+
+    def refresh(self) -> None:
+        """Fetch and load the current key set (blocking)"""
+        certificates, max_age = self.fetch()
+        self.load(certificates, max_age)
+
+    async def start(self) -> None:
+        """Warm the key set and keep it fresh in the background"""
+        try:
+            await asyncio.to_thread(self.refresh)
+        except Exception as e:
+            logger.warning("Initial signing key fetch failed: %s", e)
+
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Cancel the background refresh task"""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    def request_refresh(self) -> None:
+        """Wake the background task early, e.g. after seeing an unknown kid"""
+        # Forged kids must not be able to turn this into a refresh storm
+        if time.time() - self.loaded_at < self.retry_interval:
+            return
+        self.expires_at = min(self.expires_at, time.time() + self.refresh_margin)
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            delay = self.expires_at - self.refresh_margin - time.time()
+            if delay > 0:
+                # Sleep in short slices so request_refresh() is picked up promptly
+                await asyncio.sleep(min(delay, self.retry_interval))
+                continue
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                logger.warning("Signing key refresh failed: %s", e)
+                await asyncio.sleep(self.retry_interval)
+
+
+class IdTokenVerifier:
+    """
+    Verifies Firebase ID tokens locally against a SigningKeyCache.
+
+    Performs the same signature and claim checks as
+    ``firebase_admin.auth.verify_id_token`` without any I/O.
+    """
+
+    def __init__(self, project_id: str, key_cache: SigningKeyCache, clock_skew: int = 0):
+        self.project_id = project_id
+        self.issuer = f"https://securetoken.google.com/{project_id}"
+        self.key_cache = key_cache
+        self.clock_skew = clock_skew
+
+    @property
+    def ready(self) -> bool:
+        return self.key_cache.ready
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """Verify an ID token and return its decoded claims"""
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError as e:
+            raise InvalidIdTokenError(f"Malformed ID token: {e}")
+
+        if header.get("alg") != "RS256":
+            raise InvalidIdTokenError("ID token has incorrect algorithm")
+
+        key = self.key_cache.get(header.get("kid", ""))
+        if key is None:
+            self.key_cache.request_refresh()
+            raise UnknownKidError("ID token has an unknown kid")
+
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=["RS256"],
+                audience=self.project_id,
+                issuer=self.issuer,
+                leeway=self.clock_skew,
+                options={"require": ["exp", "iat", "aud", "iss", "sub"]}
+            )
+        except jwt.PyJWTError as e:
+            raise InvalidIdTokenError(f"Invalid ID token: {e}")
+
+        subject = claims.get("sub")
+        if not isinstance(subject, str) or not subject or len(subject) > 128:
+            raise InvalidIdTokenError("ID token has an invalid subject")
+        if claims.get("auth_time", 0) > time.time() + self.clock_skew:
+            raise InvalidIdTokenError("ID token has a future auth_time")
+
+        claims["uid"] = subject
+        return claims
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends
-from app.auth.dependencies import get_current_user, get_current_active_user, require_admin, require_user
+from app.auth.dependencies import get_current_user, get_current_active_user, require_admin, require_user, require_permission
+from app.responses import FastJSONResponse
 from typing import Dict, Any
 
 router = APIRouter(prefix="/protected", tags=["protected"])
@@ -10,7 +11,7 @@ async def get_user_info(current_user: Dict[str, Any] = Depends(get_current_user)
     """
     Get information about the currently authenticated user
     """
-    return {
+    return FastJSONResponse({
         "message": "User information retrieved successfully",
         "user": {
             "id": current_user["uid"],
@@ -19,7 +20,7 @@ async def get_user_info(current_user: Dict[str, Any] = Depends(get_current_user)
             "last_name": current_user["last_name"],
             "role": current_user["role"]
         }
-    }
+    })
 
 
 @router.get("/active-only")
@@ -75,10 +76,10 @@ async def create_resource(
 @router.delete("/delete-resource/{resource_id}")
 async def delete_resource(
     resource_id: str,
-    current_user: Dict[str, Any] = Depends(require_admin)
+    current_user: Dict[str, Any] = Depends(require_permission("resources:delete"))
 ):
     """
-    Example of deleting a resource (admin only)
+    Example of deleting a resource (requires the resources:delete permission)
     """
     return {
         "message": f"Resource {resource_id} deleted successfully",
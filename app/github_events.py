@@ -0,0 +1,291 @@
+"""
+Streaming summaries of GitHub webhook/Actions event payloads.
+
+``pull_request`` payloads run to megabytes (the PR body, repository and
+user objects, each repeated several times), but the event logger only
+needs a handful of values from them. ``summarize`` tokenizes the file in
+chunks and skips every value outside the projected paths without
+decoding it, so memory stays proportional to the largest single token,
+and it stops reading as soon as every projected field has been seen.
+
+``handle_event`` logs one summarized event; ``main.py`` and the webhook
+workers in ``app.webhooks`` both use it.
+
+``summarize_directory`` runs the same projection over a directory of
+archived event files on a process pool and writes one NDJSON line per
+file.
+
+Only the standard library is used, so this runs in the bare Actions
+runner without installing requirements.txt.
+"""
+
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Tuple, Union
+
+PathKey = Union[str, int]
+
+# Output name -> dotted path into the payload; numeric segments index arrays
+DEFAULT_FIELDS: Dict[str, str] = {
+    "action": "action",
+    "number": "number",
+    "pr_number": "pull_request.number",
+    "pr_state": "pull_request.state",
+    "draft": "pull_request.draft",
+    "head_sha": "pull_request.head.sha",
+    "head_ref": "pull_request.head.ref",
+    "base_ref": "pull_request.base.ref",
+    "commits": "pull_request.commits",
+    "changed_files": "pull_request.changed_files",
+    "additions": "pull_request.additions",
+    "deletions": "pull_request.deletions",
+    "issue_number": "issue.number",
+    "comment_id": "comment.id",
+    "repository": "repository.full_name",
+    "sender": "sender.login",
+}
+
+CHUNK_SIZE = 64 * 1024
+
+# One JSON token after optional whitespace: a complete string, a structural
+# character, or a bare literal/number. An unterminated string matches nothing.
+_TOKEN = re.compile(r'\s*("[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]:,]|[^\s{}\[\]:,"]+)', re.DOTALL)
+_WHITESPACE = re.compile(r"\s*")
+# Everything up to the next bracket outside a string
+_SKIP = re.compile(r'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*')
+
+
+class _Done(Exception):
+    """Raised internally once every projected field has been found"""
+
+
+def parse_fields(spec: Optional[str]) -> Dict[str, str]:
+    """
+    Parse a comma-separated field list into {name: path}.
+
+    Entries are ``name=path`` or a bare path, which is also used as the
+    name. An empty or missing spec returns DEFAULT_FIELDS.
+    """
+    if not spec or not spec.strip():
+        return dict(DEFAULT_FIELDS)
+    fields: Dict[str, str] = {}
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, _, path = entry.partition("=")
+        fields[name.strip()] = (path or name).strip()
+    return fields
+
+
+def _split_path(path: str) -> Tuple[PathKey, ...]:
+    return tuple(int(part) if part.isdigit() else part for part in path.split("."))
+
+
+class _Scanner:
+    """Chunked JSON tokenizer that can skip whole containers without tokenizing them"""
+
+    def __init__(self, file: TextIO, chunk_size: int = CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Read the next chunk; False once the end of input has already been reached"""
+        if self.eof:
+            return False
+        pending = self.buffer[self.pos:]
+        # Read at least as much as is pending so a long string that spans
+        # many chunks is rescanned a logarithmic number of times
+        chunk = self.file.read(max(self.chunk_size, len(pending)))
+        self.eof = not chunk
+        self.buffer = pending + chunk
+        self.pos = 0
+        return True
+
+    def next(self) -> str:
+        """The next token; raises ValueError at the end of input"""
+        while True:
+            match = _TOKEN.match(self.buffer, self.pos)
+            # A token that reaches the end of the buffer may continue in the next chunk
+            if match is not None and (match.end() < len(self.buffer) or self.eof):
+                self.pos = match.end()
+                return match.group(1)
+            if not self._fill():
+                if _WHITESPACE.fullmatch(self.buffer, self.pos):
+                    raise ValueError("Unexpected end of JSON input")
+                raise ValueError(f"Invalid JSON near: {self.buffer[self.pos:self.pos + 40]!r}")
+
+    def skip(self) -> None:
+        """Consume input up to and including the bracket closing the current container"""
+        depth = 1
+        while depth:
+            # Strings and runs of other characters are consumed in bulk, so
+            # only brackets cost a Python-level step
+            self.pos = _SKIP.match(self.buffer, self.pos).end()
+            if self.pos == len(self.buffer) or self.buffer[self.pos] == '"':
+                # Out of input, or a string that continues in the next chunk
+                if not self._fill():
+                    raise ValueError("Unexpected end of JSON input")
+                continue
+            depth += 1 if self.buffer[self.pos] in "{[" else -1
+            self.pos += 1
+
+
+class _Projector:
+    """Recursive descent over a token stream that only descends into projected paths"""
+
+    def __init__(self, scanner: _Scanner, fields: Dict[str, str]):
+        self.scanner = scanner
+        self._next = scanner.next
+        self.wanted = {_split_path(path): name for name, path in fields.items()}
+        self.prefixes = {path[:depth] for path in self.wanted for depth in range(len(path))}
+        self.result: Dict[str, Any] = {}
+
+    def run(self) -> Dict[str, Any]:
+        try:
+            self._value(())
+        except _Done:
+            pass
+        return self.result
+
+    def _value(self, path: Tuple[PathKey, ...], token: Optional[str] = None) -> None:
+        if token is None:
+            token = self._next()
+        name = self.wanted.get(path)
+        if name is not None:
+            self.result[name] = self._capture(token)
+            if len(self.result) == len(self.wanted):
+                raise _Done()
+        elif path in self.prefixes and token == "{":
+            self._object(path)
+        elif path in self.prefixes and token == "[":
+            self._array(path)
+        else:
+            self._skip(token)
+
+    def _object(self, path: Tuple[PathKey, ...]) -> None:
+        token = self._next()
+        if token == "}":
+            return
+        while True:
+            if not token.startswith('"'):
+                raise ValueError(f"Expected an object key, got {token!r}")
+            key = json.loads(token)
+            if self._next() != ":":
+                raise ValueError(f"Expected ':' after key {key!r}")
+            self._value(path + (key,))
+            token = self._next()
+            if token == "}":
+                return
+            if token != ",":
+                raise ValueError(f"Expected ',' or '}}', got {token!r}")
+            token = self._next()
+
+    def _array(self, path: Tuple[PathKey, ...]) -> None:
+        index = 0
+        while True:
+            token = self._next()
+            if token == "]" and index == 0:
+                return
+            self._value(path + (index,), token)
+            index += 1
+            token = self._next()
+            if token == "]":
+                return
+            if token != ",":
+                raise ValueError(f"Expected ',' or ']', got {token!r}")
+
+    def _skip(self, token: str) -> None:
+        # Skipped values are only bracket-matched, not validated
+        if token in ("{", "["):
+            self.scanner.skip()
+
+    def _capture(self, token: str) -> Any:
+        if token not in ("{", "["):
+            return json.loads(token)
+        parts = [token]
+        depth = 1
+        while depth:
+            token = self._next()
+            parts.append(token)
+            if token in ("{", "["):
+                depth += 1
+            elif token in ("}", "]"):
+                depth -= 1
+        return json.loads("".join(parts))
+
+
+def summarize(file: TextIO, fields: Optional[Dict[str, str]] = None, chunk_size: int = CHUNK_SIZE) -> Dict[str, Any]:
+    """Return the projected fields present in a JSON event stream; absent fields are omitted"""
+    return _Projector(_Scanner(file, chunk_size), fields or DEFAULT_FIELDS).run()
+
+
+def summarize_file(path: str, fields: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as file:
+        return summarize(file, fields)
+
+
+def _print(message: str, *args: Any) -> None:
+    print(message % args)
+
+
+def handle_event(event_name: Optional[str], summary: Dict[str, Any], emit: Callable[..., None] = _print) -> None:
+    """
+    Log a summarized event as one compact JSON line.
+
+    ``emit`` is called logging-style with a constant message and its
+    arguments, so ``logger.info`` can be passed directly and every event
+    shares one rate-limit key.
+    """
+    emit("Event summary (%s): %s", event_name, json.dumps(summary, separators=(",", ":")))
+
+
+def _summarize_entry(args: Tuple[str, Dict[str, str]]) -> Dict[str, Any]:
+    # Runs in a pool worker; errors are reported per file instead of failing the batch
+    path, fields = args
+    try:
+        summary = summarize_file(path, fields)
+    except (OSError, ValueError) as e:
+        return {"file": os.path.basename(path), "error": str(e)}
+    return {"file": os.path.basename(path), **summary}
+
+
+def event_files(directory: str, suffix: str = ".json") -> List[str]:
+    """Event files in a directory, in name order"""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.endswith(suffix) and os.path.isfile(os.path.join(directory, name))
+    )
+
+
+def summarize_directory(directory: str, output: TextIO, fields: Optional[Dict[str, str]] = None,
+                        workers: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Summarize every event file in ``directory`` on a process pool, writing
+    NDJSON to ``output`` in file-name order. Returns (files, errors).
+    """
+    fields = fields or DEFAULT_FIELDS
+    paths = event_files(directory)
+    workers = workers or os.cpu_count() or 1
+    errors = 0
+
+    def write(summaries: Iterable[Dict[str, Any]]) -> None:
+        nonlocal errors
+        for summary in summaries:
+            errors += "error" in summary
+            output.write(json.dumps(summary, separators=(",", ":")) + "\n")
+
+    jobs = [(path, fields) for path in paths]
+    if workers == 1 or len(paths) < 2:
+        write(map(_summarize_entry, jobs))
+    else:
+        # Several files per task so small events do not pay one IPC round trip each
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            write(pool.map(_summarize_entry, jobs, chunksize=chunksize))
+    return len(paths), errors
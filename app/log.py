@@ -0,0 +1,172 @@
+"""
+Non-blocking structured logging.
+
+``setup_logging`` routes the root logger through a ``QueueHandler``, so
+a log call on the request path only filters the record and puts it on
+an in-memory queue. A ``QueueListener`` thread formats the records as
+JSON lines and writes them to stdout, off the event loop.
+
+``RateLimitFilter`` runs before the enqueue and limits each message
+type (logger plus unformatted message) to a token bucket. Once a type
+is over its limit only every Nth record is kept, and that record is
+annotated with how many were dropped. A flood of rejected tokens then
+costs a few dict lookups per request instead of a blocking stdout write.
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Attributes every LogRecord has; anything else came in through ``extra``
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including ``extra`` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "time": round(record.created, 6),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Per message type token bucket with 1-in-N sampling beyond the limit.
+
+    Records of a type pass while its bucket has tokens (``burst``, refilled
+    at ``rate`` per second). After that, every ``sample_every``-th record
+    still passes, carrying a ``suppressed`` count of the records dropped
+    since the last one that got through. Records at ``exempt_level`` or
+    above are never dropped.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 20, sample_every: int = 100,
+                 exempt_level: int = logging.CRITICAL, max_keys: int = 10000,
+                 clock: Callable[[], float] = time.monotonic):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.sample_every = sample_every
+        self.exempt_level = exempt_level
+        self.max_keys = max_keys
+        self.clock = clock
+        # Message type -> [tokens, last refill, dropped since last pass]
+        self._buckets: Dict[Tuple[str, Any], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.exempt_level or self.rate <= 0:
+            return True
+
+        key = (record.name, record.msg)
+        now = self.clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    # Messages formatted before logging make every record a new type
+                    self._buckets.clear()
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+            else:
+                bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                dropped = bucket[2]
+            else:
+                bucket[2] += 1
+                if self.sample_every <= 0 or bucket[2] % self.sample_every:
+                    return False
+                # This record is the sample, the ones before it were dropped
+                dropped = bucket[2] - 1
+            bucket[2] = 0
+
+        if dropped:
+            record.suppressed = dropped
+        return True
+
+
+class _EnqueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves all formatting to the listener thread"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message now, since its arguments may change after the
+        # call returns; tracebacks are formatted later, on the listener thread
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def setup_logging(level: Optional[str] = None, json_format: Optional[bool] = None,
+                  rate_filter: Optional[RateLimitFilter] = None, stream=None) -> logging.handlers.QueueListener:
+    """
+    Send the root logger through a queue to a background writer thread.
+
+    Replaces any root handlers already installed (e.g. inherited across
+    fork). Safe to call again; the previous listener is stopped first.
+    """
+    global _listener
+    shutdown_logging()
+
+    level = (level or os.getenv("LOG_LEVEL", "info")).upper()
+    if json_format is None:
+        json_format = os.getenv("LOG_FORMAT", "json").lower() == "json"
+    if rate_filter is None:
+        rate_filter = RateLimitFilter(
+            rate=float(os.getenv("LOG_RATE_LIMIT_PER_SECOND", "10")),
+            burst=int(os.getenv("LOG_RATE_LIMIT_BURST", "20")),
+            sample_every=int(os.getenv("LOG_SAMPLE_EVERY", "100"))
+        )
+
+    writer = logging.StreamHandler(stream or sys.stdout)
+    if json_format:
+        writer.setFormatter(JSONFormatter())
+    else:
+        writer.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = _EnqueueHandler(records)
+    handler.addFilter(rate_filter)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(records, writer)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Stop the writer thread after it has written everything already queued"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
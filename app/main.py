@@ -1,17 +1,48 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from .auth.routes import router as auth_router
+from fastapi.responses import JSONResponse, PlainTextResponse
+from .auth.routes import router as auth_router, well_known_router
+from .auth.firebase_auth import firebase_auth
 from .example_protected_routes import router as protected_router
+from .webhooks import router as webhooks_router, webhook_queue
+from .metrics import registry, MetricsMiddleware, unhandled_exceptions
+from .startup import log_report
+from .log import setup_logging, shutdown_logging
+from .responses import FastJSONResponse, StaticJSONResponse
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Log through a queue so request handlers never block on stdout
+    setup_logging()
+    # Warm the ID token signing keys (and the Admin SDK when
+    # FIREBASE_EAGER_INIT is set) before accepting traffic
+    await firebase_auth.start()
+    webhook_queue.start()
+    log_report()
+    yield
+    await webhook_queue.stop()
+    await firebase_auth.stop()
+    shutdown_logging()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Authentication API",
     description="A FastAPI application with Firebase authentication",
-    version="1.0.0"
+    version="1.1.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
+# Record per-route latency for /metrics
+app.add_middleware(MetricsMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -23,22 +54,81 @@ app.add_middleware(
 
 # Include authentication routes
 app.include_router(auth_router)
+app.include_router(well_known_router)
 
 # Include protected routes (examples)
 app.include_router(protected_router)
 
+# GitHub webhook deliveries
+app.include_router(webhooks_router)
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
+    unhandled_exceptions.labels(type(exc).__name__).inc()
+    logger.exception("Unhandled exception on %s %s", request.method, request.url.path, exc_info=exc)
     return JSONResponse(
         status_code=500,
         content={"detail": "Internal server error"}
     )
 
+HEALTHY = StaticJSONResponse.template({"status": "healthy", "message": "Authentication API is running"})
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "message": "Authentication API is running"}
+    return HEALTHY()
+
+# Gauges sampled at scrape time
+registry.gauge(
+    "cache_hit_ratio", "Hit ratio of in-process caches",
+    lambda: {
+        "token": firebase_auth.token_cache.stats()["hit_ratio"],
+        "user_profile": firebase_auth.profile_cache.stats()["hit_ratio"]
+    },
+    ("cache",)
+)
+registry.gauge(
+    "cache_entries", "Entries held by in-process caches",
+    lambda: {
+        "token": len(firebase_auth.token_cache),
+        "rejected_token": len(firebase_auth.rejected_tokens),
+        "user_profile": len(firebase_auth.profile_cache)
+    },
+    ("cache",)
+)
+
+
+def _user_directory_sync_age():
+    # No sample until the directory is enabled and has synced once
+    if firebase_auth.user_directory is None or not firebase_auth.user_directory.synced_at:
+        return {}
+    return firebase_auth.user_directory.stats()["sync_age_seconds"]
+
+
+registry.gauge(
+    "user_directory_sync_age_seconds", "Seconds since the local user directory last synced",
+    _user_directory_sync_age
+)
+registry.gauge(
+    "firebase_executor_pending", "Firebase calls running or queued on the executor",
+    lambda: firebase_auth.executor.pending
+)
+registry.gauge(
+    "firebase_executor_queue_depth", "Firebase calls waiting for a free executor thread",
+    lambda: firebase_auth.executor.queue_depth
+)
+
+registry.gauge(
+    "webhook_queue_depth", "GitHub webhook events waiting for a worker",
+    lambda: webhook_queue.depth
+)
+
+
+# Prometheus metrics endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
 
 # Root endpoint
 @app.get("/")
@@ -49,6 +139,7 @@ async def root():
         "redoc": "/redoc",
         "endpoints": {
             "auth": "/auth",
-            "protected": "/protected"
+            "protected": "/protected",
+            "webhooks": "/webhooks"
         }
     } 
\ No newline at end of file
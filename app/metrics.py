@@ -0,0 +1,305 @@
+"""
+Minimal in-process Prometheus metrics.
+
+Counters and histograms keep one value array per thread, so recording is
+a plain list update with no locks; the arrays are only summed when
+``/metrics`` is scraped. Each worker process exposes its own metrics.
+"""
+
+import bisect
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _ShardedValues:
+    """A fixed-size array of numbers with one private copy per thread"""
+
+    __slots__ = ("size", "_local", "_shards")
+
+    def __init__(self, size: int):
+        self.size = size
+        self._local = threading.local()
+        self._shards: List[List[float]] = []
+
+    def shard(self) -> List[float]:
+        try:
+            return self._local.values
+        except AttributeError:
+            values = [0] * self.size
+            self._local.values = values
+            # list.append is atomic, so registering a new thread needs no lock
+            self._shards.append(values)
+            return values
+
+    def totals(self) -> List[float]:
+        totals = [0] * self.size
+        for values in list(self._shards):
+            for index, value in enumerate(values):
+                totals[index] += value
+        return totals
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def labels(self, *values: str) -> Any:
+        """Return the child for a label combination, creating it on first use"""
+        child = self._children.get(values)
+        if child is None:
+            child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    def _render_child(self, values: Tuple[str, ...], child: Any) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    type_name = "counter"
+
+    class Child:
+        __slots__ = ("_values",)
+
+        def __init__(self):
+            self._values = _ShardedValues(1)
+
+        def inc(self, amount: float = 1) -> None:
+            self._values.shard()[0] += amount
+
+        @property
+        def value(self) -> float:
+            return self._values.totals()[0]
+
+    def _new_child(self) -> "Counter.Child":
+        return Counter.Child()
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def _render_child(self, values, child) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets"""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    class Child:
+        __slots__ = ("_buckets", "_values")
+
+        def __init__(self, buckets: Tuple[float, ...]):
+            self._buckets = buckets
+            # One slot per bucket, one for +Inf, then the running sum
+            self._values = _ShardedValues(len(buckets) + 2)
+
+        def observe(self, value: float) -> None:
+            values = self._values.shard()
+            values[bisect.bisect_left(self._buckets, value)] += 1
+            values[-1] += value
+
+        def time(self) -> "_Timer":
+            """Context manager that observes the elapsed wall time"""
+            return _Timer(self)
+
+    def _new_child(self) -> "Histogram.Child":
+        return Histogram.Child(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _render_child(self, values, child) -> List[str]:
+        totals = child._values.totals()
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), totals[:-1]):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        lines.append(f"{self.name}_sum{labels} {_format_value(totals[-1])}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Point-in-time values read from a callback at scrape time"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], Any],
+                 labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        samples = self.callback()
+        if not isinstance(samples, dict):
+            samples = {(): samples}
+        for values, value in sorted(samples.items()):
+            if not isinstance(values, tuple):
+                values = (values,)
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("_child", "_start")
+
+    def __init__(self, child: Histogram.Child):
+        self._child = child
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._child.observe(time.perf_counter() - self._start)
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together in Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name: str, documentation: str, callback: Callable[[], Any],
+              labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, callback, labelnames))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status")
+)
+auth_stage_duration = registry.histogram(
+    "auth_stage_duration_seconds", "Latency of authentication stages", ("stage",)
+)
+firebase_call_duration = registry.histogram(
+    "firebase_call_duration_seconds", "Latency of Firebase Admin SDK calls", ("call",)
+)
+firebase_call_errors = registry.counter(
+    "firebase_call_errors_total", "Failed Firebase Admin SDK calls", ("call", "error")
+)
+throttled_requests = registry.counter(
+    "throttled_requests_total", "Login and signup attempts rejected by the throttle", ("scope",)
+)
+webhook_deliveries = registry.counter(
+    "webhook_deliveries_total", "GitHub webhook deliveries by outcome", ("outcome",)
+)
+unhandled_exceptions = registry.counter(
+    "unhandled_exceptions_total", "Exceptions that reached the global exception handler", ("type",)
+)
+
+
+def timed(stage: str) -> Callable:
+    """Decorator recording the duration of an async function as an auth stage"""
+    child = auth_stage_duration.labels(stage)
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route request latency"""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the scope; label by its
+            # template so /users/1 and /users/2 share a series
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            http_request_duration.labels(scope["method"], path, str(status_code)).observe(
+                time.perf_counter() - start
+            )
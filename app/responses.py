@@ -0,0 +1,61 @@
+"""
+Fast JSON responses.
+
+FastAPI validates a route's return value against ``response_model`` and
+then runs it through ``jsonable_encoder`` before the stdlib encoder
+renders it. Routes on the hot path return these responses instead, which
+FastAPI sends as-is: models are serialized once by pydantic-core and
+plain dicts are encoded with orjson when it is installed.
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+from starlette.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Encode JSON-compatible content to compact UTF-8 bytes"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ModelResponse(Response):
+    """Response for an already-validated model, serialized by pydantic-core"""
+
+    media_type = "application/json"
+
+    def __init__(self, model: BaseModel, status_code: int = 200, headers: Optional[Dict[str, str]] = None,
+                 background: Optional[BackgroundTask] = None):
+        super().__init__(model.model_dump_json().encode("utf-8"), status_code, headers, background=background)
+
+
+class StaticJSONResponse(Response):
+    """
+    Response for a body that never changes, encoded once up front.
+
+        HEALTHY = StaticJSONResponse.template({"status": "healthy"})
+        return HEALTHY()
+    """
+
+    media_type = "application/json"
+
+    @classmethod
+    def template(cls, content: Any, status_code: int = 200):
+        body = dumps(content)
+        return lambda: cls(body, status_code)
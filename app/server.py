@@ -0,0 +1,190 @@
+"""
+Production server: a pre-forking supervisor running one uvicorn server per worker.
+
+The app is imported once in the supervisor before forking, so workers
+start with the code (and parsed Firebase credentials) already loaded.
+Each worker binds its own SO_REUSEPORT listener and the kernel balances
+connections across them; where SO_REUSEPORT is unavailable one socket is
+bound before forking and shared. SIGTERM or SIGINT stops accepting new
+connections and lets in-flight requests drain for up to
+``SERVER_GRACEFUL_TIMEOUT`` seconds. Workers exit after
+``SERVER_MAX_REQUESTS`` requests (plus jitter) and are replaced.
+"""
+
+import logging
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from typing import Dict, Optional
+
+import uvicorn
+from uvicorn.importer import import_from_string
+
+logger = logging.getLogger(__name__)
+
+
+class ServerConfig:
+    """Production server settings read from the environment"""
+
+    def __init__(self):
+        self.host = os.getenv("HOST", "0.0.0.0")
+        self.port = int(os.getenv("PORT", "8000"))
+        self.log_level = os.getenv("LOG_LEVEL", "info").lower()
+        self.workers = int(os.getenv("SERVER_WORKERS", "0")) or os.cpu_count() or 1
+        self.loop = os.getenv("SERVER_LOOP", "uvloop")
+        self.http = os.getenv("SERVER_HTTP", "httptools")
+        self.max_requests = int(os.getenv("SERVER_MAX_REQUESTS", "0"))
+        self.max_requests_jitter = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", "0"))
+        self.graceful_timeout = float(os.getenv("SERVER_GRACEFUL_TIMEOUT", "30"))
+        self.backlog = int(os.getenv("SERVER_BACKLOG", "2048"))
+        self.reuse_port = hasattr(socket, "SO_REUSEPORT")
+
+
+def bind_socket(config: ServerConfig) -> socket.socket:
+    """Create a listening socket, with SO_REUSEPORT when supported"""
+    family = socket.AF_INET6 if ":" in config.host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if config.reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((config.host, config.port))
+    sock.listen(config.backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Supervisor:
+    """Forks, monitors and replaces worker processes"""
+
+    def __init__(self, config: ServerConfig, app_path: str = "app.main:app"):
+        self.config = config
+        self.app_path = app_path
+        self.workers: Dict[int, int] = {}
+        self.shared_socket: Optional[socket.socket] = None
+        self.stopping = False
+
+    def preload(self):
+        """Import the app and parse Firebase credentials once, before forking"""
+        app = import_from_string(self.app_path)
+        try:
+            from .auth.firebase_auth import load_credentials
+            load_credentials()
+        except Exception as e:
+            # Workers retry on first use and report the error there
+            logger.warning("Could not preload Firebase credentials: %s", e)
+        return app
+
+    def check_signing_keys(self, key_ring) -> None:
+        """Refuse to fork several workers that would each rotate private, in-memory keys"""
+        if self.config.workers > 1 and key_ring.asymmetric and not key_ring.keys_dir:
+            raise RuntimeError(
+                f"JWT_KEYS_DIR must name a shared directory to run {self.config.workers} workers "
+                f"with {key_ring.algorithm} signing keys; otherwise each worker rotates its own keys "
+                "and rejects tokens signed by the others"
+            )
+
+    def run(self) -> int:
+        app = self.preload()
+        from .auth.firebase_auth import firebase_auth
+        self.check_signing_keys(firebase_auth.key_ring)
+        if not self.config.reuse_port:
+            self.shared_socket = bind_socket(self.config)
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+
+        for index in range(self.config.workers):
+            self._spawn(app, index)
+        logger.info(
+            "Serving on %s:%d with %d workers (loop=%s, http=%s)",
+            self.config.host, self.config.port, self.config.workers, self.config.loop, self.config.http
+        )
+
+        while self.workers:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            index = self.workers.pop(pid, None)
+            if index is not None and not self.stopping:
+                # Recycled after max requests or crashed; keep the pool full
+                if os.waitstatus_to_exitcode(status) != 0:
+                    logger.warning("Worker %d exited with status %d", pid, os.waitstatus_to_exitcode(status))
+                    time.sleep(0.5)
+                self._spawn(app, index)
+        return 0
+
+    def _spawn(self, app, index: int) -> None:
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = index
+            return
+
+        # Worker: restore default signal handling for uvicorn to install its own
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        exit_code = 0
+        try:
+            self._serve(app)
+        except BaseException:
+            logger.exception("Worker %d failed", os.getpid())
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _serve(self, app) -> None:
+        config = self.config
+        sock = self.shared_socket or bind_socket(config)
+        limit = None
+        if config.max_requests:
+            limit = config.max_requests + random.randint(0, config.max_requests_jitter)
+        server = uvicorn.Server(uvicorn.Config(
+            app,
+            loop=config.loop,
+            http=config.http,
+            log_level=config.log_level,
+            limit_max_requests=limit,
+            timeout_graceful_shutdown=config.graceful_timeout,
+            backlog=config.backlog
+        ))
+        server.run(sockets=[sock])
+
+    def _handle_stop(self, signum, frame) -> None:
+        if self.stopping:
+            return
+        self.stopping = True
+        logger.info("Stopping %d workers", len(self.workers))
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        # Workers still running after the drain period are killed
+        signal.signal(signal.SIGALRM, self._handle_kill)
+        signal.setitimer(signal.ITIMER_REAL, self.config.graceful_timeout + 5)
+
+    def _handle_kill(self, signum, frame) -> None:
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+
+def main() -> None:
+    config = ServerConfig()
+    logging.basicConfig(level=config.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    try:
+        sys.exit(Supervisor(config).run())
+    except RuntimeError as e:
+        logger.error("%s", e)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Startup timing.
+
+``phase`` records how long each startup step takes in this process; the
+lifespan hook logs the collected phases once the app is ready. Running
+``python -m app.startup`` additionally imports the app in a fresh
+interpreter with ``-X importtime`` and breaks import time down by module:
+
+    python -m app.startup --top 15
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Phase name -> seconds, in the order the phases ran
+timings: Dict[str, float] = {}
+
+
+@contextlib.contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Record the wall time of a startup step under ``name``"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+
+def log_report() -> None:
+    """Log the recorded startup phases"""
+    if timings:
+        logger.info(
+            "Startup phases: %s",
+            ", ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in timings.items())
+        )
+
+
+def import_times(module: str = "app.main") -> List[Tuple[str, float, float]]:
+    """
+    Import ``module`` in a fresh interpreter with ``-X importtime``.
+
+    Returns ``(module, self_seconds, cumulative_seconds)`` for every module
+    imported, in import order.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=os.environ.copy()
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    return rows
+
+
+def by_package(rows: List[Tuple[str, float, float]]) -> Dict[str, float]:
+    """Sum self import time by top-level package"""
+    totals: Dict[str, float] = defaultdict(float)
+    for name, self_seconds, _ in rows:
+        totals[name.split(".")[0]] += self_seconds
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Report import and initialization time of the app")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=10, help="number of modules and packages to show")
+    parser.add_argument("--init", action="store_true", help="also time Firebase Admin SDK initialization")
+    args = parser.parse_args(argv)
+
+    rows = import_times(args.module)
+    total = sum(self_seconds for _, self_seconds, _ in rows)
+    print(f"Import of {args.module}: {total * 1000:.1f}ms across {len(rows)} modules\n")
+
+    print("Slowest packages (self time):")
+    for name, seconds in list(by_package(rows).items())[:args.top]:
+        print(f"  {seconds * 1000:9.1f}ms  {name}")
+
+    print("\nSlowest modules (cumulative time):")
+    for name, _, cumulative in sorted(rows, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"  {cumulative * 1000:9.1f}ms  {name}")
+
+    if args.init:
+        from .auth.firebase_auth import firebase_auth
+        firebase_auth._initialize_firebase()
+        print("\nInitialization:")
+        for name, seconds in timings.items():
+            print(f"  {seconds * 1000:9.1f}ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
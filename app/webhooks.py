@@ -0,0 +1,214 @@
+"""
+GitHub webhook receiver.
+
+Deliveries are authenticated with the ``X-Hub-Signature-256`` HMAC,
+deduplicated by ``X-GitHub-Delivery`` and put on a bounded asyncio queue;
+the route answers 202 straight away and a pool of worker tasks started
+in the app lifespan summarizes and logs each event with the same
+handlers ``main.py`` uses. This replaces starting a runner and a Python
+interpreter per event with a few milliseconds in a process that is
+already warm.
+"""
+
+import asyncio
+import functools
+import hashlib
+import hmac
+import io
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from fastapi import APIRouter, HTTPException, Request, status
+
+from .github_events import CHUNK_SIZE, DEFAULT_FIELDS, handle_event, parse_fields, summarize
+from .metrics import webhook_deliveries
+from .responses import StaticJSONResponse
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/webhooks", tags=["webhooks"])
+
+# Shared secret set on the GitHub webhook; deliveries are refused without it
+GITHUB_WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET", "")
+
+ACCEPTED = StaticJSONResponse.template({"status": "accepted"}, status_code=202)
+DUPLICATE = StaticJSONResponse.template({"status": "duplicate"}, status_code=202)
+
+
+class WebhookEvent(NamedTuple):
+    delivery_id: str
+    event_name: str
+    body: bytes
+
+
+def verify_signature(secret: bytes, body: bytes, signature: Optional[str]) -> bool:
+    """Check an ``X-Hub-Signature-256`` header (``sha256=<hex>``) against the body"""
+    if not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret, body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+
+class DeliverySet:
+    """
+    LRU set of recently seen delivery IDs.
+
+    GitHub redelivers with the same ``X-GitHub-Delivery``, so anything
+    seen within ``ttl`` seconds is acknowledged without being queued
+    again. Each worker process keeps its own set.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 3600.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+
+    def add(self, delivery_id: str) -> bool:
+        """Record a delivery; False if it was already seen within the TTL"""
+        now = time.time()
+        expires_at = self._entries.get(delivery_id)
+        if expires_at is not None and expires_at > now:
+            return False
+        self._entries[delivery_id] = now + self.ttl
+        self._entries.move_to_end(delivery_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return True
+
+    def discard(self, delivery_id: str) -> None:
+        self._entries.pop(delivery_id, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class WebhookQueue:
+    """Bounded queue of accepted deliveries drained by a fixed pool of worker tasks"""
+
+    def __init__(self, handler: Callable[[WebhookEvent], Any], workers: int = 4, max_size: int = 1000,
+                 deliveries: Optional[DeliverySet] = None):
+        self.handler = handler
+        self.workers = workers
+        self.max_size = max_size
+        self.deliveries = deliveries or DeliverySet()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        # Created here so the queue binds to the running event loop
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Let queued events finish for up to ``timeout`` seconds, then cancel the workers"""
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Dropping %d queued webhook events on shutdown", self._queue.qsize())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def submit(self, event: WebhookEvent) -> str:
+        """Queue an event; returns "accepted", "duplicate" or "queue_full" """
+        if self._queue is None:
+            return "queue_full"
+        if not self.deliveries.add(event.delivery_id):
+            return "duplicate"
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Forget the ID so GitHub's redelivery is not mistaken for a duplicate
+            self.deliveries.discard(event.delivery_id)
+            return "queue_full"
+        return "accepted"
+
+    async def _worker(self) -> None:
+        while True:
+            event = await self._queue.get()
+            try:
+                await self.handler(event)
+                webhook_deliveries.labels("handled").inc()
+            except Exception:
+                webhook_deliveries.labels("failed").inc()
+                logger.exception("Webhook handler failed for delivery %s", event.delivery_id)
+            finally:
+                self._queue.task_done()
+
+
+def _summarize_body(body: bytes, fields: Dict[str, str]) -> Dict[str, Any]:
+    return summarize(io.StringIO(body.decode("utf-8")), fields)
+
+
+async def log_event(event: WebhookEvent, fields: Dict[str, str] = DEFAULT_FIELDS) -> None:
+    """Summarize and log a delivery with the main.py handler"""
+    if len(event.body) > CHUNK_SIZE:
+        # Large pull_request payloads are parsed off the event loop
+        summary = await asyncio.to_thread(_summarize_body, event.body, fields)
+    else:
+        summary = _summarize_body(event.body, fields)
+    logger.info("Received GitHub event: %s (delivery %s)", event.event_name, event.delivery_id)
+    handle_event(event.event_name, summary, emit=logger.info)
+
+
+# Started and stopped by the app lifespan
+webhook_queue = WebhookQueue(
+    functools.partial(log_event, fields=parse_fields(os.getenv("EVENT_LOG_FIELDS"))),
+    workers=int(os.getenv("WEBHOOK_WORKERS", "4")),
+    max_size=int(os.getenv("WEBHOOK_QUEUE_MAX_SIZE", "1000")),
+    deliveries=DeliverySet(
+        max_size=int(os.getenv("WEBHOOK_DEDUP_MAX_SIZE", "10000")),
+        ttl=float(os.getenv("WEBHOOK_DEDUP_TTL_SECONDS", "3600"))
+    )
+)
+
+
+@router.post("/github", status_code=status.HTTP_202_ACCEPTED)
+async def github_webhook(request: Request):
+    """
+    Receive a GitHub webhook delivery and queue it for processing
+    """
+    if not GITHUB_WEBHOOK_SECRET:
+        # Fail closed: never accept unauthenticated deliveries
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Webhook secret is not configured"
+        )
+
+    body = await request.body()
+    signature = request.headers.get("x-hub-signature-256")
+    if not verify_signature(GITHUB_WEBHOOK_SECRET.encode("utf-8"), body, signature):
+        webhook_deliveries.labels("invalid_signature").inc()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid webhook signature"
+        )
+
+    delivery_id = request.headers.get("x-github-delivery")
+    event_name = request.headers.get("x-github-event")
+    if not delivery_id or not event_name:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Missing X-GitHub-Delivery or X-GitHub-Event header"
+        )
+
+    outcome = webhook_queue.submit(WebhookEvent(delivery_id, event_name, body))
+    webhook_deliveries.labels(outcome).inc()
+    if outcome == "queue_full":
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Webhook queue is full, try again later",
+            headers={"Retry-After": "5"}
+        )
+    return DUPLICATE() if outcome == "duplicate" else ACCEPTED()
@@ -0,0 +1,95 @@
+"""
+Micro-benchmark of response serialization.
+
+Compares FastAPI's default handling of a route's return value (validate
+against response_model, encode, render with the stdlib encoder) with the
+fast responses in app.responses, for the bodies the auth routes send.
+
+Usage:
+    python -m benchmarks.bench_serialization --number 20000
+"""
+
+import argparse
+import json
+import timeit
+from typing import Any, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.auth.models import AuthResponse, UserResponse
+from app.responses import FastJSONResponse, ModelResponse, StaticJSONResponse, orjson
+
+AUTH_RESPONSE = AuthResponse(
+    access_token="a" * 600,
+    refresh_token="r" * 400,
+    user=UserResponse(
+        id="uid-123456789012345678901234",
+        email="alice@example.com",
+        first_name="Alice",
+        last_name="Smith",
+        is_active=True,
+        created_at="1700000000000"
+    )
+)
+VERIFY_BODY = {
+    "valid": True,
+    "user": {"id": "uid-123456789012345678901234", "email": "alice@example.com", "role": "user"}
+}
+HEALTH_BODY = {"status": "healthy", "message": "Authentication API is running"}
+HEALTHY = StaticJSONResponse.template(HEALTH_BODY)
+
+
+def default_model_response() -> Callable[[], JSONResponse]:
+    """What FastAPI does for a route with response_model=AuthResponse"""
+    field = create_model_field("Response_login", AuthResponse, mode="serialization")
+
+    def run() -> JSONResponse:
+        # serialize_response never suspends for async routes, so drive the
+        # coroutine directly rather than paying for an event loop round trip
+        try:
+            serialize_response(field=field, response_content=AUTH_RESPONSE).send(None)
+        except StopIteration as done:
+            return JSONResponse(done.value)
+    return run
+
+
+def cases() -> Dict[str, Dict[str, Callable[[], Any]]]:
+    return {
+        "auth_response": {
+            "default": default_model_response(),
+            "fast": lambda: ModelResponse(AUTH_RESPONSE),
+        },
+        "verify_dict": {
+            "default": lambda: JSONResponse(jsonable_encoder(VERIFY_BODY)),
+            "fast": lambda: FastJSONResponse(VERIFY_BODY),
+        },
+        "health": {
+            "default": lambda: JSONResponse(jsonable_encoder(HEALTH_BODY)),
+            "fast": HEALTHY,
+        },
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Response serialization micro-benchmark")
+    parser.add_argument("--number", type=int, default=20000, help="responses per measurement")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    report: Dict[str, Any] = {"encoder": "orjson" if orjson is not None else "json", "results": {}}
+    for name, variants in cases().items():
+        timings = {}
+        for variant, func in variants.items():
+            best = min(timeit.repeat(func, number=args.number, repeat=args.repeat))
+            timings[f"{variant}_us"] = round(best / args.number * 1e6, 3)
+        timings["speedup"] = round(timings["default_us"] / timings["fast_us"], 2)
+        report["results"][name] = timings
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
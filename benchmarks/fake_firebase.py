@@ -0,0 +1,180 @@
+"""
+In-process stand-in for ``firebase_admin.auth`` used by the benchmarks.
+
+Every remote call sleeps for a configurable latency (on the executor
+thread, like a real network round trip) so throughput numbers reflect how
+the service overlaps and avoids Firebase calls. ID tokens are RS256 JWTs
+signed with a local key whose certificate is written to a key-set file,
+so the local verifier can be used without network access. Password
+sign-in is served by an httpx transport standing in for the Identity
+Toolkit REST API.
+"""
+
+import asyncio
+import datetime
+import json
+import secrets
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import httpx
+import jwt
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from firebase_admin import auth as firebase_auth_module
+
+
+class UserNotFoundError(Exception):
+    pass
+
+
+class FakeFirebaseAuth:
+    """Fake of the firebase_admin.auth functions FirebaseAuthService calls"""
+
+    # Real helper classes so import records are built exactly as in production
+    ImportUserRecord = firebase_auth_module.ImportUserRecord
+    UserImportHash = firebase_auth_module.UserImportHash
+
+    def __init__(self, project_id: str = "benchmark-project", latency: float = 0.02):
+        self.project_id = project_id
+        self.latency = latency
+        self.kid = "benchmark-key"
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._users: Dict[str, SimpleNamespace] = {}
+        self._uids_by_email: Dict[str, str] = {}
+        self._private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+    def _remote_call(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def write_key_set(self, path: str) -> None:
+        """Write the kid -> certificate file the local verifier loads"""
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "benchmark")])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        cert = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(self._private_key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(minutes=5))
+            .not_valid_after(now + datetime.timedelta(days=1))
+            .sign(self._private_key, hashes.SHA256())
+        )
+        with open(path, "w") as file:
+            json.dump({self.kid: cert.public_bytes(serialization.Encoding.PEM).decode("utf-8")}, file)
+
+    def add_user(self, email: str, password: str = "password", role: str = "user",
+                 first_name: str = "Bench", last_name: str = "User",
+                 uid: Optional[str] = None) -> SimpleNamespace:
+        """Create a user directly, without simulated latency"""
+        uid = uid or secrets.token_urlsafe(21)
+        user = SimpleNamespace(
+            uid=uid,
+            email=email,
+            password=password,
+            display_name=f"{first_name} {last_name}",
+            disabled=False,
+            custom_claims={"first_name": first_name, "last_name": last_name, "role": role},
+            tokens_valid_after_timestamp=None,
+            user_metadata=SimpleNamespace(creation_timestamp=int(time.time() * 1000))
+        )
+        with self._lock:
+            self._users[uid] = user
+            self._uids_by_email[email.lower()] = uid
+        return user
+
+    def issue_id_token(self, user: SimpleNamespace, lifetime: int = 3600) -> str:
+        """Mint a Firebase-style ID token for a user"""
+        now = int(time.time())
+        claims = {
+            "iss": f"https://securetoken.google.com/{self.project_id}",
+            "aud": self.project_id,
+            "sub": user.uid,
+            "auth_time": now,
+            "iat": now,
+            "exp": now + lifetime,
+            "email": user.email,
+        }
+        claims.update(user.custom_claims or {})
+        return jwt.encode(claims, self._private_key, algorithm="RS256", headers={"kid": self.kid})
+
+    def identity_toolkit_transport(self) -> httpx.MockTransport:
+        """Transport answering accounts:signInWithPassword against the fake's users"""
+        async def handler(request: httpx.Request) -> httpx.Response:
+            with self._lock:
+                self.calls["signInWithPassword"] = self.calls.get("signInWithPassword", 0) + 1
+            if self.latency:
+                await asyncio.sleep(self.latency)
+
+            body = json.loads(request.content)
+            uid = self._uids_by_email.get(body.get("email", "").lower())
+            user = self._users.get(uid) if uid else None
+            if user is None or user.password != body.get("password"):
+                return httpx.Response(400, json={"error": {"code": 400, "message": "INVALID_LOGIN_CREDENTIALS"}})
+            if user.disabled:
+                return httpx.Response(400, json={"error": {"code": 400, "message": "USER_DISABLED"}})
+            return httpx.Response(200, json={
+                "localId": user.uid,
+                "email": user.email,
+                "idToken": self.issue_id_token(user),
+                "registered": True
+            })
+        return httpx.MockTransport(handler)
+
+    # firebase_admin.auth API
+
+    def verify_id_token(self, id_token: str, check_revoked: bool = False) -> Dict[str, Any]:
+        self._remote_call("verify_id_token")
+        claims = jwt.decode(
+            id_token, self._private_key.public_key(), algorithms=["RS256"], audience=self.project_id
+        )
+        claims["uid"] = claims["sub"]
+        return claims
+
+    def get_user(self, uid: str) -> SimpleNamespace:
+        self._remote_call("get_user")
+        user = self._users.get(uid)
+        if user is None:
+            raise UserNotFoundError(f"No user record found for uid: {uid}")
+        return user
+
+    def get_user_by_email(self, email: str) -> SimpleNamespace:
+        self._remote_call("get_user_by_email")
+        uid = self._uids_by_email.get(email.lower())
+        if uid is None:
+            raise UserNotFoundError(f"No user record found for email: {email}")
+        return self._users[uid]
+
+    def create_user(self, email: str, password: str, display_name: Optional[str] = None,
+                    email_verified: bool = False) -> SimpleNamespace:
+        self._remote_call("create_user")
+        if email.lower() in self._uids_by_email:
+            raise ValueError("EMAIL_EXISTS")
+        first_name, _, last_name = (display_name or "").partition(" ")
+        user = self.add_user(email, password, first_name=first_name, last_name=last_name)
+        user.custom_claims = None
+        return user
+
+    def set_custom_user_claims(self, uid: str, custom_claims: Dict[str, Any]) -> None:
+        self._remote_call("set_custom_user_claims")
+        self._users[uid].custom_claims = dict(custom_claims)
+
+    def import_users(self, users: List[Any], hash_alg: Any = None) -> SimpleNamespace:
+        self._remote_call("import_users")
+        errors = []
+        for index, record in enumerate(users):
+            if record.email.lower() in self._uids_by_email:
+                errors.append(SimpleNamespace(index=index, reason="EMAIL_EXISTS"))
+                continue
+            user = self.add_user(record.email, uid=record.uid)
+            user.custom_claims = record.custom_claims
+        return SimpleNamespace(success_count=len(users) - len(errors), failure_count=len(errors), errors=errors)
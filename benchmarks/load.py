@@ -0,0 +1,233 @@
+"""
+Load benchmark for the authentication API.
+
+Boots ``app.main:app`` in-process against FakeFirebaseAuth (no network,
+no Firebase project) and drives the hot endpoints at fixed concurrency
+levels, reporting requests per second and latency percentiles as JSON.
+
+Usage:
+    python -m benchmarks.load
+    python -m benchmarks.load --concurrency 1 10 50 --duration 5 --latency 0.02
+    python -m benchmarks.load --save-baseline benchmarks/baseline.json
+    python -m benchmarks.load --baseline benchmarks/baseline.json --tolerance 0.2
+
+With --baseline the exit status is 1 if any scenario lost more than
+``tolerance`` of its throughput or grew its p99 latency by more than
+``tolerance`` compared to the stored run.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from .fake_firebase import FakeFirebaseAuth
+
+SCENARIOS = ("verify", "protected", "login", "refresh", "signup")
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def configure_environment(workdir: str, fake: FakeFirebaseAuth) -> None:
+    """Point the app at local stand-ins; must run before app.main is imported"""
+    certs_path = os.path.join(workdir, "certs.json")
+    fake.write_key_set(certs_path)
+    os.environ.update({
+        "FIREBASE_PROJECT_ID": fake.project_id,
+        "FIREBASE_SIGNING_CERTS_URL": certs_path,
+        "LOCAL_TOKEN_VERIFICATION": "true",
+        "REVOCATION_DB_PATH": os.path.join(workdir, "revocations.db"),
+        "JWT_KEYS_DIR": os.path.join(workdir, "keys"),
+        # Every simulated client logs in from one address as one account
+        "THROTTLE_ENABLED": "false",
+    })
+
+
+async def run_level(request: Callable[[int], Awaitable[bool]], concurrency: int, duration: float) -> Dict[str, Any]:
+    """Run ``concurrency`` clients in closed loop for ``duration`` seconds"""
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def client(client_id: int) -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            ok = await request(client_id)
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(client_id) for client_id in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    fake = FakeFirebaseAuth(latency=args.latency)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        configure_environment(workdir, fake)
+
+        import httpx
+        import app.auth.firebase_auth as service_module
+        from app.auth.identity_toolkit import IdentityToolkitClient
+        from app.main import app
+
+        service_module.auth = fake
+        service_module.firebase_auth.identity_toolkit = IdentityToolkitClient(
+            "benchmark", transport=fake.identity_toolkit_transport()
+        )
+        max_clients = max(args.concurrency)
+        users = [fake.add_user(f"bench{index}@example.com") for index in range(max_clients)]
+
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+                sessions = []
+                for user in users:
+                    response = await client.post("/auth/login", json={"email": user.email, "password": user.password})
+                    response.raise_for_status()
+                    sessions.append(response.json())
+                id_tokens = [fake.issue_id_token(user) for user in users]
+
+                async def verify(client_id: int) -> bool:
+                    response = await client.get(
+                        "/auth/verify", headers={"Authorization": f"Bearer {id_tokens[client_id]}"}
+                    )
+                    return response.status_code == 200
+
+                async def protected(client_id: int) -> bool:
+                    response = await client.get(
+                        "/protected/user-info",
+                        headers={"Authorization": f"Bearer {sessions[client_id]['access_token']}"}
+                    )
+                    return response.status_code == 200
+
+                async def login(client_id: int) -> bool:
+                    user = users[client_id]
+                    response = await client.post("/auth/login", json={"email": user.email, "password": user.password})
+                    return response.status_code == 200
+
+                async def refresh(client_id: int) -> bool:
+                    # Refresh tokens are single use, so each client rotates its own
+                    response = await client.post(
+                        "/auth/refresh", json={"refresh_token": sessions[client_id]["refresh_token"]}
+                    )
+                    if response.status_code != 200:
+                        return False
+                    sessions[client_id]["refresh_token"] = response.json()["refresh_token"]
+                    return True
+
+                signups = 0
+
+                async def signup(client_id: int) -> bool:
+                    # Every signup needs a fresh address
+                    nonlocal signups
+                    signups += 1
+                    response = await client.post("/auth/signup", json={
+                        "email": f"signup{signups}@example.com",
+                        "password": "password",
+                        "first_name": "Bench",
+                        "last_name": "User"
+                    })
+                    return response.status_code == 201
+
+                requests = {
+                    "verify": verify, "protected": protected, "login": login, "refresh": refresh, "signup": signup
+                }
+                results: Dict[str, Dict[str, Any]] = {}
+                for scenario in args.scenarios:
+                    results[scenario] = {}
+                    for concurrency in args.concurrency:
+                        if args.warmup:
+                            await run_level(requests[scenario], concurrency, args.warmup)
+                        results[scenario][str(concurrency)] = await run_level(
+                            requests[scenario], concurrency, args.duration
+                        )
+
+    return {
+        "config": {
+            "duration_s": args.duration,
+            "firebase_latency_s": args.latency,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "firebase_calls": fake.calls,
+        "results": results,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> Dict[str, Any]:
+    """Compare a report with a stored baseline and list regressions"""
+    regressions = []
+    deltas: Dict[str, Dict[str, Any]] = {}
+    for scenario, levels in report["results"].items():
+        for concurrency, current in levels.items():
+            previous = baseline.get("results", {}).get(scenario, {}).get(concurrency)
+            if not previous:
+                continue
+            rps_change = current["rps"] / previous["rps"] - 1 if previous["rps"] else 0.0
+            p99_change = current["p99_ms"] / previous["p99_ms"] - 1 if previous["p99_ms"] else 0.0
+            deltas.setdefault(scenario, {})[concurrency] = {
+                "rps_change": round(rps_change, 3),
+                "p99_change": round(p99_change, 3),
+            }
+            if rps_change < -tolerance or p99_change > tolerance:
+                regressions.append(f"{scenario}@{concurrency}")
+    return {"tolerance": tolerance, "deltas": deltas, "regressions": regressions}
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load benchmark for the authentication API")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 10, 50])
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds per concurrency level")
+    parser.add_argument("--warmup", type=float, default=0.5, help="seconds of unmeasured warm-up per level")
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated Firebase latency in seconds")
+    parser.add_argument("--output", help="also write the report to this file")
+    parser.add_argument("--baseline", help="compare against this stored report")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--save-baseline", help="write the report as the new baseline")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_benchmark(args))
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            report["comparison"] = compare(report, json.load(file), args.tolerance)
+        exit_code = 1 if report["comparison"]["regressions"] else 0
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as file:
+                file.write(output + "\n")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+Shared fixtures for tests that build a FirebaseAuthService.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import app.auth.firebase_auth as service_module
+from app.auth.firebase_auth import FirebaseAuthService
+from app.auth.identity_toolkit import IdentityToolkitClient
+from benchmarks.fake_firebase import FakeFirebaseAuth
+
+
+@pytest.fixture
+def service_env(monkeypatch, tmp_path):
+    """Point every file the service may write (keys, databases, certificates) at tmp_path"""
+    monkeypatch.setenv("JWT_KEYS_DIR", str(tmp_path / "keys"))
+    monkeypatch.setenv("REVOCATION_BACKEND", "memory")
+    monkeypatch.setenv("REVOCATION_DB_PATH", str(tmp_path / "revocations.db"))
+    monkeypatch.setenv("USER_DIRECTORY_PATH", str(tmp_path / "users.db"))
+    monkeypatch.setenv("FIREBASE_SIGNING_CERTS_URL", str(tmp_path / "certs.json"))
+    monkeypatch.delenv("FIREBASE_PROJECT_ID", raising=False)
+    monkeypatch.delenv("FIREBASE_EAGER_INIT", raising=False)
+    return tmp_path
+
+
+@pytest.fixture
+def fake_firebase(monkeypatch, service_env):
+    """A FakeFirebaseAuth standing in for firebase_admin.auth, with its signing certs published"""
+    fake = FakeFirebaseAuth(latency=0)
+    fake.write_key_set(str(service_env / "certs.json"))
+    monkeypatch.setattr(service_module, "auth", fake)
+    return fake
+
+
+@pytest.fixture
+def make_service(monkeypatch, fake_firebase):
+    """Build a FirebaseAuthService against the fake; keyword arguments are set as env vars first"""
+    def make(**env):
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        service = FirebaseAuthService()
+        # Counts as an initialized Admin SDK app; only its project id is ever read
+        service._firebase_app = SimpleNamespace(project_id=fake_firebase.project_id)
+        service.identity_toolkit = IdentityToolkitClient("test", transport=fake_firebase.identity_toolkit_transport())
+        return service
+
+    return make
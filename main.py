@@ -1,7 +1,32 @@
+import argparse
 import os
 import json
+import sys
+
+from app.github_events import handle_event, parse_fields, summarize_directory, summarize_file
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Log the GitHub event that triggered a workflow run")
+    parser.add_argument("--summary", action="store_true",
+                        help="stream the event and print only the projected fields as one JSON line")
+    parser.add_argument("--fields", default=os.getenv("EVENT_LOG_FIELDS"),
+                        help="comma-separated name=path fields to project (default: PR/issue summary fields)")
+    parser.add_argument("--batch", metavar="DIR", help="summarize every .json event file in DIR as NDJSON")
+    parser.add_argument("--output", help="NDJSON output file for --batch (default: stdout)")
+    parser.add_argument("--workers", type=int, default=0, help="processes for --batch (0 means one per CPU core)")
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        fields = parse_fields(args.fields)
+        output = open(args.output, "w") if args.output else sys.stdout
+        try:
+            files, errors = summarize_directory(args.batch, output, fields, workers=args.workers or None)
+        finally:
+            if args.output:
+                output.close()
+        print(f"Summarized {files} event files ({errors} errors)", file=sys.stderr)
+        return 1 if errors else 0
 
-def main():
     github_event_name = os.getenv("GITHUB_EVENT_NAME")
     github_event_path = os.getenv("GITHUB_EVENT_PATH")
 
@@ -9,15 +34,20 @@ def main():
 
     if not github_event_path:
         print("GITHUB_EVENT_PATH not set, cannot read event data.")
-        return
+        return 0
 
     try:
-        with open(github_event_path, "r") as file:
-            event_data = json.load(file)
-        print("Event JSON Payload:")
-        print(json.dumps(event_data, indent=2))
+        if args.summary:
+            summary = summarize_file(github_event_path, parse_fields(args.fields))
+            handle_event(github_event_name, summary)
+        else:
+            with open(github_event_path, "r") as file:
+                event_data = json.load(file)
+            print("Event JSON Payload:")
+            print(json.dumps(event_data, indent=2))
     except Exception as e:
         print(f"Error reading event data: {e}")
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -1,11 +1,19 @@
+import os
+import sys
+
 import uvicorn
-from app.main import app
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    ) 
\ No newline at end of file
+    # "python run.py --prod" (or ENVIRONMENT=production) starts the
+    # multi-worker server; otherwise a single auto-reloading dev server
+    if "--prod" in sys.argv[1:] or os.getenv("ENVIRONMENT", "development") == "production":
+        from app.server import main
+        main()
+    else:
+        uvicorn.run(
+            "app.main:app",
+            host=os.getenv("HOST", "0.0.0.0"),
+            port=int(os.getenv("PORT", "8000")),
+            reload=True,
+            log_level=os.getenv("LOG_LEVEL", "info").lower()
+        )
@@ -0,0 +1,121 @@
+"""
+Tests for bulk signup through Firebase's batch import API.
+"""
+
+import asyncio
+import json
+
+import httpx
+from fastapi import FastAPI
+
+import app.auth.routes as routes
+from app.auth.dependencies import get_current_user
+from app.auth.rbac import permission_engine
+
+
+def _service(make_service, batch_size=2):
+    service = make_service()
+    service.import_batch_size = batch_size
+    service.import_hash_rounds = 1
+    return service
+
+
+def _users(count):
+    return [
+        {"email": f"user{index}@example.com", "password": "secret1", "first_name": "Ada", "last_name": f"L{index}"}
+        for index in range(count)
+    ]
+
+
+def _import(service, users):
+    async def collect():
+        return [item async for item in service.import_users(users)]
+
+    return asyncio.run(collect())
+
+
+def test_import_is_chunked_by_batch_size(make_service, fake_firebase):
+    """Test that one import call is made per chunk and every user gets a result in order"""
+    service = _service(make_service, batch_size=2)
+
+    results = _import(service, _users(5))
+
+    assert fake_firebase.calls["import_users"] == 3
+    assert [item["index"] for item in results] == [0, 1, 2, 3, 4]
+    assert all(item["status"] == "created" for item in results)
+    user = fake_firebase.get_user_by_email("user4@example.com")
+    assert user.uid == results[4]["id"]
+    assert user.custom_claims == {"first_name": "Ada", "last_name": "L4", "role": "user"}
+
+
+def test_record_errors_map_to_the_batch_index(make_service, fake_firebase):
+    """Test that a per-record failure inside a later chunk is reported at its index in the whole batch"""
+    service = _service(make_service, batch_size=2)
+    fake_firebase.add_user("user3@example.com")
+
+    results = _import(service, _users(5))
+
+    failed = [item for item in results if item["status"] == "failed"]
+    assert failed == [{"index": 3, "email": "user3@example.com", "status": "failed", "error": "EMAIL_EXISTS"}]
+    assert sum(item["status"] == "created" for item in results) == 4
+
+
+def test_failed_chunk_does_not_abort_the_batch(make_service, fake_firebase, monkeypatch):
+    """Test that an import call failing outright fails only its own chunk"""
+    service = _service(make_service, batch_size=2)
+    import_users = fake_firebase.import_users
+    calls = []
+
+    def flaky_import(records, hash_alg=None):
+        calls.append(len(records))
+        if len(calls) == 2:
+            raise RuntimeError("unavailable")
+        return import_users(records, hash_alg=hash_alg)
+
+    monkeypatch.setattr(fake_firebase, "import_users", flaky_import)
+
+    results = _import(service, _users(5))
+
+    assert calls == [2, 2, 1]
+    assert [item["status"] for item in results] == ["created", "created", "failed", "failed", "created"]
+    assert results[2]["error"] == "unavailable"
+
+
+def _post_batch(monkeypatch, service, role, users):
+    monkeypatch.setattr(routes, "firebase_auth", service)
+    app = FastAPI()
+    app.include_router(routes.router)
+    app.dependency_overrides[get_current_user] = lambda: {
+        "uid": "caller", "permission_mask": permission_engine.mask_for_role(role)
+    }
+
+    async def post():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/auth/signup/batch", json={"users": users})
+
+    return asyncio.run(post())
+
+
+def test_batch_route_streams_results_and_summary(make_service, fake_firebase, monkeypatch):
+    """Test that the route streams one NDJSON line per user followed by the summary"""
+    service = _service(make_service, batch_size=2)
+    fake_firebase.add_user("user1@example.com")
+
+    response = _post_batch(monkeypatch, service, "admin", _users(3))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["status"] for line in lines[:3]] == ["created", "failed", "created"]
+    assert lines[3] == {"status": "complete", "total": 3, "succeeded": 2, "failed": 1}
+
+
+def test_batch_route_requires_import_permission(make_service, fake_firebase, monkeypatch):
+    """Test that callers without users:import are refused before anything is imported"""
+    service = _service(make_service)
+
+    response = _post_batch(monkeypatch, service, "user", _users(1))
+
+    assert response.status_code == 403
+    assert "import_users" not in fake_firebase.calls
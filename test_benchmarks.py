@@ -0,0 +1,31 @@
+"""
+Tests for the load benchmark helpers
+"""
+
+from benchmarks.load import compare, percentile
+
+
+def test_percentile():
+    """Test nearest-rank percentiles"""
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.99) == 0.0
+
+
+def test_compare_flags_regressions():
+    """Test that throughput drops and p99 growth beyond the tolerance are regressions"""
+    baseline = {"results": {
+        "verify": {"10": {"rps": 1000.0, "p99_ms": 10.0}},
+        "login": {"10": {"rps": 500.0, "p99_ms": 20.0}},
+    }}
+    report = {"results": {
+        "verify": {"10": {"rps": 950.0, "p99_ms": 11.0}},
+        "login": {"10": {"rps": 300.0, "p99_ms": 20.0}},
+        "refresh": {"10": {"rps": 100.0, "p99_ms": 5.0}},
+    }}
+
+    comparison = compare(report, baseline, tolerance=0.2)
+
+    assert comparison["regressions"] == ["login@10"]
+    assert "refresh" not in comparison["deltas"]
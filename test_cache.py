@@ -0,0 +1,123 @@
+"""
+Tests for the in-process verified-identity cache.
+"""
+
+import time
+
+from app.auth.cache import TokenCache, UserProfileCache, hash_token, RejectedTokenCache
+
+
+def test_cache_hit_and_miss_counters():
+    """Test that lookups are counted as hits and misses"""
+    cache = TokenCache(max_size=10, max_ttl=60)
+    assert cache.get("token-a") is None
+
+    cache.set("token-a", {"uid": "a"})
+    assert cache.get("token-a") == {"uid": "a"}
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_cache_expires_at_token_exp():
+    """Test that an entry never outlives the token's own exp claim"""
+    cache = TokenCache(max_size=10, max_ttl=3600)
+    cache.set("expired", {"uid": "a"}, exp=time.time() - 1)
+    assert cache.get("expired") is None
+    assert len(cache) == 0
+
+
+def test_cache_expires_at_max_ttl():
+    """Test that the max TTL caps long-lived tokens"""
+    cache = TokenCache(max_size=10, max_ttl=0)
+    cache.set("token", {"uid": "a"}, exp=time.time() + 3600)
+    assert cache.get("token") is None
+
+
+def test_cache_evicts_least_recently_used():
+    """Test that the cache stays within max_size using LRU order"""
+    cache = TokenCache(max_size=2, max_ttl=60)
+    cache.set("a", {"uid": "a"})
+    cache.set("b", {"uid": "b"})
+    cache.get("a")
+    cache.set("c", {"uid": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"uid": "a"}
+    assert cache.get("c") == {"uid": "c"}
+
+
+def test_cache_does_not_store_raw_tokens():
+    """Test that entries are keyed by a hash of the token"""
+    cache = TokenCache(max_size=10, max_ttl=60)
+    cache.set("secret-token", {"uid": "a"})
+    assert "secret-token" not in cache._entries
+    assert hash_token("secret-token") in cache._entries
+
+
+def test_invalidate_user_drops_all_of_a_users_tokens():
+    """Test that every token resolved to a uid is dropped together"""
+    cache = TokenCache(max_size=10, max_ttl=60)
+    cache.set("a-1", {"uid": "a"})
+    cache.set("profile:a-1", {"uid": "a"})
+    cache.set("b-1", {"uid": "b"})
+
+    cache.invalidate_user("a")
+
+    assert cache.get("a-1") is None and cache.get("profile:a-1") is None
+    assert cache.get("b-1") == {"uid": "b"}
+    assert cache._keys_by_uid == {"b": {hash_token("b-1")}}
+
+
+class _Record:
+    def __init__(self, uid, email):
+        self.uid = uid
+        self.email = email
+
+
+def test_profile_cache_returns_records_by_uid():
+    """Test that user records can be read back by uid"""
+    cache = UserProfileCache(max_size=10, ttl=60)
+    record = _Record("uid-1", "User@Example.com")
+    cache.set(record)
+
+    assert cache.get("uid-1") is record
+
+
+def test_profile_cache_invalidation_notifies_listeners():
+    """Test that invalidation drops the record and fires listeners"""
+    cache = UserProfileCache(max_size=10, ttl=60)
+    invalidated = []
+    cache.add_invalidation_listener(invalidated.append)
+    cache.set(_Record("uid-1", "user@example.com"))
+
+    cache.invalidate("uid-1")
+
+    assert cache.get("uid-1") is None
+    assert invalidated == ["uid-1"]
+
+
+def test_profile_cache_evicts_least_recently_set():
+    """Test that the profile cache stays within max_size"""
+    cache = UserProfileCache(max_size=1, ttl=60)
+    cache.set(_Record("uid-1", "one@example.com"))
+    cache.set(_Record("uid-2", "two@example.com"))
+
+    assert cache.get("uid-1") is None
+    assert len(cache) == 1
+
+
+def test_rejected_token_cache_expires_and_evicts():
+    """Test that rejected tokens are remembered for the TTL and bounded in number"""
+    cache = RejectedTokenCache(max_size=2, ttl=60)
+    cache.add("bad-1")
+    cache.add("bad-2")
+    cache.add("bad-3")
+
+    assert not cache.contains("bad-1")
+    assert cache.contains("bad-3")
+
+    cache._entries[hash_token("bad-3")] = time.time() - 1
+    assert not cache.contains("bad-3")
@@ -0,0 +1,120 @@
+"""
+Tests for the local user directory.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+from app.auth.directory import UserDirectory
+
+
+def make_user(uid, email, role="user", disabled=False):
+    return SimpleNamespace(
+        uid=uid,
+        email=email,
+        display_name="Test User",
+        disabled=disabled,
+        custom_claims={"role": role},
+        user_metadata=SimpleNamespace(creation_timestamp=1700000000000),
+        tokens_valid_after_timestamp=None
+    )
+
+
+def test_sync_serves_lookups_by_uid_and_email(tmp_path):
+    """Test that a synced user is found by uid and case-insensitive email"""
+    users = [make_user("uid-1", "Alice@Example.com"), make_user("uid-2", "bob@example.com", role="admin")]
+    directory = UserDirectory(str(tmp_path / "users.db"), lambda: iter(users))
+
+    assert directory.get("uid-1") is None  # never synced, so not fresh
+    directory.sync()
+
+    alice = directory.get_by_email("alice@example.com")
+    assert alice.uid == "uid-1"
+    assert alice.user_metadata.creation_timestamp == 1700000000000
+    assert directory.get("uid-2").custom_claims == {"role": "admin"}
+
+
+def test_sync_removes_deleted_users_but_keeps_write_through(tmp_path):
+    """Test that a full sync drops users Firebase no longer lists"""
+    users = [make_user("uid-1", "alice@example.com"), make_user("uid-2", "bob@example.com")]
+    directory = UserDirectory(str(tmp_path / "users.db"), lambda: iter(list(users)))
+    directory.sync()
+
+    users.pop()
+    directory.sync(force=True)
+    directory.upsert(make_user("uid-3", "carol@example.com"))
+    directory.update_claims("uid-1", {"role": "admin"})
+
+    assert directory.get("uid-2") is None
+    assert directory.get("uid-3").email == "carol@example.com"
+    assert directory.get("uid-1").custom_claims == {"role": "admin"}
+
+
+def test_writes_during_a_sync_are_not_overwritten_by_the_listing(tmp_path):
+    """Test that rows written through while a sync is listing keep their newer data"""
+    directory = UserDirectory(str(tmp_path / "users.db"), lambda: iter([]))
+
+    def list_users():
+        # The listing was read before these writes landed
+        listed = [make_user("uid-1", "alice@example.com"), make_user("uid-2", "bob@example.com")]
+        directory.update_claims("uid-1", {"role": "admin"})
+        directory.upsert(make_user("uid-2", "bob@example.com", disabled=True))
+        yield from listed
+
+    directory.upsert(make_user("uid-1", "alice@example.com"))
+    directory.list_users = list_users
+    directory.sync(force=True)
+
+    assert directory.get("uid-1").custom_claims == {"role": "admin"}
+    assert directory.get("uid-2").disabled is True
+
+
+def test_stale_directory_is_bypassed(tmp_path):
+    """Test that lookups miss once the last sync is older than the freshness bound"""
+    directory = UserDirectory(str(tmp_path / "users.db"), lambda: iter([make_user("uid-1", "a@example.com")]),
+                              max_staleness=60)
+    directory.sync()
+    assert directory.get("uid-1") is not None
+
+    directory.synced_at = time.time() - 120
+    assert directory.get("uid-1") is None
+
+
+def test_recent_sync_by_another_worker_is_reused(tmp_path):
+    """Test that a worker skips listing users when a sibling synced recently"""
+    path = str(tmp_path / "users.db")
+    calls = []
+
+    def list_users():
+        calls.append(1)
+        return iter([make_user("uid-1", "a@example.com")])
+
+    UserDirectory(path, list_users).sync()
+    second = UserDirectory(path, list_users)
+
+    assert second.sync() is False
+    assert len(calls) == 1
+    assert second.get("uid-1").uid == "uid-1"
+
+
+def test_lookups_do_not_wait_for_a_sync_batch(tmp_path):
+    """Test that reads see committed rows while a write batch holds the lock and a transaction"""
+    directory = UserDirectory(str(tmp_path / "users.db"), lambda: iter([make_user("uid-1", "a@example.com")]))
+    directory.sync()
+    results = []
+
+    with directory._lock:
+        conn = directory._connection()
+        conn.execute("BEGIN")
+        directory._write(conn, [directory._row(make_user("uid-2", "b@example.com"), time.time())])
+        reader = threading.Thread(target=lambda: results.append((directory.get("uid-1"), directory.get("uid-2"))))
+        reader.start()
+        reader.join(timeout=5)
+        conn.execute("COMMIT")
+
+    assert not reader.is_alive()
+    assert results[0][0].uid == "uid-1"
+    assert results[0][1] is None  # not committed yet
+    assert directory.get("uid-2").uid == "uid-2"
+    directory.close()
@@ -0,0 +1,61 @@
+"""
+Tests for the bounded executor that runs blocking Firebase calls.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.auth.executor import BlockingCallExecutor, ExecutorSaturatedError, FirebaseCallTimeoutError
+
+
+def test_calls_beyond_max_pending_are_rejected():
+    """Test that a full executor sheds new calls and frees the slot once a call finishes"""
+    executor = BlockingCallExecutor(max_workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        blocked = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0)
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(time.time)
+        release.set()
+        assert await blocked is True
+        assert isinstance(await executor.run(time.time), float)
+
+    asyncio.run(scenario())
+    executor.shutdown()
+    assert executor.pending == 0
+
+
+def test_timed_out_call_holds_its_slot_until_the_thread_finishes():
+    """Test that a timeout raises FirebaseCallTimeoutError without freeing the still busy slot"""
+    executor = BlockingCallExecutor(max_workers=1, max_pending=1)
+    release = threading.Event()
+    finished = threading.Event()
+
+    def slow_call():
+        release.wait()
+        finished.set()
+
+    async def scenario():
+        with pytest.raises(FirebaseCallTimeoutError):
+            await executor.run(slow_call, timeout=0.05)
+        # The thread is still running the call, so its slot is still taken
+        assert executor.pending == 1
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(time.time)
+
+        release.set()
+        await asyncio.to_thread(finished.wait)
+        for _ in range(100):
+            if executor.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert executor.pending == 0
+        assert isinstance(await executor.run(time.time), float)
+
+    asyncio.run(scenario())
+    executor.shutdown()
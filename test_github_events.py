@@ -0,0 +1,100 @@
+"""
+Tests for streaming GitHub event summaries.
+"""
+
+import io
+import json
+
+import pytest
+
+from app.github_events import DEFAULT_FIELDS, parse_fields, summarize, summarize_directory
+
+
+def _pull_request_event(number=7):
+    return {
+        "action": "opened",
+        "number": number,
+        "pull_request": {
+            "number": number,
+            "state": "open",
+            "draft": False,
+            "body": 'Fixes "quoted" things \\ and {braces} [brackets], ünïcode' * 200,
+            "head": {"sha": "abc123", "ref": "feature", "repo": {"topics": ["a", "b"]}},
+            "base": {"ref": "main"},
+            "labels": [{"name": "bug"}, {"name": "perf"}],
+            "commits": 3,
+            "changed_files": 12,
+            "additions": 340,
+            "deletions": 25,
+        },
+        "repository": {"full_name": "octo/repo", "private": True, "stats": None},
+        "sender": {"login": "octocat"},
+    }
+
+
+def test_summary_matches_full_parse_across_chunk_boundaries():
+    """Test that small chunks split tokens without changing the projected values"""
+    event = _pull_request_event()
+    text = json.dumps(event, indent=2, ensure_ascii=False)
+
+    summary = summarize(io.StringIO(text), chunk_size=7)
+
+    assert summary == {
+        "action": "opened",
+        "number": 7,
+        "pr_number": 7,
+        "pr_state": "open",
+        "draft": False,
+        "head_sha": "abc123",
+        "head_ref": "feature",
+        "base_ref": "main",
+        "commits": 3,
+        "changed_files": 12,
+        "additions": 340,
+        "deletions": 25,
+        "repository": "octo/repo",
+        "sender": "octocat",
+    }
+
+
+def test_custom_fields_capture_objects_and_array_items():
+    """Test name=path projections into nested objects and array indexes"""
+    fields = parse_fields("first_label=pull_request.labels.0.name,pull_request.base, missing=nope.nothing")
+    summary = summarize(io.StringIO(json.dumps(_pull_request_event())), fields)
+
+    assert summary == {"first_label": "bug", "pull_request.base": {"ref": "main"}}
+    assert parse_fields("") == DEFAULT_FIELDS
+
+
+def test_reading_stops_once_every_field_is_found():
+    """Test that the rest of the stream is not read after the last projected field"""
+    text = '{"action": "closed", "number": 1, ' + "this is not json"
+    assert summarize(io.StringIO(text), {"action": "action", "number": "number"}) == {"action": "closed", "number": 1}
+
+
+def test_truncated_event_is_an_error():
+    """Test that a payload cut off mid-string raises ValueError"""
+    with pytest.raises(ValueError):
+        summarize(io.StringIO('{"action": "open'))
+
+
+def test_batch_writes_ndjson_in_file_order(tmp_path):
+    """Test that batch mode summarizes each file on the pool and reports errors per file"""
+    events = tmp_path / "events"
+    events.mkdir()
+    for number in (3, 1, 2):
+        (events / f"event-{number}.json").write_text(json.dumps(_pull_request_event(number)))
+    (events / "event-4.json").write_text('{"action": ')
+    (events / "notes.txt").write_text("ignored")
+
+    output = io.StringIO()
+    files, errors = summarize_directory(str(events), output, {"number": "number"}, workers=2)
+
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert (files, errors) == (4, 1)
+    assert lines[:3] == [
+        {"file": "event-1.json", "number": 1},
+        {"file": "event-2.json", "number": 2},
+        {"file": "event-3.json", "number": 3},
+    ]
+    assert lines[3]["file"] == "event-4.json" and "error" in lines[3]
@@ -0,0 +1,53 @@
+"""
+Tests for the Identity Toolkit password sign-in client.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.auth.identity_toolkit import IdentityToolkitClient, IdentityToolkitError, InvalidCredentialsError
+
+
+def _client(responses, requests):
+    def handler(request):
+        requests.append(request)
+        return responses.pop(0)
+    return IdentityToolkitClient("test-key", base_url="http://emulator/identitytoolkit.googleapis.com/v1",
+                                 backoff=0, transport=httpx.MockTransport(handler))
+
+
+def test_sign_in_posts_credentials_with_api_key():
+    """Test that sign-in hits signInWithPassword with the key and returns the body"""
+    requests = []
+    client = _client([httpx.Response(200, json={"localId": "uid-1"})], requests)
+
+    result = asyncio.run(client.sign_in_with_password("a@example.com", "secret"))
+
+    assert result == {"localId": "uid-1"}
+    assert requests[0].url.path == "/identitytoolkit.googleapis.com/v1/accounts:signInWithPassword"
+    assert requests[0].url.params["key"] == "test-key"
+
+
+def test_invalid_credentials_are_not_retried():
+    """Test that a credential error fails immediately"""
+    requests = []
+    client = _client([httpx.Response(400, json={"error": {"message": "INVALID_PASSWORD"}})], requests)
+
+    with pytest.raises(InvalidCredentialsError):
+        asyncio.run(client.sign_in_with_password("a@example.com", "wrong"))
+    assert len(requests) == 1
+
+
+def test_server_errors_are_retried():
+    """Test that 5xx responses are retried up to the retry limit"""
+    requests = []
+    client = _client([httpx.Response(503), httpx.Response(200, json={"localId": "uid-1"})], requests)
+    assert asyncio.run(client.sign_in_with_password("a@example.com", "secret"))["localId"] == "uid-1"
+
+    requests = []
+    client = _client([httpx.Response(503)] * 3, requests)
+    with pytest.raises(IdentityToolkitError):
+        asyncio.run(client.sign_in_with_password("a@example.com", "secret"))
+    assert len(requests) == 3
@@ -0,0 +1,115 @@
+"""
+Tests for the access/refresh token signing key ring.
+"""
+
+import asyncio
+import time
+from datetime import timedelta
+
+import jwt
+import pytest
+
+from app.auth.keys import KeyRing
+
+
+@pytest.mark.parametrize("algorithm", ["ES256", "EdDSA"])
+def test_sign_and_decode_round_trip(algorithm):
+    """Test that tokens carry the active kid and verify against the ring"""
+    ring = KeyRing(algorithm=algorithm)
+    token = ring.sign({"sub": "user-1"})
+
+    assert jwt.get_unverified_header(token)["kid"] == ring.active.kid
+    assert ring.decode(token)["sub"] == "user-1"
+
+
+def test_jwks_publishes_current_and_next_key():
+    """Test that the next slot's key is published before it becomes active"""
+    ring = KeyRing(algorithm="ES256", rotation_interval=timedelta(hours=1))
+    kids = [key["kid"] for key in ring.jwks()["keys"]]
+
+    assert len(kids) == 2
+    assert ring.active.kid in kids
+    assert all(key["alg"] == "ES256" and key["use"] == "sig" for key in ring.jwks()["keys"])
+
+
+def test_jwks_verifies_tokens_without_the_service():
+    """Test that a downstream verifier can check tokens using only the JWKS"""
+    ring = KeyRing(algorithm="ES256")
+    token = ring.sign({"sub": "user-1"})
+    kid = jwt.get_unverified_header(token)["kid"]
+
+    jwk = next(key for key in ring.jwks()["keys"] if key["kid"] == kid)
+    public_key = jwt.PyJWK(jwk).key
+    assert jwt.decode(token, public_key, algorithms=["ES256"])["sub"] == "user-1"
+
+
+def test_workers_sharing_a_keys_dir_converge(tmp_path):
+    """Test that two rings on the same directory sign with the same key"""
+    first = KeyRing(algorithm="ES256", keys_dir=str(tmp_path))
+    second = KeyRing(algorithm="ES256", keys_dir=str(tmp_path))
+
+    assert first.active.kid == second.active.kid
+    assert second.decode(first.sign({"sub": "user-1"}))["sub"] == "user-1"
+
+
+def test_expired_keys_are_dropped(tmp_path):
+    """Test that keys older than the retention window are removed"""
+    ring = KeyRing(algorithm="ES256", keys_dir=str(tmp_path),
+                   rotation_interval=timedelta(seconds=1), retention=timedelta(seconds=0))
+    old_kid = ring.active.kid
+    time.sleep(2.1)
+    ring.ensure_keys()
+
+    assert ring.get(old_kid) is None
+    assert not (tmp_path / f"{old_kid}.pem").exists()
+
+
+def test_hs256_legacy_mode():
+    """Test that HS256 signs with the shared secret and publishes no keys"""
+    ring = KeyRing(algorithm="HS256", secret="secret")
+    token = ring.sign({"sub": "user-1"})
+
+    assert jwt.decode(token, "secret", algorithms=["HS256"])["sub"] == "user-1"
+    assert ring.jwks() == {"keys": []}
+
+
+def test_start_catches_up_with_the_current_slot(tmp_path):
+    """Test that start() replaces a stale active key inherited from a parent process"""
+    ring = KeyRing(algorithm="ES256", keys_dir=str(tmp_path),
+                   rotation_interval=timedelta(hours=1), retention=timedelta(hours=1))
+    current_kid = ring.active.kid
+    # As if forked from a parent that last rotated many slots ago
+    stale = ring._ensure_slot_key(int(time.time() // 3600) - 100)
+    ring._active = stale
+
+    async def lifecycle():
+        await ring.start()
+        await ring.stop()
+
+    asyncio.run(lifecycle())
+
+    assert ring.active.kid == current_kid
+    assert ring.get(stale.kid) is None
+
+
+def test_constructing_a_ring_touches_no_files(tmp_path):
+    """Test that keys are created on first use, not when the ring is built"""
+    keys_dir = tmp_path / "keys"
+    ring = KeyRing(algorithm="ES256", keys_dir=str(keys_dir))
+    assert not keys_dir.exists()
+
+    ring.sign({"sub": "user-1"})
+    assert len(list(keys_dir.glob("*.pem"))) == 2
+
+
+def test_service_keys_survive_a_restart(tmp_path, monkeypatch):
+    """Test that JWT_KEYS_DIR keeps issued tokens valid across restarts"""
+    from app.auth.firebase_auth import FirebaseAuthService
+
+    monkeypatch.setenv("JWT_KEYS_DIR", str(tmp_path / "keys"))
+    monkeypatch.setenv("REVOCATION_BACKEND", "memory")
+    token = FirebaseAuthService()._generate_access_token("uid-1", "a@example.com", {}, "session-1")
+
+    restarted = FirebaseAuthService()
+
+    assert restarted.key_ring.decode(token)["user_id"] == "uid-1"
@@ -0,0 +1,88 @@
+"""
+Tests for queue-backed structured logging.
+"""
+
+import io
+import json
+import logging
+import sys
+
+import pytest
+
+from app.log import JSONFormatter, RateLimitFilter, setup_logging, shutdown_logging
+
+
+def _record(msg="Token verification failed: %s", args=("expired",), level=logging.WARNING):
+    return logging.LogRecord("app.auth", level, __file__, 1, msg, args, None)
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_rate_limit_samples_once_the_bucket_is_empty():
+    """Test that a message type passes its burst, then one record in N with a dropped count"""
+    now = [0.0]
+    rate_filter = RateLimitFilter(rate=1.0, burst=2, sample_every=3, clock=lambda: now[0])
+
+    records = [_record() for _ in range(8)]
+    passed = [rate_filter.filter(record) for record in records]
+
+    assert passed == [True, True, False, False, True, False, False, True]
+    assert records[4].suppressed == 2
+    assert records[7].suppressed == 2
+
+    # Other message types have their own bucket
+    assert rate_filter.filter(_record("Token refresh failed: %s"))
+
+    now[0] = 1.0
+    refilled = _record()
+    assert rate_filter.filter(refilled)
+    assert not hasattr(refilled, "suppressed")
+
+
+def test_critical_records_are_never_dropped():
+    """Test that records at the exempt level bypass the limit"""
+    rate_filter = RateLimitFilter(rate=1.0, burst=0, sample_every=0)
+    assert not rate_filter.filter(_record())
+    assert rate_filter.filter(_record(level=logging.CRITICAL))
+
+
+def test_json_formatter_includes_extra_fields_and_exceptions():
+    """Test the structured output of a record"""
+    try:
+        raise ValueError("bad signature")
+    except ValueError:
+        record = logging.LogRecord("app.auth", logging.ERROR, __file__, 1, "Failed for %s", ("uid-1",),
+                                   sys.exc_info())
+    record.suppressed = 4
+
+    entry = json.loads(JSONFormatter().format(record))
+
+    assert entry["level"] == "error"
+    assert entry["logger"] == "app.auth"
+    assert entry["message"] == "Failed for uid-1"
+    assert entry["suppressed"] == 4
+    assert "ValueError: bad signature" in entry["exception"]
+
+
+def test_setup_logging_writes_from_the_listener_thread(restore_root_logger):
+    """Test that records go through the queue and are flushed on shutdown"""
+    stream = io.StringIO()
+    setup_logging(level="info", json_format=True, rate_filter=RateLimitFilter(burst=1, sample_every=0),
+                  stream=stream)
+
+    logger = logging.getLogger("app.test")
+    logger.warning("Token verification failed: %s", "expired")
+    logger.warning("Token verification failed: %s", "expired again")
+    logger.debug("below the level")
+    shutdown_logging()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["message"] for line in lines] == ["Token verification failed: expired"]
@@ -0,0 +1,71 @@
+"""
+Tests for password login.
+"""
+
+import asyncio
+
+import pytest
+
+
+def _login(service, email, password="password"):
+    async def login():
+        try:
+            return await service.sign_in_user(email, password)
+        finally:
+            await service.stop()
+
+    return asyncio.run(login())
+
+
+def test_cold_login_is_minted_from_the_id_token(make_service, fake_firebase):
+    """Test that a login with an empty profile cache makes no Admin SDK call"""
+    service = make_service()
+    user = fake_firebase.add_user("ada@example.com", role="admin", first_name="Ada", last_name="Lovelace")
+
+    result = _login(service, "ada@example.com")
+
+    assert fake_firebase.calls == {"signInWithPassword": 1}
+    assert result["user"] == {
+        "id": user.uid, "email": "ada@example.com", "first_name": "Ada", "last_name": "Lovelace",
+        "is_active": True, "created_at": None
+    }
+    claims = service.key_ring.decode(result["access_token"])
+    assert claims["user_id"] == user.uid and claims["role"] == "admin"
+
+
+def test_warm_login_uses_the_cached_profile(make_service, fake_firebase):
+    """Test that a cached user record supplies the full profile"""
+    service = make_service()
+    user = fake_firebase.add_user("ada@example.com", first_name="Ada")
+    service.profile_cache.set(user)
+
+    result = _login(service, "ada@example.com")
+
+    assert fake_firebase.calls == {"signInWithPassword": 1}
+    assert result["user"]["created_at"] == str(user.user_metadata.creation_timestamp)
+
+
+def test_disabled_or_wrong_password_is_refused(make_service, fake_firebase):
+    """Test that rejected credentials never produce a session"""
+    service = make_service()
+    fake_firebase.add_user("ada@example.com")
+    fake_firebase.add_user("off@example.com").disabled = True
+
+    with pytest.raises(Exception, match="Authentication failed"):
+        _login(service, "ada@example.com", password="wrong")
+    with pytest.raises(Exception, match="Authentication failed"):
+        _login(service, "off@example.com")
+
+
+def test_cold_login_survives_a_signing_key_rotation(make_service, fake_firebase):
+    """Test that an ID token signed with a key not yet loaded falls back to a user lookup"""
+    service = make_service()
+    user = fake_firebase.add_user("ada@example.com", first_name="Ada")
+    # The published key set still only lists the old kid
+    fake_firebase.kid = "rotated-key"
+
+    result = _login(service, "ada@example.com")
+
+    assert fake_firebase.calls["get_user"] == 1
+    assert result["user"]["id"] == user.uid
+    assert result["user"]["created_at"] == str(user.user_metadata.creation_timestamp)
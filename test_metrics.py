@@ -0,0 +1,73 @@
+"""
+Tests for the in-process Prometheus metrics.
+"""
+
+import threading
+
+from app.metrics import MetricsRegistry
+
+
+def test_counter_sums_per_thread_shards():
+    """Test that increments from several threads are all counted"""
+    registry = MetricsRegistry()
+    counter = registry.counter("events_total", "Events", ("kind",))
+
+    def work():
+        for _ in range(1000):
+            counter.labels("a").inc()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.labels("a").value == 4000
+    assert 'events_total{kind="a"} 4000' in registry.render()
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Test that histogram output follows the Prometheus text format"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.1)
+    histogram.observe(5)
+
+    output = registry.render()
+    assert "# TYPE latency_seconds histogram" in output
+    assert 'latency_seconds_bucket{le="0.1"} 2' in output
+    assert 'latency_seconds_bucket{le="1.0"} 2' in output
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in output
+    assert "latency_seconds_count 3" in output
+
+
+def test_gauge_reads_callback_at_render():
+    """Test that gauges sample their callback on every scrape"""
+    registry = MetricsRegistry()
+    depth = {"value": 1}
+    registry.gauge("queue_depth", "Queue depth", lambda: depth["value"])
+
+    assert "queue_depth 1" in registry.render()
+    depth["value"] = 7
+    assert "queue_depth 7" in registry.render()
+
+
+def test_only_admin_sdk_calls_are_recorded_as_firebase_calls(make_service, fake_firebase):
+    """Test that other executor work, such as password hashing, stays out of the Firebase metrics"""
+    import asyncio
+
+    from app.metrics import registry
+
+    service = make_service()
+    service.import_hash_rounds = 1
+    users = [{"email": "a@example.com", "password": "secret1", "first_name": "A", "last_name": "B"}]
+
+    async def run():
+        return [item async for item in service.import_users(users)]
+
+    asyncio.run(run())
+
+    output = registry.render()
+    assert 'firebase_call_duration_seconds_count{call="import_users"}' in output
+    assert 'call="_build_import_records"' not in output
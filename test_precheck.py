@@ -0,0 +1,70 @@
+"""
+Tests for structural bearer token checks.
+"""
+
+import asyncio
+import base64
+import json
+import time
+
+import pytest
+
+from app.auth.precheck import precheck_token, MalformedTokenError
+
+
+def _segment(value):
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).rstrip(b"=").decode()
+
+
+def _token(header=None, payload=None, signature="c2lnbmF0dXJl"):
+    header = header if header is not None else {"alg": "RS256", "kid": "key-1"}
+    payload = payload if payload is not None else {"exp": time.time() + 60}
+    return f"{_segment(header)}.{_segment(payload)}.{signature}"
+
+
+def test_well_formed_token_returns_header():
+    """Test that a structurally valid token passes and yields its header"""
+    assert precheck_token(_token())["kid"] == "key-1"
+
+
+@pytest.mark.parametrize("token", [
+    "",
+    "not-a-jwt",
+    "a.b",
+    "a..c",
+    "a.b.c.d",
+    "a.b.c!",
+    "x" * 9000,
+    _token(header={"alg": "RS256"}),
+    _token(header=["alg"]),
+    _token(payload={"sub": "no-exp"}),
+    _token(payload={"exp": "tomorrow"}),
+    _token(payload={"exp": time.time() - 1}),
+    "bm90LWpzb24.e30.c2ln",
+])
+def test_malformed_tokens_are_rejected(token):
+    """Test that garbage, incomplete and expired tokens never reach verification"""
+    with pytest.raises(MalformedTokenError):
+        precheck_token(token)
+
+
+def test_kid_can_be_optional():
+    """Test that require_kid=False accepts a header without kid but not a non-string kid"""
+    assert precheck_token(_token(header={"alg": "HS256"}), require_kid=False) == {"alg": "HS256"}
+    with pytest.raises(MalformedTokenError):
+        precheck_token(_token(header={"alg": "HS256", "kid": 1}), require_kid=False)
+
+
+def test_hs256_access_tokens_pass_verify_bearer_token(monkeypatch):
+    """Test that HS256 access tokens, which have no kid, are still verified"""
+    from app.auth.dependencies import verify_bearer_token
+    from app.auth.firebase_auth import firebase_auth
+    from app.auth.keys import KeyRing
+
+    monkeypatch.setattr(firebase_auth, "key_ring", KeyRing("HS256", secret="test-secret"))
+    monkeypatch.setattr(firebase_auth, "jwt_algorithm", "HS256")
+    token = firebase_auth._generate_access_token("uid-1", "a@example.com", {"role": "user"}, "session-1")
+
+    user = asyncio.run(verify_bearer_token(token))
+
+    assert user is not None and user["uid"] == "uid-1"
@@ -0,0 +1,54 @@
+"""
+Tests for the role/permission bitmask engine.
+"""
+
+import pytest
+
+from app.auth.rbac import DEFAULT_RBAC_CONFIG, PermissionEngine
+
+
+def test_roles_inherit_permissions():
+    """Test that admin gets its own and user's permissions, but not vice versa"""
+    engine = PermissionEngine(DEFAULT_RBAC_CONFIG)
+    admin = engine.mask_for_role("admin")
+    user = engine.mask_for_role("user")
+
+    required = engine.mask_for("resources:create", "role:user")
+    assert admin & required == required
+    assert user & required == required
+
+    required = engine.mask_for("resources:delete")
+    assert admin & required == required
+    assert user & required != required
+
+
+def test_unknown_role_has_no_permissions():
+    """Test that users with an unconfigured role are denied everything"""
+    engine = PermissionEngine(DEFAULT_RBAC_CONFIG)
+    assert engine.mask_for_role("guest") == 0
+
+
+def test_unknown_permission_is_a_configuration_error():
+    """Test that typos in required permissions fail at startup, not per request"""
+    engine = PermissionEngine(DEFAULT_RBAC_CONFIG)
+    with pytest.raises(ValueError):
+        engine.mask_for("resources:destroy")
+
+
+def test_inheritance_cycles_are_rejected():
+    """Test that a cyclic role hierarchy is reported"""
+    config = {"roles": {
+        "a": {"inherits": ["b"]},
+        "b": {"inherits": ["a"]},
+    }}
+    with pytest.raises(ValueError):
+        PermissionEngine(config)
+
+
+def test_hundreds_of_permissions():
+    """Test that masks are not limited to machine word size"""
+    permissions = [f"perm:{index}" for index in range(300)]
+    engine = PermissionEngine({"roles": {"power": {"permissions": permissions}}})
+    required = engine.mask_for("perm:0", "perm:299")
+    assert engine.mask_for_role("power") & required == required
+    assert set(engine.permissions_for(engine.mask_for("perm:7"))) == {"perm:7"}
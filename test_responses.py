@@ -0,0 +1,33 @@
+"""
+Tests for the fast JSON responses.
+"""
+
+import json
+
+from app.auth.models import TokenResponse
+from app.responses import FastJSONResponse, ModelResponse, StaticJSONResponse
+
+
+def test_model_response_serializes_model_once():
+    """Test that a model is rendered as compact JSON with the given status"""
+    response = ModelResponse(TokenResponse(access_token="a", refresh_token="r"), status_code=201)
+
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+    assert json.loads(response.body) == {"access_token": "a", "refresh_token": "r", "token_type": "bearer"}
+
+
+def test_fast_json_response_matches_stdlib_content():
+    """Test that dict bodies decode to the same content"""
+    content = {"valid": True, "user": {"id": "uid-1", "email": "ä@example.com", "role": None}}
+    assert json.loads(FastJSONResponse(content).body) == content
+
+
+def test_static_template_builds_fresh_responses():
+    """Test that a template returns a new response object with the pre-encoded body each time"""
+    make = StaticJSONResponse.template({"message": "ok"})
+    first, second = make(), make()
+
+    assert first is not second
+    assert first.body == second.body == b'{"message":"ok"}'
+    assert first.headers["content-length"] == str(len(first.body))
@@ -0,0 +1,75 @@
+"""
+Tests for the refresh token / session revocation index.
+"""
+
+import asyncio
+import time
+
+from app.auth.revocation import RevocationIndex, SQLiteRevocationStore
+
+
+def test_revoke_local_is_visible_immediately():
+    """Test that revocations are checked against memory without a store"""
+    index = RevocationIndex()
+    assert not index.is_revoked("jti-1")
+
+    index.revoke_local("jti-1", time.time() + 60)
+    assert index.is_revoked("jti-1")
+
+
+def test_revocations_sync_between_processes(tmp_path):
+    """Test that a revocation persisted by one worker reaches another on sync"""
+    path = str(tmp_path / "revocations.db")
+    first = RevocationIndex(SQLiteRevocationStore(path))
+    second = RevocationIndex(SQLiteRevocationStore(path))
+
+    first.revoke_local("session-1", time.time() + 60)
+    first.persist("session-1", time.time() + 60)
+    assert not second.is_revoked("session-1")
+
+    second.sync()
+    assert second.is_revoked("session-1")
+
+
+def test_expired_revocations_are_dropped(tmp_path):
+    """Test that entries are forgotten once the revoked token would have expired"""
+    store = SQLiteRevocationStore(str(tmp_path / "revocations.db"))
+    index = RevocationIndex(store)
+    index.revoke_local("jti-1", time.time() - 1)
+    index.persist("jti-1", time.time() - 1)
+
+    index.sync()
+
+    assert not index.is_revoked("jti-1")
+    assert len(index) == 0
+    assert store.load_since(0) == ([], 0)
+
+
+def test_store_reports_whether_a_revocation_is_new(tmp_path):
+    """Test that the shared store accepts each key once across processes"""
+    path = str(tmp_path / "revocations.db")
+    first, second = SQLiteRevocationStore(path), SQLiteRevocationStore(path)
+
+    assert first.add("jti-1", time.time() + 60) is True
+    assert second.add("jti-1", time.time() + 60) is False
+
+
+def test_refresh_token_reuse_is_caught_across_workers(make_service, fake_firebase):
+    """Test that a refresh token replayed on another worker revokes the session before either syncs"""
+    first = make_service(REVOCATION_BACKEND="sqlite")
+    second = make_service(REVOCATION_BACKEND="sqlite")
+    user = fake_firebase.add_user("ada@example.com")
+    refresh_token = first._generate_refresh_token(user.uid, "session-1")
+
+    async def replay():
+        exchanged = await first.refresh_access_token(refresh_token)
+        replayed = await second.refresh_access_token(refresh_token)
+        first.revocations.sync()
+        # The legitimate holder's new refresh token dies with the session
+        return exchanged, replayed, await first.refresh_access_token(exchanged["refresh_token"])
+
+    exchanged, replayed, after_theft = asyncio.run(replay())
+
+    assert exchanged["access_token"]
+    assert replayed is None
+    assert after_theft is None
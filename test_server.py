@@ -0,0 +1,55 @@
+"""
+Tests for the production server configuration.
+"""
+
+import os
+
+import pytest
+
+from app.server import ServerConfig, bind_socket
+
+
+def test_config_defaults_to_one_worker_per_core(monkeypatch):
+    """Test that SERVER_WORKERS=0 uses the CPU count and HOST/PORT are honoured"""
+    monkeypatch.setenv("SERVER_WORKERS", "0")
+    monkeypatch.setenv("HOST", "127.0.0.1")
+    monkeypatch.setenv("PORT", "9123")
+
+    config = ServerConfig()
+
+    assert config.workers == (os.cpu_count() or 1)
+    assert (config.host, config.port) == ("127.0.0.1", 9123)
+
+
+def test_reuse_port_sockets_share_an_address(monkeypatch):
+    """Test that two workers can bind the same port with SO_REUSEPORT"""
+    monkeypatch.setenv("HOST", "127.0.0.1")
+    monkeypatch.setenv("PORT", "0")
+    config = ServerConfig()
+    if not config.reuse_port:
+        return
+
+    first = bind_socket(config)
+    config.port = first.getsockname()[1]
+    second = bind_socket(config)
+    try:
+        assert second.getsockname() == first.getsockname()
+    finally:
+        first.close()
+        second.close()
+
+
+def test_multiple_workers_require_a_shared_keys_dir(monkeypatch):
+    """Test that forking several workers with in-memory asymmetric keys is refused"""
+    from app.auth.keys import KeyRing
+    from app.server import Supervisor
+
+    monkeypatch.setenv("SERVER_WORKERS", "4")
+    supervisor = Supervisor(ServerConfig())
+
+    with pytest.raises(RuntimeError, match="JWT_KEYS_DIR"):
+        supervisor.check_signing_keys(KeyRing("ES256"))
+
+    supervisor.check_signing_keys(KeyRing("HS256", secret="secret"))
+    monkeypatch.setenv("SERVER_WORKERS", "1")
+    Supervisor(ServerConfig()).check_signing_keys(KeyRing("ES256"))
@@ -0,0 +1,49 @@
+"""
+Tests for the single round trip signup path.
+"""
+
+import asyncio
+
+
+def test_signup_returns_tokens_after_one_firebase_call(make_service, fake_firebase):
+    """Test that signup responds after create_user and writes claims afterwards"""
+    service = make_service()
+
+    async def signup():
+        result = await service.signup_user("new@example.com", "secret1", "Ada", "Lovelace")
+        calls_at_response = dict(fake_firebase.calls)
+        await service.stop()
+        return result, calls_at_response
+
+    result, calls_at_response = asyncio.run(signup())
+
+    assert calls_at_response == {"create_user": 1}
+    assert result["user"]["first_name"] == "Ada"
+    assert result["access_token"] and result["refresh_token"]
+    assert fake_firebase.calls["set_custom_user_claims"] == 1
+    user = fake_firebase.get_user_by_email("new@example.com")
+    assert user.custom_claims == {"first_name": "Ada", "last_name": "Lovelace", "role": "user"}
+
+
+def test_signup_claims_write_is_retried(make_service, fake_firebase, monkeypatch):
+    """Test that a failed deferred claims write is retried"""
+    service = make_service()
+    service.claims_write_retries = 1
+    service.claims_write_backoff = 0
+    set_claims = fake_firebase.set_custom_user_claims
+    failures = [RuntimeError("unavailable")]
+
+    def flaky_set_claims(uid, custom_claims):
+        if failures:
+            raise failures.pop()
+        set_claims(uid, custom_claims)
+
+    monkeypatch.setattr(fake_firebase, "set_custom_user_claims", flaky_set_claims)
+
+    async def signup():
+        await service.signup_user("retry@example.com", "secret1", "Ada", "Lovelace")
+        await service.stop()
+
+    asyncio.run(signup())
+
+    assert fake_firebase.get_user_by_email("retry@example.com").custom_claims["role"] == "user"
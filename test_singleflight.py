@@ -0,0 +1,63 @@
+"""
+Tests for single-flight request coalescing.
+"""
+
+import asyncio
+
+from app.auth.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    """Test that concurrent callers with the same key trigger a single lookup"""
+    calls = 0
+
+    async def lookup():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"uid": "a"}
+
+    async def run():
+        flight = SingleFlight()
+        results = await asyncio.gather(*[flight.do("a", lookup) for _ in range(20)])
+        assert flight.in_flight == 0
+        return results
+
+    results = asyncio.run(run())
+    assert calls == 1
+    assert all(result == {"uid": "a"} for result in results)
+
+
+def test_failures_are_shared_not_retried():
+    """Test that every waiter sees the same failure from one call"""
+    calls = 0
+
+    async def lookup():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise ValueError("quota exceeded")
+
+    async def run():
+        flight = SingleFlight()
+        return await asyncio.gather(*[flight.do("a", lookup) for _ in range(5)], return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert calls == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_sequential_calls_are_not_coalesced():
+    """Test that a finished call is forgotten so later callers look up again"""
+    calls = 0
+
+    async def lookup():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    async def run():
+        flight = SingleFlight()
+        return [await flight.do("a", lookup), await flight.do("a", lookup)]
+
+    assert asyncio.run(run()) == [1, 2]
@@ -0,0 +1,61 @@
+"""
+Tests for lazy Firebase initialization and startup timing.
+"""
+
+import asyncio
+
+from app.auth.firebase_auth import FirebaseAuthService
+from app.startup import phase, timings
+
+
+def test_service_does_not_initialize_firebase_on_construction(service_env):
+    """Test that creating the service leaves the Admin SDK uninitialized"""
+    service = FirebaseAuthService()
+    assert service._firebase_app is None
+
+
+def test_phase_accumulates_durations():
+    """Test that repeated phases add up under one name"""
+    timings.pop("test_phase", None)
+    with phase("test_phase"):
+        pass
+    first = timings["test_phase"]
+    with phase("test_phase"):
+        pass
+
+    assert timings["test_phase"] >= first > 0
+
+
+def test_start_leaves_firebase_uninitialized_without_a_project_id(service_env, monkeypatch):
+    """Test that start() defers the SDK init and ID token verifier to first use"""
+    # Credentials that cannot be parsed must not stop the app from starting
+    monkeypatch.setenv("FIREBASE_CREDENTIALS", '{"type": "x"}')
+    service = FirebaseAuthService()
+
+    async def lifecycle():
+        await service.start()
+        initialized = service._firebase_app is not None
+        await service.stop()
+        return initialized
+
+    assert asyncio.run(lifecycle()) is False
+    assert service.id_token_verifier is None
+
+
+def test_id_token_verifier_is_built_on_first_verification(fake_firebase, monkeypatch):
+    """Test that the first ID token verification reads the project id and verifies locally"""
+    from types import SimpleNamespace
+
+    fake = fake_firebase
+    service = FirebaseAuthService()
+    monkeypatch.setattr(service, "_initialize_firebase", lambda: SimpleNamespace(project_id=fake.project_id))
+    token = fake.issue_id_token(fake.add_user("lazy@example.com"))
+
+    async def verify():
+        user = await service.verify_token(token)
+        await service.stop()
+        return user
+
+    assert asyncio.run(verify())["email"] == "lazy@example.com"
+    assert service.id_token_verifier is not None
+    assert "verify_id_token" not in fake.calls
@@ -0,0 +1,85 @@
+"""
+Tests for login/signup throttling.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.auth.throttle import AuthThrottle, MemoryThrottleBackend, SQLiteThrottleBackend, ThrottledError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_allows_burst_then_refills():
+    """Test that a bucket admits its burst, rejects with retry-after, then refills lazily"""
+    clock = FakeClock()
+    backend = MemoryThrottleBackend(clock=clock)
+
+    assert [backend.acquire("k", 6.0, 3) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert backend.acquire("k", 6.0, 3) == pytest.approx(6.0)
+
+    clock.now += 6.0
+    assert backend.acquire("k", 6.0, 3) == 0.0
+
+
+def test_idle_keys_are_swept():
+    """Test that keys whose bucket has refilled are dropped on sweep"""
+    clock = FakeClock()
+    backend = MemoryThrottleBackend(sweep_interval=10, clock=clock)
+    backend.acquire("a", 1.0, 5)
+    backend.acquire("b", 60.0, 5)
+
+    clock.now += 11
+    backend.acquire("c", 1.0, 5)
+
+    assert len(backend) == 2  # "a" refilled and was swept; "b" still draining
+
+
+def test_email_limit_applies_across_ips():
+    """Test that many addresses trying one account hit the email limit"""
+    throttle = AuthThrottle(MemoryThrottleBackend(), ip_burst=10, email_burst=2)
+
+    async def attempts():
+        await throttle.check("10.0.0.1", "victim@example.com")
+        await throttle.check("10.0.0.2", "Victim@example.com")
+        with pytest.raises(ThrottledError) as error:
+            await throttle.check("10.0.0.3", "victim@example.com")
+        return error.value
+
+    error = asyncio.run(attempts())
+    assert error.scope == "email"
+    assert int(error.retry_after_header) >= 1
+
+
+def test_sqlite_backend_is_shared(tmp_path):
+    """Test that two workers draw from the same bucket through the shared backend"""
+    path = str(tmp_path / "throttle.db")
+    first, second = SQLiteThrottleBackend(path), SQLiteThrottleBackend(path)
+
+    assert first.acquire("ip:1.2.3.4", 60.0, 1) == 0.0
+    assert second.acquire("ip:1.2.3.4", 60.0, 1) > 0
+
+
+def _request(forwarded_for, peer="10.0.0.9"):
+    return SimpleNamespace(headers={"x-forwarded-for": forwarded_for}, client=SimpleNamespace(host=peer))
+
+
+def test_client_ip_ignores_spoofed_forwarded_for_entries():
+    """Test that only the entries appended by trusted proxies are used as the client address"""
+    request = _request("6.6.6.6, 203.0.113.7, 10.0.0.2")
+
+    assert AuthThrottle(MemoryThrottleBackend()).client_ip(request) == "10.0.0.9"
+    assert AuthThrottle(MemoryThrottleBackend(), trust_forwarded_for=True).client_ip(request) == "10.0.0.2"
+    assert AuthThrottle(MemoryThrottleBackend(), trust_forwarded_for=True,
+                        trusted_proxy_hops=2).client_ip(request) == "203.0.113.7"
+    # Fewer entries than trusted hops: the header did not come through our proxies
+    assert AuthThrottle(MemoryThrottleBackend(), trust_forwarded_for=True,
+                        trusted_proxy_hops=5).client_ip(request) == "10.0.0.9"
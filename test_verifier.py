@@ -0,0 +1,108 @@
+"""
+Offline tests for local Firebase ID token verification.
+"""
+
+import datetime
+import json
+import time
+
+import jwt
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+from app.auth.verifier import IdTokenVerifier, InvalidIdTokenError, SigningKeyCache
+
+PROJECT_ID = "test-project"
+
+
+def _make_key_pair():
+    """Create an RSA key and a self-signed certificate like Google's x509 endpoint serves"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "securetoken.system.gserviceaccount.com")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    return key, cert.public_bytes(serialization.Encoding.PEM).decode("utf-8")
+
+
+@pytest.fixture(scope="module")
+def key_set(tmp_path_factory):
+    """Write a local kid -> certificate key set and return its path and signing key"""
+    key, cert_pem = _make_key_pair()
+    path = tmp_path_factory.mktemp("keys") / "certs.json"
+    path.write_text(json.dumps({"kid-1": cert_pem}))
+    return str(path), key
+
+
+def _id_token(key, kid="kid-1", **overrides):
+    now = int(time.time())
+    claims = {
+        "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+        "aud": PROJECT_ID,
+        "sub": "user-123",
+        "auth_time": now - 10,
+        "iat": now - 10,
+        "exp": now + 3600,
+        "email": "user@example.com",
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, key, algorithm="RS256", headers={"kid": kid})
+
+
+def _verifier(path):
+    key_cache = SigningKeyCache(source=path)
+    key_cache.refresh()
+    return IdTokenVerifier(PROJECT_ID, key_cache)
+
+
+def test_verify_valid_token(key_set):
+    """Test that a correctly signed token verifies and exposes uid"""
+    path, key = key_set
+    claims = _verifier(path).verify(_id_token(key))
+    assert claims["uid"] == "user-123"
+    assert claims["email"] == "user@example.com"
+
+
+def test_reject_unknown_kid(key_set):
+    """Test that tokens signed with an unknown kid are rejected"""
+    path, key = key_set
+    with pytest.raises(InvalidIdTokenError):
+        _verifier(path).verify(_id_token(key, kid="other"))
+
+
+def test_reject_wrong_signature(key_set):
+    """Test that tokens signed by a different key are rejected"""
+    path, _ = key_set
+    other_key, _ = _make_key_pair()
+    with pytest.raises(InvalidIdTokenError):
+        _verifier(path).verify(_id_token(other_key))
+
+
+@pytest.mark.parametrize("overrides", [
+    {"aud": "another-project"},
+    {"iss": "https://securetoken.google.com/another-project"},
+    {"exp": int(time.time()) - 60},
+    {"sub": ""},
+    {"auth_time": int(time.time()) + 3600},
+])
+def test_reject_bad_claims(key_set, overrides):
+    """Test that audience, issuer, expiry, subject and auth_time are enforced"""
+    path, key = key_set
+    with pytest.raises(InvalidIdTokenError):
+        _verifier(path).verify(_id_token(key, **overrides))
+
+
+def test_key_cache_not_ready_before_load():
+    """Test that an unloaded key cache reports not ready"""
+    assert not SigningKeyCache(source="missing.json").ready
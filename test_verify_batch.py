@@ -0,0 +1,83 @@
+"""
+Tests for batch token verification.
+"""
+
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+import app.auth.dependencies as dependencies
+import app.auth.routes as routes
+from app.auth.models import VERIFY_BATCH_MAX_TOKENS
+from benchmarks.fake_firebase import FakeFirebaseAuth
+
+
+def _service(make_service, monkeypatch):
+    # ID tokens go through the fake's verify_id_token so calls can be counted
+    service = make_service(LOCAL_TOKEN_VERIFICATION="false")
+    monkeypatch.setattr(dependencies, "firebase_auth", service)
+    return service
+
+
+def _caller(service, role="gateway"):
+    return service._generate_access_token("gateway-1", "gateway@example.com", {"role": role}, "session-gw")
+
+
+def _verify(tokens, caller=None):
+    app = FastAPI()
+    app.include_router(routes.router)
+    headers = {"Authorization": f"Bearer {caller}"} if caller else {}
+
+    async def post():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/auth/verify/batch", json={"tokens": tokens}, headers=headers)
+
+    return asyncio.run(post())
+
+
+def test_results_follow_input_order_and_duplicates_verify_once(make_service, fake_firebase, monkeypatch):
+    """Test a mix of valid, invalid and malformed tokens, with a duplicate verified once"""
+    service = _service(make_service, monkeypatch)
+    ada = fake_firebase.add_user("ada@example.com")
+    ada.custom_claims = {"role": "admin"}
+    grace = fake_firebase.add_user("grace@example.com")
+    id_token = fake_firebase.issue_id_token(ada)
+    forged = FakeFirebaseAuth(latency=0).issue_id_token(ada)
+    access_token = service._generate_access_token(grace.uid, grace.email, {"role": "user"}, "session-1")
+
+    response = _verify([id_token, "not-a-token", access_token, forged, id_token], caller=_caller(service))
+
+    assert response.status_code == 200
+    assert response.json()["results"] == [
+        {"valid": True, "user": {"id": ada.uid, "email": "ada@example.com", "role": "admin"}},
+        {"valid": False},
+        {"valid": True, "user": {"id": grace.uid, "email": "grace@example.com", "role": "user"}},
+        {"valid": False},
+        {"valid": True, "user": {"id": ada.uid, "email": "ada@example.com", "role": "admin"}},
+    ]
+    # The duplicate and the malformed token never reach Firebase
+    assert fake_firebase.calls["verify_id_token"] == 2
+    assert "get_user" not in fake_firebase.calls
+
+
+def test_oversized_batch_is_rejected(make_service, fake_firebase, monkeypatch):
+    """Test that batches over VERIFY_BATCH_MAX_TOKENS fail validation before any verification"""
+    service = _service(make_service, monkeypatch)
+    id_token = fake_firebase.issue_id_token(fake_firebase.add_user("ada@example.com"))
+
+    response = _verify([id_token] * (VERIFY_BATCH_MAX_TOKENS + 1), caller=_caller(service))
+
+    assert response.status_code == 422
+    assert "verify_id_token" not in fake_firebase.calls
+
+
+def test_callers_need_the_verify_permission(make_service, fake_firebase, monkeypatch):
+    """Test that anonymous callers and users without tokens:verify are refused"""
+    service = _service(make_service, monkeypatch)
+    id_token = fake_firebase.issue_id_token(fake_firebase.add_user("ada@example.com"))
+
+    assert _verify([id_token]).status_code in (401, 403)
+    assert _verify([id_token], caller=_caller(service, role="user")).status_code == 403
+    assert "verify_id_token" not in fake_firebase.calls
@@ -0,0 +1,164 @@
+"""
+Tests for Firebase ID token and access token verification.
+"""
+
+import asyncio
+import time
+
+import app.auth.dependencies as dependencies
+
+
+def _service(make_service):
+    return make_service(TOKEN_VERIFY_MODE="claims", CHECK_TOKEN_REVOKED="false")
+
+
+def _run(service, *verifications):
+    async def verify():
+        try:
+            return [await verification for verification in verifications]
+        finally:
+            await service.stop()
+
+    return asyncio.run(verify())
+
+
+def test_claims_mode_makes_no_firebase_call(make_service, fake_firebase):
+    """Test that the user is built from the ID token's own claims"""
+    service = _service(make_service)
+    user = fake_firebase.add_user("ada@example.com", role="admin", first_name="Ada")
+    token = fake_firebase.issue_id_token(user)
+
+    [verified] = _run(service, service.verify_token(token))
+
+    assert fake_firebase.calls == {}
+    assert verified["uid"] == user.uid
+    assert verified["role"] == "admin" and verified["first_name"] == "Ada"
+    assert "created_at" not in verified
+
+
+def test_full_profile_makes_one_user_lookup(make_service, fake_firebase):
+    """Test that full_profile fetches the user record once and serves repeats from the cache"""
+    service = _service(make_service)
+    user = fake_firebase.add_user("ada@example.com")
+    token = fake_firebase.issue_id_token(user)
+
+    first, second = _run(
+        service, service.verify_token(token, full_profile=True), service.verify_token(token, full_profile=True)
+    )
+
+    assert fake_firebase.calls == {"get_user": 1}
+    assert first == second
+    assert first["created_at"] == str(user.user_metadata.creation_timestamp)
+    assert first["is_active"] is True
+
+
+def _access_token(service, **overrides):
+    payload = {
+        "iss": service.jwt_issuer, "sid": "session-1", "user_id": "uid-1", "email": "ada@example.com",
+        "role": "admin", "iat": int(time.time()), "exp": int(time.time()) + 300, "type": "access"
+    }
+    payload.update(overrides)
+    return service.key_ring.sign(payload)
+
+
+def test_service_issued_access_token_is_accepted(make_service, fake_firebase):
+    """Test that an access token from this service verifies locally"""
+    service = _service(make_service)
+    token = service._generate_access_token("uid-1", "ada@example.com", {"role": "admin"}, "session-1")
+
+    [verified] = _run(service, service.verify_access_token(token))
+
+    assert verified["uid"] == "uid-1" and verified["role"] == "admin"
+    assert fake_firebase.calls == {}
+
+
+def test_access_token_with_wrong_type_or_issuer_is_rejected(make_service, fake_firebase):
+    """Test that refresh tokens and tokens from another issuer are not accepted as access tokens"""
+    service = _service(make_service)
+
+    results = _run(
+        service,
+        service.verify_access_token(_access_token(service)),
+        service.verify_access_token(_access_token(service, type="refresh")),
+        service.verify_access_token(_access_token(service, iss="another-service")),
+    )
+
+    assert results[0]["uid"] == "uid-1"
+    assert results[1:] == [None, None]
+
+
+def test_verify_bearer_token_routes_by_header(make_service, fake_firebase, monkeypatch):
+    """Test that RS256 ID tokens go to verify_token and service tokens to verify_access_token"""
+    service = _service(make_service)
+    monkeypatch.setattr(dependencies, "firebase_auth", service)
+    routed = []
+
+    def spy(name, verify):
+        async def wrapper(token, full_profile=False):
+            routed.append(name)
+            return await verify(token, full_profile=full_profile)
+        return wrapper
+
+    monkeypatch.setattr(service, "verify_token", spy("verify_token", service.verify_token))
+    monkeypatch.setattr(service, "verify_access_token", spy("verify_access_token", service.verify_access_token))
+    id_token = fake_firebase.issue_id_token(fake_firebase.add_user("ada@example.com"))
+    access_token = _access_token(service)
+
+    id_user, access_user = _run(
+        service, dependencies.verify_bearer_token(id_token), dependencies.verify_bearer_token(access_token)
+    )
+
+    assert routed == ["verify_token", "verify_access_token"]
+    assert id_user["email"] == "ada@example.com"
+    assert access_user["uid"] == "uid-1"
+
+
+def test_revocation_check_applies_to_cached_tokens(make_service, fake_firebase):
+    """Test that disabling a user takes effect for a token already in the cache"""
+    service = make_service(CHECK_TOKEN_REVOKED="true")
+    user = fake_firebase.add_user("ada@example.com")
+    token = fake_firebase.issue_id_token(user)
+
+    async def scenario():
+        try:
+            first = await service.verify_token(token)
+            user.disabled = True
+            service.profile_cache.invalidate(user.uid)
+            return first, await service.verify_token(token)
+        finally:
+            await service.stop()
+
+    first, second = asyncio.run(scenario())
+
+    assert first["uid"] == user.uid
+    assert second is None
+
+
+def test_revocation_checked_results_expire_with_the_profile(make_service, fake_firebase):
+    """Test that a revocation-checked result is cached no longer than the user profile"""
+    service = make_service(CHECK_TOKEN_REVOKED="true", USER_CACHE_TTL_SECONDS="0")
+    user = fake_firebase.add_user("ada@example.com")
+    token = fake_firebase.issue_id_token(user)
+
+    first, _ = _run(service, service.verify_token(token), service.verify_token(token))
+
+    assert first["uid"] == user.uid
+    assert fake_firebase.calls["get_user"] == 2
+
+
+def test_claims_update_drops_cached_full_profiles(make_service, fake_firebase):
+    """Test that set_custom_claims evicts profile results cached for the user's tokens"""
+    service = _service(make_service)
+    user = fake_firebase.add_user("ada@example.com")
+    token = fake_firebase.issue_id_token(user)
+
+    before, _, after = _run(
+        service,
+        service.verify_token(token, full_profile=True),
+        service.set_custom_claims(user.uid, {"role": "admin"}),
+        service.verify_token(token, full_profile=True),
+    )
+
+    assert before["role"] == "user"
+    assert after["role"] == "admin"
+    assert fake_firebase.calls["get_user"] == 2
@@ -0,0 +1,152 @@
+"""
+Tests for the GitHub webhook receiver.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+
+import httpx
+from fastapi import FastAPI
+
+import app.webhooks as webhooks
+from app.webhooks import DeliverySet, WebhookEvent, WebhookQueue, log_event, verify_signature
+
+SECRET = "webhook-secret"
+
+
+def _signature(body: bytes, secret: str = SECRET) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def _headers(body: bytes, delivery_id: str, event: str = "issue_comment") -> dict:
+    return {
+        "X-Hub-Signature-256": _signature(body),
+        "X-GitHub-Delivery": delivery_id,
+        "X-GitHub-Event": event,
+        "Content-Type": "application/json",
+    }
+
+
+def _run(monkeypatch, queue, scenario, secret=SECRET):
+    """Serve the webhook router with ``queue`` and run ``scenario(client)``"""
+    monkeypatch.setattr(webhooks, "GITHUB_WEBHOOK_SECRET", secret)
+    monkeypatch.setattr(webhooks, "webhook_queue", queue)
+    app = FastAPI()
+    app.include_router(webhooks.router)
+
+    async def main():
+        queue.start()
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await scenario(client)
+        finally:
+            await queue.stop()
+
+    return asyncio.run(main())
+
+
+def test_verify_signature():
+    """Test the X-Hub-Signature-256 check"""
+    body = b'{"action": "created"}'
+    assert verify_signature(SECRET.encode(), body, _signature(body))
+    assert not verify_signature(SECRET.encode(), body, _signature(body, "other-secret"))
+    assert not verify_signature(SECRET.encode(), body + b" ", _signature(body))
+    assert not verify_signature(SECRET.encode(), body, None)
+    assert not verify_signature(SECRET.encode(), body, "sha1=" + "0" * 40)
+
+
+def test_deliveries_are_queued_once_and_answered_with_202(monkeypatch):
+    """Test that valid deliveries are accepted and redeliveries are not handled again"""
+    handled = []
+
+    async def handler(event):
+        handled.append(event)
+
+    queue = WebhookQueue(handler, workers=2)
+    body = json.dumps({"action": "created", "comment": {"id": 1}}).encode()
+
+    async def scenario(client):
+        first = await client.post("/webhooks/github", content=body, headers=_headers(body, "d-1"))
+        again = await client.post("/webhooks/github", content=body, headers=_headers(body, "d-1"))
+        forged = await client.post(
+            "/webhooks/github", content=body, headers={**_headers(body, "d-2"), "X-Hub-Signature-256": "sha256=00"}
+        )
+        return first, again, forged
+
+    first, again, forged = _run(monkeypatch, queue, scenario)
+
+    assert (first.status_code, first.json()) == (202, {"status": "accepted"})
+    assert (again.status_code, again.json()) == (202, {"status": "duplicate"})
+    assert forged.status_code == 401
+    assert [(event.delivery_id, event.event_name) for event in handled] == [("d-1", "issue_comment")]
+
+
+def test_full_queue_returns_503_and_allows_redelivery(monkeypatch):
+    """Test that a delivery refused for lack of space is not remembered as seen"""
+    release = None
+    handled = []
+
+    async def handler(event):
+        await release.wait()
+        handled.append(event.delivery_id)
+
+    queue = WebhookQueue(handler, workers=1, max_size=1)
+    body = b"{}"
+
+    async def scenario(client):
+        nonlocal release
+        release = asyncio.Event()
+        statuses = []
+        for delivery_id in ("d-1", "d-2", "d-3"):
+            response = await client.post("/webhooks/github", content=body, headers=_headers(body, delivery_id))
+            statuses.append(response.status_code)
+            # Let the worker take d-1 off the queue before the next delivery
+            await asyncio.sleep(0)
+        release.set()
+        await asyncio.sleep(0.01)
+        redelivered = await client.post("/webhooks/github", content=body, headers=_headers(body, "d-3"))
+        statuses.append(redelivered.status_code)
+        return statuses
+
+    statuses = _run(monkeypatch, queue, scenario)
+
+    assert statuses == [202, 202, 503, 202]
+    assert handled == ["d-1", "d-2", "d-3"]
+
+
+def test_unconfigured_secret_refuses_deliveries(monkeypatch):
+    """Test that the route fails closed without GITHUB_WEBHOOK_SECRET"""
+    queue = WebhookQueue(lambda event: None)
+
+    async def scenario(client):
+        return await client.post("/webhooks/github", content=b"{}", headers=_headers(b"{}", "d-1"))
+
+    response = _run(monkeypatch, queue, scenario, secret="")
+    assert response.status_code == 503
+
+
+def test_log_event_uses_the_main_py_summary(caplog):
+    """Test that the worker handler logs the projected event summary"""
+    body = json.dumps({"action": "opened", "pull_request": {"number": 5, "head": {"sha": "abc"}}}).encode()
+
+    with caplog.at_level(logging.INFO, logger="app.webhooks"):
+        asyncio.run(log_event(WebhookEvent("d-1", "pull_request", body)))
+
+    assert 'Event summary (pull_request): {"action":"opened","pr_number":5,"head_sha":"abc"}' in caplog.text
+    # A constant message keeps every event on one RateLimitFilter key
+    assert {record.msg for record in caplog.records if record.getMessage().startswith("Event summary")} == {
+        "Event summary (%s): %s"
+    }
+
+
+def test_delivery_set_evicts_oldest():
+    """Test that the dedup set is bounded"""
+    deliveries = DeliverySet(max_size=2)
+    assert deliveries.add("a") and deliveries.add("b") and deliveries.add("c")
+    assert len(deliveries) == 2
+    assert deliveries.add("a")
+    assert not deliveries.add("c")